@@ -0,0 +1,82 @@
+"""
+Compare unary send_event_data against BatchingEventSender on a local
+ReferenceServer.
+
+    PYTHONPATH=. python benchmarks/batching_benchmark.py --events 5000
+"""
+import argparse
+import time
+
+from weni_datalake_sdk.clients import client
+from weni_datalake_sdk.clients.batching import BatchingEventSender
+from weni_datalake_sdk.clients.channel_pool import close_channel_pool
+from weni_datalake_sdk.clients.reference_server import ReferenceServer
+from weni_datalake_sdk.paths.events_path import EventPath
+
+
+def make_event(i):
+    return {
+        "event_name": "weni_nexus_data",
+        "key": "topics",
+        "value": f"topic-{i % 10}",
+        "value_type": "string",
+        "date": "2025-06-03T10:00:00Z",
+        "project": "68c84e84-2d7d-4dc7-8193-50d0e2321b2e",
+        "contact_urn": f"whatsapp:+5582999{i:06d}",
+        "metadata": {"topic_uuid": "7b1b2c52-0d5e-4d6b-9f3c-1c2b3d4e5f60"},
+    }
+
+
+def run_unary(server, events):
+    client.SERVER_ADDRESS = server.target
+    start = time.perf_counter()
+    for event in events:
+        client.send_event_data(EventPath, event)
+    return time.perf_counter() - start
+
+
+def run_batched(server, events, max_records, max_linger_ms):
+    start = time.perf_counter()
+    with BatchingEventSender(
+        max_records=max_records, max_linger_ms=max_linger_ms, target=server.target
+    ) as sender:
+        futures = [sender.send(event) for event in events]
+    for future in futures:
+        future.result()
+    return time.perf_counter() - start
+
+
+def report(name, elapsed, count, rpcs):
+    print(
+        f"{name:<8} {count / elapsed:>10.0f} events/s  {elapsed:>7.3f}s  "
+        f"{rpcs:>6} RPCs"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--events", type=int, default=5000)
+    parser.add_argument("--max-records", type=int, default=200)
+    parser.add_argument("--max-linger-ms", type=int, default=20)
+    args = parser.parse_args()
+
+    events = [make_event(i) for i in range(args.events)]
+
+    with ReferenceServer() as server:
+        unary = run_unary(server, events)
+        unary_rpcs = server.events.calls["InsertEventData"]
+
+        batched = run_batched(server, events, args.max_records, args.max_linger_ms)
+        batched_rpcs = server.events.calls["InsertEventBatch"]
+
+    close_channel_pool()
+
+    report("unary", unary, args.events, unary_rpcs)
+    report("batched", batched, args.events, batched_rpcs)
+    print(
+        f"speedup  {unary / batched:.1f}x, {unary_rpcs / batched_rpcs:.0f}x fewer RPCs"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Cost of decoding a DC API events payload and stripping its quoted strings,
+comparing `json.loads` followed by `clean_quotes` (two passes, one copy) with
+`loads_clean` (cleaned while decoding).
+
+    PYTHONPATH=. python benchmarks/clean_quotes_benchmark.py --rows 1000000
+"""
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+
+from weni_datalake_sdk.clients.redshift.events import clean_quotes, loads_clean
+
+
+def make_row(i):
+    return {
+        "event_name": '"weni_nexus_data"',
+        "key": '"topics"',
+        "value": f'"topic-{i % 10}"',
+        "date": "2025-06-03T10:00:00Z",
+        "project": '"68c84e84-2d7d-4dc7-8193-50d0e2321b2e"',
+        "contact_urn": f'"whatsapp:+5582999{i:06d}"',
+        "metadata": {"topic_uuid": '"7b1b2c52-0d5e-4d6b-9f3c-1c2b3d4e5f60"'},
+        "count": i,
+    }
+
+
+def two_passes(text):
+    return clean_quotes(json.loads(text))
+
+
+def run(decode, text, trace):
+    gc.collect()
+    if trace:
+        tracemalloc.start()
+    start = time.perf_counter()
+    decode(text)
+    elapsed = time.perf_counter() - start
+    peak = 0
+    if trace:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument(
+        "--memory", action="store_true", help="also report the peak allocation"
+    )
+    args = parser.parse_args()
+
+    text = json.dumps([make_row(i) for i in range(args.rows)])
+    sample = json.dumps([make_row(i) for i in range(100)])
+    assert two_passes(sample) == loads_clean(sample)
+
+    for name, decode in (
+        ("two passes", two_passes),
+        ("one pass", loads_clean),
+    ):
+        elapsed, peak = run(decode, text, args.memory)
+        line = (
+            f"{name:>10}: {elapsed:6.2f} s"
+            f" ({elapsed * 1e6 / args.rows:5.2f} us/row)"
+        )
+        if args.memory:
+            line += f", peak {peak / 2**20:,.0f} MiB"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
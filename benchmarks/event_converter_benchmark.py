@@ -0,0 +1,102 @@
+"""
+Per-event cost of building InsertEventRequest messages, comparing the
+previous converter (kept below as `legacy_build_event_request`) with
+`converters.build_event_request`.
+
+    PYTHONPATH=. python benchmarks/event_converter_benchmark.py --events 100000
+"""
+import argparse
+import time
+
+from google.protobuf import struct_pb2, timestamp_pb2
+
+from weni_datalake_sdk.clients import events_pb2
+from weni_datalake_sdk.clients.converters import build_event_request
+
+
+def legacy_build_event_request(data):
+    from datetime import datetime
+
+    timestamp = timestamp_pb2.Timestamp()
+    if data.get("date"):
+        try:
+            dt = datetime.fromisoformat(data["date"].replace("Z", "+00:00"))
+            timestamp.FromDatetime(dt)
+        except Exception:
+            timestamp.GetCurrentTime()
+    else:
+        timestamp.GetCurrentTime()
+
+    value_data = events_pb2.ValueData()
+    value_data.string_value = str(data.get("value", ""))
+
+    metadata = None
+    if data.get("metadata"):
+        metadata = struct_pb2.Struct()
+        metadata.update(data["metadata"])
+
+    VALUE_TYPE_MAP = {
+        "string": events_pb2.VALUE_TYPE_STRING,
+        "int": events_pb2.VALUE_TYPE_INT,
+        "list": events_pb2.VALUE_TYPE_LIST,
+        "bool": events_pb2.VALUE_TYPE_BOOL,
+    }
+
+    value_type_str = data.get("value_type", "string").lower()
+    value_type = VALUE_TYPE_MAP.get(value_type_str, events_pb2.VALUE_TYPE_STRING)
+
+    return events_pb2.InsertEventRequest(
+        event_name=data.get("event_name", ""),
+        key=data.get("key", ""),
+        date=timestamp,
+        project=data.get("project", ""),
+        contact_urn=data.get("contact_urn", ""),
+        value_type=value_type,
+        value=value_data,
+        metadata=metadata,
+    )
+
+
+def make_event(i):
+    return {
+        "event_name": "weni_nexus_data",
+        "key": "topics",
+        "value": f"topic-{i % 10}",
+        "value_type": "string",
+        # A handful of distinct timestamps, as in a batch of live events.
+        "date": f"2025-06-03T10:00:{i % 60:02d}Z",
+        "project": "68c84e84-2d7d-4dc7-8193-50d0e2321b2e",
+        "contact_urn": f"whatsapp:+5582999{i:06d}",
+        "metadata": {"topic_uuid": "7b1b2c52-0d5e-4d6b-9f3c-1c2b3d4e5f60"},
+    }
+
+
+def run(build, events):
+    start = time.perf_counter()
+    for event in events:
+        build(event)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--events", type=int, default=100000)
+    args = parser.parse_args()
+
+    events = [make_event(i) for i in range(args.events)]
+    for event in events[:100]:
+        assert legacy_build_event_request(event) == build_event_request(event)
+
+    for name, build in (
+        ("legacy", legacy_build_event_request),
+        ("fast path", build_event_request),
+    ):
+        elapsed = run(build, events)
+        print(
+            f"{name:>10}: {elapsed * 1e6 / len(events):6.2f} us/event"
+            f" ({len(events) / elapsed:,.0f} events/s)"
+        )
+
+
+if __name__ == "__main__":
+    main()
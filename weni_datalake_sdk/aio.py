@@ -0,0 +1,189 @@
+"""
+asyncio counterparts of the send_* functions in `clients.client`.
+
+Calls go through a `grpc.aio` channel shared by every coroutine of the running
+event loop, so thousands of inserts can be in flight with `asyncio.gather`
+without holding one thread per request. Like the sync functions, they follow
+the path's call policy (without hedging) and are spooled while the server is
+unavailable.
+"""
+import asyncio
+
+import grpc
+
+from weni_datalake_sdk.clients import (
+    client,
+    commerce_webhook_pb2_grpc,
+    events_pb2_grpc,
+    message_templates_pb2_grpc,
+    msgs_pb2_grpc,
+    traces_pb2_grpc,
+)
+from weni_datalake_sdk.clients.channel_pool import get_channel_pool
+from weni_datalake_sdk.clients.client import METHOD_PATHS, SPOOLED_STATUS
+from weni_datalake_sdk.clients.converters import (
+    build_commerce_webhook_request,
+    build_data_request,
+    build_event_request,
+    build_message_template_request,
+    build_message_template_status_request,
+    build_trace_request,
+)
+from weni_datalake_sdk.clients.policy import (
+    RETRY_BUDGET,
+    call_async_with_policy,
+    get_policy,
+)
+from weni_datalake_sdk.clients.spool import RETRYABLE_CODES, get_spool
+from weni_datalake_sdk.paths.validator import validate_path
+from weni_datalake_sdk.utils.loops import PerLoop
+
+
+class _Channels:
+    """The channels of one event loop, by target, and their stubs."""
+
+    def __init__(self):
+        self.channels = {}
+        self.stubs = {}
+
+    async def close(self):
+        for channel in self.channels.values():
+            await channel.close()
+
+
+# grpc.aio channels are bound to the loop that created them, so each loop
+# gets its own, closed when `asyncio.run` shuts the loop down.
+_CHANNELS = PerLoop(_Channels, _Channels.close)
+
+
+def get_stub(stub_class, target: str = None):
+    """
+    Return a cached `stub_class` bound to the running loop's shared channel.
+    The first call for a multi-address `target` blocks while its addresses are
+    probed; the send_* coroutines do that in a worker thread.
+    """
+    target = get_channel_pool().resolve(target or client.SERVER_ADDRESS)
+    loop_channels = _CHANNELS.get()
+
+    # Only the loop's own thread gets here, so no lock is needed.
+    channel = loop_channels.channels.get(target)
+    if channel is None:
+        channel = grpc.aio.insecure_channel(
+            target, options=get_channel_pool().get_options()
+        )
+        loop_channels.channels[target] = channel
+
+    stub = loop_channels.stubs.get((target, stub_class))
+    if stub is None:
+        stub = stub_class(channel)
+        loop_channels.stubs[(target, stub_class)] = stub
+    return stub
+
+
+async def _get_stub(stub_class):
+    target = client.SERVER_ADDRESS
+    pool = get_channel_pool()
+    if not pool.is_warm(target):
+        # The first call to a multi-address target probes every address with
+        # blocking health checks, so it runs in a worker thread.
+        await asyncio.to_thread(pool.get_balancer, target)
+    return get_stub(stub_class, target)
+
+
+async def close_channels():
+    """
+    Close the channels opened by the running event loop.
+    """
+    loop_channels = _CHANNELS.pop()
+    if loop_channels is not None:
+        await loop_channels.close()
+
+
+async def insert(stub, method, request, path):
+    """
+    Async `client.insert`: call the unary insert `method` of `stub` following
+    the policy of `path`, spooling the request when the server is unavailable.
+    """
+    try:
+        response = await call_async_with_policy(
+            getattr(stub, method), request, get_policy(path), RETRY_BUDGET
+        )
+    except grpc.RpcError as e:
+        spool = get_spool(client.SERVER_ADDRESS)
+        if spool is None or e.code() not in RETRYABLE_CODES:
+            raise
+        # Appending writes to disk, so it runs in a worker thread.
+        await asyncio.to_thread(
+            spool.append, METHOD_PATHS[method], request.SerializeToString()
+        )
+        return SPOOLED_STATUS
+    return response.status
+
+
+async def send_data(path, data):
+    stub = await _get_stub(msgs_pb2_grpc.DatalakeManagerServiceStub)
+
+    if isinstance(path, type):
+        path = path()
+
+    validate_path(path)
+
+    request = build_data_request(path, data)
+
+    return await insert(stub, "InsertData", request, path.get_table_name())
+
+
+async def send_trace_data(path_class, data):
+    validate_path(path_class)
+
+    stub = await _get_stub(traces_pb2_grpc.DatalakeManagerServiceStub)
+
+    request = build_trace_request(path_class, data)
+
+    return await insert(stub, "InsertTraceData", request, path_class.get_table_name())
+
+
+async def send_message_template_data(path_class, data):
+    validate_path(path_class)
+
+    stub = await _get_stub(message_templates_pb2_grpc.DatalakeManagerServiceStub)
+
+    request = build_message_template_request(data)
+
+    return await insert(
+        stub, "InsertMessageTemplateData", request, path_class.get_table_name()
+    )
+
+
+async def send_message_template_status_data(path_class, data):
+    validate_path(path_class)
+
+    stub = await _get_stub(message_templates_pb2_grpc.DatalakeManagerServiceStub)
+
+    request = build_message_template_status_request(data)
+
+    return await insert(
+        stub, "InsertMessageTemplateStatusData", request, path_class.get_table_name()
+    )
+
+
+async def send_event_data(path_class, data):
+    validate_path(path_class)
+
+    stub = await _get_stub(events_pb2_grpc.DatalakeManagerServiceStub)
+
+    request = build_event_request(data)
+
+    return await insert(stub, "InsertEventData", request, path_class.get_table_name())
+
+
+async def send_commerce_webhook_data(path_class, data):
+    validate_path(path_class)
+
+    stub = await _get_stub(commerce_webhook_pb2_grpc.CommerceWebhookServiceStub)
+
+    request = build_commerce_webhook_request(data)
+
+    return await insert(
+        stub, "InsertCommerceWebhookData", request, path_class.get_table_name()
+    )
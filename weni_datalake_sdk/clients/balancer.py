@@ -0,0 +1,116 @@
+"""
+Client-side load balancing over a static list of datalake manager addresses.
+
+`DATALAKE_SERVER_ADDRESS` may hold several comma-separated addresses. Each one
+is probed through the standard `grpc.health.v1` service; calls are spread
+round-robin over the ones reporting SERVING.
+"""
+import logging
+import threading
+
+import grpc
+from grpc_health.v1 import health_pb2, health_pb2_grpc
+
+logger = logging.getLogger(__name__)
+
+
+def split_targets(target: str) -> list:
+    return [address.strip() for address in target.split(",") if address.strip()]
+
+
+def is_multi_target(target: str) -> bool:
+    return bool(target) and "," in target
+
+
+class EndpointBalancer:
+    """
+    Round-robin over the healthy addresses of `addresses`.
+
+    `get_channel(address)` returns the channel used to probe an address. A
+    background thread checks every address each `interval` seconds; servers
+    without the health service (UNIMPLEMENTED) count as healthy. When no
+    address is healthy every address is used, so calls fail (and get retried
+    or spooled) instead of blocking.
+    """
+
+    def __init__(
+        self,
+        addresses: list,
+        get_channel,
+        interval: float = 5.0,
+        timeout: float = 1.0,
+        service: str = "",
+    ):
+        self.addresses = list(addresses)
+        self.get_channel = get_channel
+        self.interval = interval
+        self.timeout = timeout
+        self.service = service
+
+        self._lock = threading.Lock()
+        self._healthy = {address: True for address in self.addresses}
+        self._index = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def check(self, address: str) -> bool:
+        stub = health_pb2_grpc.HealthStub(self.get_channel(address))
+        try:
+            response = stub.Check(
+                health_pb2.HealthCheckRequest(service=self.service),
+                timeout=self.timeout,
+            )
+        except grpc.RpcError as e:
+            return e.code() == grpc.StatusCode.UNIMPLEMENTED
+        return response.status == health_pb2.HealthCheckResponse.SERVING
+
+    def check_all(self) -> dict:
+        """
+        Probe every address now and return `{address: healthy}`.
+        """
+        results = {address: self.check(address) for address in self.addresses}
+        with self._lock:
+            for address, healthy in results.items():
+                if healthy != self._healthy[address]:
+                    logger.warning(
+                        "Datalake endpoint %s is %s",
+                        address,
+                        "healthy" if healthy else "unhealthy",
+                    )
+            self._healthy.update(results)
+        return results
+
+    def healthy_addresses(self) -> list:
+        with self._lock:
+            return [address for address in self.addresses if self._healthy[address]]
+
+    def next_address(self) -> str:
+        with self._lock:
+            candidates = [
+                address for address in self.addresses if self._healthy[address]
+            ] or self.addresses
+            address = candidates[self._index % len(candidates)]
+            self._index += 1
+            return address
+
+    def start(self):
+        """
+        Run the warm-up probe, then keep checking in the background.
+        """
+        self.check_all()
+        self._thread = threading.Thread(
+            target=self._run, name="datalake-health-check", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.check_all()
+            except Exception:
+                logger.exception("Datalake health check failed")
@@ -0,0 +1,335 @@
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+
+from weni_datalake_sdk.clients import (
+    client,
+    commerce_webhook_pb2,
+    commerce_webhook_pb2_grpc,
+    events_pb2,
+    events_pb2_grpc,
+    message_templates_pb2,
+    message_templates_pb2_grpc,
+    traces_pb2,
+    traces_pb2_grpc,
+)
+from weni_datalake_sdk.clients.channel_pool import get_stub
+from weni_datalake_sdk.clients.converters import (
+    build_commerce_webhook_request,
+    build_event_request,
+    build_message_template_request,
+    build_trace_request,
+)
+from weni_datalake_sdk.clients.policy import get_policy
+from weni_datalake_sdk.paths.commerce_webhook import CommerceWebhookPath
+from weni_datalake_sdk.paths.events_path import EventPath
+from weni_datalake_sdk.paths.message_template_path import MessageTemplatePath
+from weni_datalake_sdk.paths.trace_path import TracePath
+from weni_datalake_sdk.paths.validator import validate_path
+from weni_datalake_sdk.utils.exceptions import QueueFullError
+
+logger = logging.getLogger(__name__)
+
+DATALAKE_BATCH_MAX_RECORDS = int(os.environ.get("DATALAKE_BATCH_MAX_RECORDS", 500))
+DATALAKE_BATCH_MAX_BYTES = int(os.environ.get("DATALAKE_BATCH_MAX_BYTES", 1024 * 1024))
+DATALAKE_BATCH_MAX_LINGER_MS = int(os.environ.get("DATALAKE_BATCH_MAX_LINGER_MS", 50))
+DATALAKE_BATCH_MAX_BUFFERED_RECORDS = int(
+    os.environ.get("DATALAKE_BATCH_MAX_BUFFERED_RECORDS", 10000)
+)
+DATALAKE_BATCH_MAX_BUFFERED_BYTES = int(
+    os.environ.get("DATALAKE_BATCH_MAX_BUFFERED_BYTES", 16 * 1024 * 1024)
+)
+DATALAKE_BATCH_BLOCK_TIMEOUT = float(os.environ.get("DATALAKE_BATCH_BLOCK_TIMEOUT", 5))
+
+
+@dataclass
+class BatchResult:
+    """Outcome of one batch RPC, passed to the `on_batch` callback."""
+
+    records: int
+    bytes: int
+    elapsed: float
+    status: str = None
+    error: Exception = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class BatchingSender:
+    """
+    Buffers records in memory and sends them through a single batch RPC.
+
+    A batch is flushed when it reaches `max_records` or `max_bytes`, or when
+    its oldest record has waited `max_linger_ms`. `send` returns a Future that
+    resolves to the batch status, or to the batch error. Each batch RPC has
+    the deadline of the path's call policy.
+
+    At most `max_buffered_records` records (`max_buffered_bytes` bytes) wait
+    for a batch. Past that, `send` waits up to `block_timeout` seconds for the
+    flusher to make room, then returns a Future failed with QueueFullError.
+    """
+
+    path_class = None
+    stub_class = None
+    method = None
+
+    def __init__(
+        self,
+        max_records: int = DATALAKE_BATCH_MAX_RECORDS,
+        max_bytes: int = DATALAKE_BATCH_MAX_BYTES,
+        max_linger_ms: int = DATALAKE_BATCH_MAX_LINGER_MS,
+        on_batch=None,
+        target: str = None,
+        max_buffered_records: int = DATALAKE_BATCH_MAX_BUFFERED_RECORDS,
+        max_buffered_bytes: int = DATALAKE_BATCH_MAX_BUFFERED_BYTES,
+        block_timeout: float = DATALAKE_BATCH_BLOCK_TIMEOUT,
+    ):
+        validate_path(self.path_class)
+
+        self.max_records = max_records
+        self.max_bytes = max_bytes
+        self.max_linger = max_linger_ms / 1000
+        self.on_batch = on_batch
+        self.target = target or client.SERVER_ADDRESS
+        self.max_buffered_records = max_buffered_records
+        self.max_buffered_bytes = max_buffered_bytes
+        self.block_timeout = block_timeout
+
+        self.batches_sent = 0
+        self.records_sent = 0
+        self.rejected = 0
+
+        self._buffer = []
+        self._buffer_bytes = 0
+        self._deadline = None
+        self._closed = False
+        self._lock = threading.Lock()
+        self._cond = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+        self._thread = threading.Thread(
+            target=self._run, name=f"{type(self).__name__}-flusher", daemon=True
+        )
+        self._thread.start()
+
+    def build_request(self, data):
+        raise NotImplementedError("Subclasses should implement build_request")
+
+    def build_batch_request(self, requests: list):
+        raise NotImplementedError("Subclasses should implement build_batch_request")
+
+    def send(self, data: dict) -> Future:
+        """
+        Queue a record for the next batch. Returns a Future.
+        """
+        request = self.build_request(data)
+        size = request.ByteSize()
+        future = Future()
+
+        with self._cond:
+            if not self._has_room(size):
+                self._not_full.wait_for(
+                    lambda: self._has_room(size) or self._closed, self.block_timeout
+                )
+            if self._closed:
+                raise RuntimeError(f"{type(self).__name__} is closed")
+            if not self._has_room(size):
+                self.rejected += 1
+                future.set_exception(
+                    QueueFullError(
+                        f"{type(self).__name__} buffer is full"
+                        f" ({len(self._buffer)} records)"
+                    )
+                )
+                return future
+
+            first = not self._buffer
+            if first:
+                self._deadline = time.monotonic() + self.max_linger
+            self._buffer.append((request, size, future))
+            self._buffer_bytes += size
+
+            # Wake the flusher to arm the linger timer or to send a full batch.
+            if first or self._is_full():
+                self._cond.notify()
+
+        return future
+
+    def flush(self):
+        """
+        Send everything buffered so far from the calling thread.
+        """
+        while True:
+            with self._cond:
+                batch = self._take_batch()
+            if not batch:
+                return
+            self._send_batch(batch)
+
+    def close(self):
+        """
+        Flush pending records and stop the background flusher.
+        """
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify()
+            self._not_full.notify_all()
+        self._thread.join()
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _is_full(self) -> bool:
+        return (
+            len(self._buffer) >= self.max_records
+            or self._buffer_bytes >= self.max_bytes
+        )
+
+    def _has_room(self, size: int) -> bool:
+        # A record larger than the byte limit still goes through on its own.
+        return not self._buffer or (
+            len(self._buffer) < self.max_buffered_records
+            and self._buffer_bytes + size <= self.max_buffered_bytes
+        )
+
+    def _take_batch(self) -> list:
+        count = 0
+        size = 0
+        for _, record_size, _ in self._buffer:
+            if count and (
+                count >= self.max_records or size + record_size > self.max_bytes
+            ):
+                break
+            count += 1
+            size += record_size
+
+        batch = self._buffer[:count]
+        self._buffer = self._buffer[count:]
+        self._buffer_bytes -= size
+        if self._buffer:
+            self._deadline = time.monotonic() + self.max_linger
+        if batch:
+            self._not_full.notify_all()
+        return batch
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._closed:
+                    if self._buffer and (
+                        self._is_full() or time.monotonic() >= self._deadline
+                    ):
+                        break
+                    timeout = None
+                    if self._buffer:
+                        timeout = self._deadline - time.monotonic()
+                    self._cond.wait(timeout)
+
+                if self._closed:
+                    return
+                batch = self._take_batch()
+
+            self._send_batch(batch)
+
+    def _send_batch(self, batch: list):
+        # Records whose Future was cancelled while buffered are not sent.
+        batch = [
+            (request, size, future)
+            for request, size, future in batch
+            if future.set_running_or_notify_cancel()
+        ]
+        if not batch:
+            return
+
+        requests = [request for request, _, _ in batch]
+        result = BatchResult(
+            records=len(batch), bytes=sum(size for _, size, _ in batch), elapsed=0.0
+        )
+
+        start = time.monotonic()
+        try:
+            stub = get_stub(self.stub_class, self.target)
+            response = getattr(stub, self.method)(
+                self.build_batch_request(requests),
+                timeout=get_policy(self.path_class.get_table_name()).timeout,
+            )
+        except Exception as e:
+            result.error = e
+            for _, _, future in batch:
+                future.set_exception(e)
+        else:
+            result.status = response.status
+            for _, _, future in batch:
+                future.set_result(response.status)
+        result.elapsed = time.monotonic() - start
+
+        self.batches_sent += 1
+        self.records_sent += result.records
+
+        if self.on_batch is not None:
+            try:
+                self.on_batch(result)
+            except Exception:
+                logger.exception("on_batch callback failed")
+
+
+class BatchingEventSender(BatchingSender):
+    path_class = EventPath
+    stub_class = events_pb2_grpc.DatalakeManagerServiceStub
+    method = "InsertEventBatch"
+
+    def build_request(self, data):
+        return build_event_request(data)
+
+    def build_batch_request(self, requests: list):
+        return events_pb2.InsertEventBatchRequest(events=requests)
+
+
+class BatchingTraceSender(BatchingSender):
+    path_class = TracePath
+    stub_class = traces_pb2_grpc.DatalakeManagerServiceStub
+    method = "InsertTraceBatch"
+
+    def build_request(self, data):
+        return build_trace_request(self.path_class, data)
+
+    def build_batch_request(self, requests: list):
+        return traces_pb2.InsertTraceBatchRequest(traces=requests)
+
+
+class BatchingMessageTemplateSender(BatchingSender):
+    path_class = MessageTemplatePath
+    stub_class = message_templates_pb2_grpc.DatalakeManagerServiceStub
+    method = "InsertMessageTemplateBatch"
+
+    def build_request(self, data):
+        return build_message_template_request(data)
+
+    def build_batch_request(self, requests: list):
+        return message_templates_pb2.InsertMessageTemplateBatchRequest(
+            message_templates=requests
+        )
+
+
+class BatchingCommerceWebhookSender(BatchingSender):
+    path_class = CommerceWebhookPath
+    stub_class = commerce_webhook_pb2_grpc.CommerceWebhookServiceStub
+    method = "InsertCommerceWebhookBatch"
+
+    def build_request(self, data):
+        return build_commerce_webhook_request(data)
+
+    def build_batch_request(self, requests: list):
+        return commerce_webhook_pb2.InsertCommerceWebhookBatchRequest(
+            commerce_webhooks=requests
+        )
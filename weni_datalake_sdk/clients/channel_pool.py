@@ -0,0 +1,280 @@
+import atexit
+import json
+import os
+import threading
+
+import grpc
+
+from weni_datalake_sdk.clients.balancer import (
+    EndpointBalancer,
+    is_multi_target,
+    split_targets,
+)
+
+DATALAKE_GRPC_POOL_SIZE = int(os.environ.get("DATALAKE_GRPC_POOL_SIZE", 1))
+DATALAKE_GRPC_KEEPALIVE_TIME_MS = int(
+    os.environ.get("DATALAKE_GRPC_KEEPALIVE_TIME_MS", 30000)
+)
+DATALAKE_GRPC_KEEPALIVE_TIMEOUT_MS = int(
+    os.environ.get("DATALAKE_GRPC_KEEPALIVE_TIMEOUT_MS", 10000)
+)
+DATALAKE_GRPC_MAX_MESSAGE_LENGTH = int(
+    os.environ.get("DATALAKE_GRPC_MAX_MESSAGE_LENGTH", 4 * 1024 * 1024)
+)
+DATALAKE_GRPC_LB_POLICY = os.environ.get("DATALAKE_GRPC_LB_POLICY", "round_robin")
+DATALAKE_GRPC_HEALTH_CHECK = os.environ.get("DATALAKE_GRPC_HEALTH_CHECK", "1") == "1"
+DATALAKE_GRPC_HEALTH_CHECK_INTERVAL = float(
+    os.environ.get("DATALAKE_GRPC_HEALTH_CHECK_INTERVAL", 5)
+)
+DATALAKE_GRPC_HEALTH_WATCH = os.environ.get("DATALAKE_GRPC_HEALTH_WATCH", "0") == "1"
+
+
+class ChannelPool:
+    """
+    Process-wide cache of gRPC channels and stubs.
+
+    Keeps `size` long-lived channels per target, hands them out round-robin
+    and builds each service stub only once per channel.
+
+    A target may be a comma-separated list of addresses: calls are then spread
+    over the addresses that pass the `grpc.health.v1` Check, when
+    `health_check` is on. Single targets (including "dns:///" ones) use the
+    `lb_policy` of gRPC, with gRPC's own health checking when `health_watch`
+    is on; it needs servers implementing the streaming Watch method.
+    """
+
+    def __init__(
+        self,
+        size: int = DATALAKE_GRPC_POOL_SIZE,
+        keepalive_time_ms: int = DATALAKE_GRPC_KEEPALIVE_TIME_MS,
+        keepalive_timeout_ms: int = DATALAKE_GRPC_KEEPALIVE_TIMEOUT_MS,
+        max_message_length: int = DATALAKE_GRPC_MAX_MESSAGE_LENGTH,
+        service_config: str = None,
+        lb_policy: str = DATALAKE_GRPC_LB_POLICY,
+        health_check: bool = DATALAKE_GRPC_HEALTH_CHECK,
+        health_check_interval: float = DATALAKE_GRPC_HEALTH_CHECK_INTERVAL,
+        health_watch: bool = DATALAKE_GRPC_HEALTH_WATCH,
+    ):
+        if size < 1:
+            raise ValueError("Pool size must be at least 1")
+
+        self.size = size
+        self.keepalive_time_ms = keepalive_time_ms
+        self.keepalive_timeout_ms = keepalive_timeout_ms
+        self.max_message_length = max_message_length
+        self.service_config = service_config
+        self.lb_policy = lb_policy
+        self.health_check = health_check
+        self.health_check_interval = health_check_interval
+        self.health_watch = health_watch
+
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self._channels = {}
+        self._stubs = {}
+        self._next_index = {}
+        self._balancers = {}
+        self._starting = {}
+
+    def get_options(self) -> list:
+        options = [
+            ("grpc.keepalive_time_ms", self.keepalive_time_ms),
+            ("grpc.keepalive_timeout_ms", self.keepalive_timeout_ms),
+            ("grpc.keepalive_permit_without_calls", 1),
+            ("grpc.http2.max_pings_without_data", 0),
+            ("grpc.max_send_message_length", self.max_message_length),
+            ("grpc.max_receive_message_length", self.max_message_length),
+        ]
+        if self.service_config:
+            options.append(("grpc.enable_retries", 1))
+
+        service_config = json.loads(self.service_config or "{}")
+        if self.lb_policy:
+            service_config.setdefault("loadBalancingConfig", [{self.lb_policy: {}}])
+        if self.health_watch:
+            service_config.setdefault("healthCheckConfig", {"serviceName": ""})
+        if service_config:
+            options.append(("grpc.service_config", json.dumps(service_config)))
+        return options
+
+    def _check_fork(self):
+        # Channels are not fork-safe: a child process (gunicorn/celery prefork)
+        # must open its own instead of reusing the parent's sockets.
+        if os.getpid() != self._pid:
+            self._pid = os.getpid()
+            self._channels = {}
+            self._stubs = {}
+            self._next_index = {}
+            self._balancers = {}
+            self._starting = {}
+
+    def _get_channels(self, target: str) -> list:
+        channels = self._channels.get(target)
+        if channels is None:
+            options = self.get_options()
+            channels = [
+                grpc.insecure_channel(target, options=options) for _ in range(self.size)
+            ]
+            self._channels[target] = channels
+            self._next_index[target] = 0
+        return channels
+
+    def _next(self, target: str) -> int:
+        index = self._next_index[target]
+        self._next_index[target] = (index + 1) % self.size
+        return index
+
+    def get_balancer(self, target: str) -> EndpointBalancer:
+        """
+        Return the balancer of a multi-address `target`, running its warm-up
+        probe on first use. The balancer is only handed out once probed, so
+        callers arriving during the probe wait for it.
+        """
+        with self._lock:
+            self._check_fork()
+            balancer = self._balancers.get(target)
+            if balancer is not None:
+                return balancer
+            starting = self._starting.setdefault(target, threading.Lock())
+
+        # Probing opens channels through the pool, so it runs outside the lock.
+        with starting:
+            with self._lock:
+                balancer = self._balancers.get(target)
+            if balancer is None:
+                balancer = EndpointBalancer(
+                    split_targets(target),
+                    self.get_channel,
+                    interval=self.health_check_interval,
+                )
+                if self.health_check:
+                    balancer.start()
+                with self._lock:
+                    self._balancers[target] = balancer
+                    self._starting.pop(target, None)
+            return balancer
+
+    def is_warm(self, target: str) -> bool:
+        """
+        Whether `resolve(target)` returns without blocking. Only the first call
+        to a multi-address target probes its addresses, when health checks
+        are on.
+        """
+        if not self.health_check or not is_multi_target(target):
+            return True
+        with self._lock:
+            self._check_fork()
+            return target in self._balancers
+
+    def resolve(self, target: str) -> str:
+        """
+        Return the address the next call to `target` should use.
+        """
+        if not is_multi_target(target):
+            return target
+        return self.get_balancer(target).next_address()
+
+    def get_channel(self, target: str):
+        """
+        Return the next pooled channel for `target`, opening them on first use.
+        """
+        target = self.resolve(target)
+        with self._lock:
+            self._check_fork()
+            channels = self._get_channels(target)
+            return channels[self._next(target)]
+
+    def get_stub(self, stub_class, target: str):
+        """
+        Return a cached `stub_class` instance bound to a pooled channel.
+        """
+        target = self.resolve(target)
+        with self._lock:
+            self._check_fork()
+            channels = self._get_channels(target)
+            index = self._next(target)
+            key = (target, index, stub_class)
+            stub = self._stubs.get(key)
+            if stub is None:
+                stub = stub_class(channels[index])
+                self._stubs[key] = stub
+            return stub
+
+    def close(self):
+        """
+        Close every pooled channel and forget the cached stubs.
+        """
+        with self._lock:
+            channels = self._channels
+            balancers = self._balancers
+            self._channels = {}
+            self._stubs = {}
+            self._next_index = {}
+            self._balancers = {}
+            self._starting = {}
+
+        for balancer in balancers.values():
+            balancer.stop()
+        for target_channels in channels.values():
+            for channel in target_channels:
+                channel.close()
+
+
+_POOL = None
+_POOL_LOCK = threading.Lock()
+
+
+def get_channel_pool() -> ChannelPool:
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is None:
+            _POOL = ChannelPool()
+        return _POOL
+
+
+def configure_channel_pool(**kwargs) -> ChannelPool:
+    """
+    Replace the process-wide pool with one built from `kwargs`.
+    Channels of the previous pool are closed.
+    """
+    global _POOL
+    with _POOL_LOCK:
+        previous = _POOL
+        _POOL = ChannelPool(**kwargs)
+
+    if previous is not None:
+        previous.close()
+    return _POOL
+
+
+def close_channel_pool():
+    global _POOL
+    with _POOL_LOCK:
+        previous = _POOL
+        _POOL = None
+
+    if previous is not None:
+        previous.close()
+
+
+def get_stub(stub_class, target: str):
+    return get_channel_pool().get_stub(stub_class, target)
+
+
+def warm_up(target: str, timeout: float = 5.0) -> dict:
+    """
+    Connect to every address of `target` ahead of the first insert and return
+    `{address: healthy}`. Meant to be called once at process startup.
+    """
+    pool = get_channel_pool()
+    if is_multi_target(target):
+        return pool.get_balancer(target).check_all()
+
+    try:
+        grpc.channel_ready_future(pool.get_channel(target)).result(timeout=timeout)
+    except grpc.FutureTimeoutError:
+        return {target: False}
+    return {target: True}
+
+
+atexit.register(close_channel_pool)
@@ -1,74 +1,284 @@
 import os
-from concurrent.futures import ThreadPoolExecutor
+import threading
+from concurrent.futures import Future, InvalidStateError
 
 import grpc
-from google.protobuf import struct_pb2, timestamp_pb2
 
 from weni_datalake_sdk.clients import (
-    commerce_webhook_pb2,
     commerce_webhook_pb2_grpc,
-    events_pb2,
     events_pb2_grpc,
-    message_templates_pb2,
     message_templates_pb2_grpc,
-    msgs_pb2,
     msgs_pb2_grpc,
-    traces_pb2,
     traces_pb2_grpc,
 )
+from weni_datalake_sdk.clients.channel_pool import get_stub
+from weni_datalake_sdk.clients.converters import (
+    build_commerce_webhook_request,
+    build_data_request,
+    build_event_request,
+    build_message_template_request,
+    build_message_template_status_request,
+    build_trace_request,
+)
+from weni_datalake_sdk.clients.executor import (
+    DATALAKE_MAXIMUN_WORKERS,
+    BoundedExecutor,
+)
+from weni_datalake_sdk.clients.policy import (
+    RETRY_BUDGET,
+    call_future_with_policy,
+    call_with_policy,
+    get_policy,
+)
+from weni_datalake_sdk.clients.spool import RETRYABLE_CODES, get_spool
 from weni_datalake_sdk.paths.validator import validate_path
+from weni_datalake_sdk.utils.exceptions import QueueFullError
 
 SERVER_ADDRESS = os.environ.get("DATALAKE_SERVER_ADDRESS")
 
+DATALAKE_ASYNC_MODE = os.environ.get("DATALAKE_ASYNC_MODE", "executor")
+DATALAKE_MAX_IN_FLIGHT = int(os.environ.get("DATALAKE_MAX_IN_FLIGHT", 10000))
+
+SPOOLED_STATUS = "spooled"
+
+FUTURE_MODE = "future"
+
+IN_FLIGHT = threading.BoundedSemaphore(DATALAKE_MAX_IN_FLIGHT)
+
+METHOD_PATHS = {
+    "InsertData": "/msgs.DatalakeManagerService/InsertData",
+    "InsertTraceData": "/traces.DatalakeManagerService/InsertTraceData",
+    "InsertMessageTemplateData": (
+        "/message_template.DatalakeManagerService/InsertMessageTemplateData"
+    ),
+    "InsertMessageTemplateStatusData": (
+        "/message_template.DatalakeManagerService/InsertMessageTemplateStatusData"
+    ),
+    "InsertEventData": "/events.DatalakeManagerService/InsertEventData",
+    "InsertCommerceWebhookData": (
+        "/commerce_webhook.CommerceWebhookService/InsertCommerceWebhookData"
+    ),
+}
+
+
+def insert(stub, method, request, path):
+    """
+    Call the unary insert `method` of `stub` and return the response status.
+
+    The call follows the policy configured for `path` (see
+    policy.configure_policy): per-attempt deadline, retries and hedging.
+
+    When the spool is enabled (DATALAKE_SPOOL_DIR or spool.enable_spool) and
+    the server is unavailable, the request is written to disk for later replay
+    and SPOOLED_STATUS is returned instead of raising.
+    """
+    try:
+        response = call_with_policy(
+            getattr(stub, method), request, get_policy(path), RETRY_BUDGET
+        )
+    except grpc.RpcError as e:
+        spool = get_spool(SERVER_ADDRESS)
+        if spool is None or e.code() not in RETRYABLE_CODES:
+            raise
+        spool.append(METHOD_PATHS[method], request.SerializeToString())
+        return SPOOLED_STATUS
+    return response.status
+
+
+def insert_future(stub, method, request, path) -> Future:
+    """
+    Non-blocking `insert`: starts the call with the gRPC future API and returns
+    a concurrent.futures.Future with the response status (or SPOOLED_STATUS).
+
+    No thread is held while the call is in flight. At most
+    DATALAKE_MAX_IN_FLIGHT calls are pending at once; past that, the caller
+    waits for one to finish.
+    """
+    IN_FLIGHT.acquire()
+    call = call_future_with_policy(
+        getattr(stub, method), request, get_policy(path), RETRY_BUDGET
+    )
+    result = Future()
+    result.add_done_callback(lambda f: f.cancelled() and call.cancel())
+
+    def on_done(call):
+        IN_FLIGHT.release()
+        if call.cancelled():
+            result.cancel()
+            return
+
+        error = call.exception()
+        try:
+            if error is None:
+                result.set_result(call.result().status)
+                return
+
+            spool = get_spool(SERVER_ADDRESS)
+            if (
+                spool is None
+                or not isinstance(error, grpc.RpcError)
+                or error.code() not in RETRYABLE_CODES
+            ):
+                result.set_exception(error)
+                return
+            spool.append(METHOD_PATHS[method], request.SerializeToString())
+            result.set_result(SPOOLED_STATUS)
+        except InvalidStateError:
+            # Cancelled by the caller in the meantime.
+            pass
+        except Exception as e:
+            result.set_exception(e)
+
+    call.add_done_callback(on_done)
+    return result
+
 
 def send_data(path, data):
-    channel = grpc.insecure_channel(target=SERVER_ADDRESS)
-    stub = msgs_pb2_grpc.DatalakeManagerServiceStub(channel)
+    stub = get_stub(msgs_pb2_grpc.DatalakeManagerServiceStub, SERVER_ADDRESS)
 
     if isinstance(path, type):
         path = path()
 
     validate_path(path)
 
-    request = msgs_pb2.InsertRequest(path=path.get_table_name(), data=data)
+    request = build_data_request(path, data)
 
-    response = stub.InsertData(request)
-    print("Server response:", response.status)
+    status = insert(stub, "InsertData", request, path.get_table_name())
+    print("Server response:", status)
 
 
 def send_trace_data(path_class, data):
     validate_path(path_class)
 
-    channel = grpc.insecure_channel(SERVER_ADDRESS)
-    stub = traces_pb2_grpc.DatalakeManagerServiceStub(channel)
+    stub = get_stub(traces_pb2_grpc.DatalakeManagerServiceStub, SERVER_ADDRESS)
 
-    request = traces_pb2.InsertTraceRequest(path=path_class.get_table_name(), data=data)
+    request = build_trace_request(path_class, data)
 
-    response = stub.InsertTraceData(request)
-    return response.status
+    return insert(stub, "InsertTraceData", request, path_class.get_table_name())
 
 
 def send_message_template_data(path_class, data):
     validate_path(path_class)
 
-    channel = grpc.insecure_channel(SERVER_ADDRESS)
-    stub = message_templates_pb2_grpc.DatalakeManagerServiceStub(channel)
+    stub = get_stub(
+        message_templates_pb2_grpc.DatalakeManagerServiceStub, SERVER_ADDRESS
+    )
 
-    request = message_templates_pb2.InsertMessageTemplateRequest(data=data)
+    request = build_message_template_request(data)
 
-    response = stub.InsertMessageTemplateData(request)
-    return response.status
+    return insert(
+        stub, "InsertMessageTemplateData", request, path_class.get_table_name()
+    )
 
 
-DATALAKE_MAXIMUN_WORKERS = os.environ.get("DATALAKE_MAXIMUN_WORKERS", 5)
-MESSAGE_TEMPLATE_EXECUTOR = ThreadPoolExecutor(max_workers=DATALAKE_MAXIMUN_WORKERS)
+# Stub class, unary method and request builder behind each send_* function,
+# for the code paths that build requests without calling it (spill, futures).
+SEND_METHODS = {
+    "send_trace_data": (
+        traces_pb2_grpc.DatalakeManagerServiceStub,
+        "InsertTraceData",
+        build_trace_request,
+    ),
+    "send_message_template_data": (
+        message_templates_pb2_grpc.DatalakeManagerServiceStub,
+        "InsertMessageTemplateData",
+        lambda path_class, data: build_message_template_request(data),
+    ),
+    "send_message_template_status_data": (
+        message_templates_pb2_grpc.DatalakeManagerServiceStub,
+        "InsertMessageTemplateStatusData",
+        lambda path_class, data: build_message_template_status_request(data),
+    ),
+    "send_event_data": (
+        events_pb2_grpc.DatalakeManagerServiceStub,
+        "InsertEventData",
+        lambda path_class, data: build_event_request(data),
+    ),
+    "send_commerce_webhook_data": (
+        commerce_webhook_pb2_grpc.CommerceWebhookServiceStub,
+        "InsertCommerceWebhookData",
+        lambda path_class, data: build_commerce_webhook_request(data),
+    ),
+}
+
+
+def spill_to_spool(fn, args, kwargs):
+    """
+    Spill handler of EXECUTOR: writes the request of an overflowing send_*
+    call to the spool instead of queueing it.
+    """
+    path_class, data = args
+    validate_path(path_class)
+
+    spool = get_spool(SERVER_ADDRESS)
+    if spool is None:
+        raise QueueFullError("Executor queue is full and the spool is not enabled")
+
+    _, method, build_request = SEND_METHODS[fn.__name__]
+    request = build_request(path_class, data)
+    spool.append(METHOD_PATHS[method], request.SerializeToString())
+    return SPOOLED_STATUS
+
+
+# One bounded executor backs every *_async function; the old per-path names
+# are kept as aliases.
+EXECUTOR = BoundedExecutor(max_workers=DATALAKE_MAXIMUN_WORKERS, spill=spill_to_spool)
+MESSAGE_TEMPLATE_EXECUTOR = EXECUTOR
+MESSAGE_TEMPLATE_STATUS_EXECUTOR = EXECUTOR
+EVENT_EXECUTOR = EXECUTOR
+
+
+def send_future(name, path_class, data, callback=None) -> Future:
+    """
+    Start the insert of the `name` send_* function (e.g. "send_event_data")
+    without blocking and return a Future with its status. Errors, including
+    validation ones, are set on the Future. `callback(future)` is called when
+    it completes.
+    """
+    stub_class, method, build_request = SEND_METHODS[name]
+    try:
+        validate_path(path_class)
+        stub = get_stub(stub_class, SERVER_ADDRESS)
+        request = build_request(path_class, data)
+    except Exception as e:
+        future = Future()
+        future.set_exception(e)
+    else:
+        future = insert_future(stub, method, request, path_class.get_table_name())
+
+    if callback is not None:
+        future.add_done_callback(callback)
+    return future
+
+
+def send_trace_data_future(path_class, data, callback=None):
+    return send_future("send_trace_data", path_class, data, callback)
+
+
+def send_message_template_data_future(path_class, data, callback=None):
+    return send_future("send_message_template_data", path_class, data, callback)
+
+
+def send_message_template_status_data_future(path_class, data, callback=None):
+    return send_future("send_message_template_status_data", path_class, data, callback)
+
+
+def send_event_data_future(path_class, data, callback=None):
+    return send_future("send_event_data", path_class, data, callback)
+
+
+def send_commerce_webhook_data_future(path_class, data, callback=None):
+    return send_future("send_commerce_webhook_data", path_class, data, callback)
 
 
 def send_message_template_data_async(path_class, data):
     """
-    Send message template data in parallel using the global executor.
+    Send message template data in parallel using the global executor, or the
+    gRPC future API when DATALAKE_ASYNC_MODE is "future".
     Returns a Future.
     """
+    if DATALAKE_ASYNC_MODE == FUTURE_MODE:
+        return send_message_template_data_future(path_class, data)
     return MESSAGE_TEMPLATE_EXECUTOR.submit(
         send_message_template_data, path_class, data
     )
@@ -77,25 +287,25 @@ def send_message_template_data_async(path_class, data):
 def send_message_template_status_data(path_class, data):
     validate_path(path_class)
 
-    channel = grpc.insecure_channel(SERVER_ADDRESS)
-    stub = message_templates_pb2_grpc.DatalakeManagerServiceStub(channel)
-
-    request = message_templates_pb2.InsertMessageTemplateStatusRequest(data=data)
-
-    response = stub.InsertMessageTemplateStatusData(request)
-    return response.status
+    stub = get_stub(
+        message_templates_pb2_grpc.DatalakeManagerServiceStub, SERVER_ADDRESS
+    )
 
+    request = build_message_template_status_request(data)
 
-MESSAGE_TEMPLATE_STATUS_EXECUTOR = ThreadPoolExecutor(
-    max_workers=DATALAKE_MAXIMUN_WORKERS
-)
+    return insert(
+        stub, "InsertMessageTemplateStatusData", request, path_class.get_table_name()
+    )
 
 
 def send_message_template_status_data_async(path_class, data):
     """
-    Send event data in parallel using the global executor.
+    Send message template status data in parallel using the global executor,
+    or the gRPC future API when DATALAKE_ASYNC_MODE is "future".
     Returns a Future.
     """
+    if DATALAKE_ASYNC_MODE == FUTURE_MODE:
+        return send_message_template_status_data_future(path_class, data)
     return MESSAGE_TEMPLATE_STATUS_EXECUTOR.submit(
         send_message_template_status_data, path_class, data
     )
@@ -104,115 +314,134 @@ def send_message_template_status_data_async(path_class, data):
 def send_event_data(path_class, data):
     validate_path(path_class)
 
-    from datetime import datetime
+    stub = get_stub(events_pb2_grpc.DatalakeManagerServiceStub, SERVER_ADDRESS)
 
-    from google.protobuf import struct_pb2, timestamp_pb2
+    request = build_event_request(data)
 
-    channel = grpc.insecure_channel(SERVER_ADDRESS)
-    stub = events_pb2_grpc.DatalakeManagerServiceStub(channel)
-
-    # Convert date to Timestamp
-    timestamp = timestamp_pb2.Timestamp()
-    if data.get("date"):
-        try:
-            dt = datetime.fromisoformat(data["date"].replace("Z", "+00:00"))
-            timestamp.FromDatetime(dt)
-        except Exception:
-            timestamp.GetCurrentTime()
-    else:
-        timestamp.GetCurrentTime()
-
-    # Create ValueData for the value
-    value_data = events_pb2.ValueData()
-    value_data.string_value = str(data.get("value", ""))
-
-    # Create metadata struct
-    metadata = None
-    if data.get("metadata"):
-        metadata = struct_pb2.Struct()
-        metadata.update(data["metadata"])
-
-    VALUE_TYPE_MAP = {
-        "string": events_pb2.VALUE_TYPE_STRING,
-        "int": events_pb2.VALUE_TYPE_INT,
-        "list": events_pb2.VALUE_TYPE_LIST,
-        "bool": events_pb2.VALUE_TYPE_BOOL,
-    }
-
-    value_type_str = data.get("value_type", "string").lower()
-    value_type = VALUE_TYPE_MAP.get(value_type_str, events_pb2.VALUE_TYPE_STRING)
-
-    # Create request with individual fields as defined in proto
-    request = events_pb2.InsertEventRequest(
-        event_name=data.get("event_name", ""),
-        key=data.get("key", ""),
-        date=timestamp,
-        project=data.get("project", ""),
-        contact_urn=data.get("contact_urn", ""),
-        value_type=value_type,
-        value=value_data,
-        metadata=metadata,
-    )
-
-    response = stub.InsertEventData(request)
-    return response.status
-
-
-EVENT_EXECUTOR = ThreadPoolExecutor(max_workers=DATALAKE_MAXIMUN_WORKERS)
+    return insert(stub, "InsertEventData", request, path_class.get_table_name())
 
 
 def send_event_data_async(path_class, data):
     """
-    Send event data in parallel using the global executor.
+    Send event data in parallel using the global executor, or the gRPC future
+    API when DATALAKE_ASYNC_MODE is "future".
     Returns a Future.
     """
+    if DATALAKE_ASYNC_MODE == FUTURE_MODE:
+        return send_event_data_future(path_class, data)
     return EVENT_EXECUTOR.submit(send_event_data, path_class, data)
 
 
 def send_commerce_webhook_data(path_class, data):
     validate_path(path_class)
 
-    channel = grpc.insecure_channel(SERVER_ADDRESS)
-    stub = commerce_webhook_pb2_grpc.CommerceWebhookServiceStub(channel)
+    stub = get_stub(
+        commerce_webhook_pb2_grpc.CommerceWebhookServiceStub, SERVER_ADDRESS
+    )
 
-    def to_struct(val):
-        if isinstance(val, dict):
-            s = struct_pb2.Struct()
-            s.update(val)
-            return s
-        return val
+    request = build_commerce_webhook_request(data)
 
-    date = None
-    if data.get("date"):
-        try:
-            from datetime import datetime
+    return insert(
+        stub, "InsertCommerceWebhookData", request, path_class.get_table_name()
+    )
 
-            ts = timestamp_pb2.Timestamp()
-            dt = datetime.fromisoformat(data["date"].replace("Z", "+00:00"))
-            ts.FromDatetime(dt)
-            date = ts
-        except Exception:
-            pass
 
-    request = commerce_webhook_pb2.InsertCommerceWebhookRequest(
-        status=data.get("status"),
-        template=data.get("template"),
-        template_variables=to_struct(data.get("template_variables"))
-        if data.get("template_variables") is not None
-        else None,
-        contact_urn=data.get("contact_urn"),
-        error=to_struct(data.get("error")) if data.get("error") is not None else None,
-        data=to_struct(data.get("data")) if data.get("data") is not None else None,
-        date=date,
-        project=data.get("project"),
-        request=to_struct(data.get("request"))
-        if data.get("request") is not None
-        else None,
-        response=to_struct(data.get("response"))
-        if data.get("response") is not None
-        else None,
-        agent=data.get("agent"),
-    )
-
-    response = stub.InsertCommerceWebhookData(request)
-    return response.status
+def stream(method, requests, path: str, timeout: float = None):
+    """
+    Send `requests` over the client-streaming `method`. The whole call must
+    finish within `timeout` seconds, the policy timeout of `path` by default.
+    """
+    if timeout is None:
+        timeout = get_policy(path).timeout
+    return method(requests, timeout=timeout)
+
+
+def send_data_stream(path, records, timeout: float = None):
+    """
+    Stream every record of `records` (an iterable or generator of dicts)
+    over a single client-streaming call. Records are converted lazily, so
+    generators are never fully loaded in memory. The call fails with
+    DEADLINE_EXCEEDED after `timeout` seconds (see `stream`).
+    Returns the InsertBatchResponse with the status and inserted count.
+    """
+    stub = get_stub(msgs_pb2_grpc.DatalakeManagerServiceStub, SERVER_ADDRESS)
+
+    if isinstance(path, type):
+        path = path()
+
+    validate_path(path)
+
+    requests = (build_data_request(path, data) for data in records)
+
+    return stream(stub.InsertDataStream, requests, path.get_table_name(), timeout)
+
+
+def send_trace_data_stream(path_class, records, timeout: float = None):
+    validate_path(path_class)
+
+    stub = get_stub(traces_pb2_grpc.DatalakeManagerServiceStub, SERVER_ADDRESS)
+
+    requests = (build_trace_request(path_class, data) for data in records)
+
+    return stream(
+        stub.InsertTraceStream, requests, path_class.get_table_name(), timeout
+    )
+
+
+def send_message_template_data_stream(path_class, records, timeout: float = None):
+    validate_path(path_class)
+
+    stub = get_stub(
+        message_templates_pb2_grpc.DatalakeManagerServiceStub, SERVER_ADDRESS
+    )
+
+    requests = (build_message_template_request(data) for data in records)
+
+    return stream(
+        stub.InsertMessageTemplateStream, requests, path_class.get_table_name(), timeout
+    )
+
+
+def send_message_template_status_data_stream(
+    path_class, records, timeout: float = None
+):
+    validate_path(path_class)
+
+    stub = get_stub(
+        message_templates_pb2_grpc.DatalakeManagerServiceStub, SERVER_ADDRESS
+    )
+
+    requests = (build_message_template_status_request(data) for data in records)
+
+    return stream(
+        stub.InsertMessageTemplateStatusStream,
+        requests,
+        path_class.get_table_name(),
+        timeout,
+    )
+
+
+def send_event_data_stream(path_class, records, timeout: float = None):
+    validate_path(path_class)
+
+    stub = get_stub(events_pb2_grpc.DatalakeManagerServiceStub, SERVER_ADDRESS)
+
+    requests = (build_event_request(data) for data in records)
+
+    return stream(
+        stub.InsertEventStream, requests, path_class.get_table_name(), timeout
+    )
+
+
+def send_commerce_webhook_data_stream(path_class, records, timeout: float = None):
+    validate_path(path_class)
+
+    stub = get_stub(
+        commerce_webhook_pb2_grpc.CommerceWebhookServiceStub, SERVER_ADDRESS
+    )
+
+    requests = (build_commerce_webhook_request(data) for data in records)
+
+    return stream(
+        stub.InsertCommerceWebhookStream, requests, path_class.get_table_name(), timeout
+    )
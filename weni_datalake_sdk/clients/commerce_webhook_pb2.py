@@ -26,7 +26,7 @@ from google.protobuf import (
 )
 
 DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(
-    b'\n\x16\x63ommerce_webhook.proto\x12\x10\x63ommerce_webhook\x1a\x1cgoogle/protobuf/struct.proto\x1a\x1fgoogle/protobuf/timestamp.proto"\xb9\x04\n\x1cInsertCommerceWebhookRequest\x12\x13\n\x06status\x18\x01 \x01(\x05H\x00\x88\x01\x01\x12\x15\n\x08template\x18\x02 \x01(\tH\x01\x88\x01\x01\x12\x38\n\x12template_variables\x18\x03 \x01(\x0b\x32\x17.google.protobuf.StructH\x02\x88\x01\x01\x12\x18\n\x0b\x63ontact_urn\x18\x04 \x01(\tH\x03\x88\x01\x01\x12+\n\x05\x65rror\x18\x05 \x01(\x0b\x32\x17.google.protobuf.StructH\x04\x88\x01\x01\x12*\n\x04\x64\x61ta\x18\x06 \x01(\x0b\x32\x17.google.protobuf.StructH\x05\x88\x01\x01\x12-\n\x04\x64\x61te\x18\x07 \x01(\x0b\x32\x1a.google.protobuf.TimestampH\x06\x88\x01\x01\x12\x14\n\x07project\x18\x08 \x01(\tH\x07\x88\x01\x01\x12-\n\x07request\x18\t \x01(\x0b\x32\x17.google.protobuf.StructH\x08\x88\x01\x01\x12.\n\x08response\x18\n \x01(\x0b\x32\x17.google.protobuf.StructH\t\x88\x01\x01\x12\x12\n\x05\x61gent\x18\x0b \x01(\tH\n\x88\x01\x01\x42\t\n\x07_statusB\x0b\n\t_templateB\x15\n\x13_template_variablesB\x0e\n\x0c_contact_urnB\x08\n\x06_errorB\x07\n\x05_dataB\x07\n\x05_dateB\n\n\x08_projectB\n\n\x08_requestB\x0b\n\t_responseB\x08\n\x06_agent"/\n\x1dInsertCommerceWebhookResponse\x12\x0e\n\x06status\x18\x01 \x01(\t2\x96\x01\n\x16\x43ommerceWebhookService\x12|\n\x19InsertCommerceWebhookData\x12..commerce_webhook.InsertCommerceWebhookRequest\x1a/.commerce_webhook.InsertCommerceWebhookResponseb\x06proto3'
+    b'\n\x16\x63ommerce_webhook.proto\x12\x10\x63ommerce_webhook\x1a\x1cgoogle/protobuf/struct.proto\x1a\x1fgoogle/protobuf/timestamp.proto"\xb9\x04\n\x1cInsertCommerceWebhookRequest\x12\x13\n\x06status\x18\x01 \x01(\x05H\x00\x88\x01\x01\x12\x15\n\x08template\x18\x02 \x01(\tH\x01\x88\x01\x01\x12\x38\n\x12template_variables\x18\x03 \x01(\x0b\x32\x17.google.protobuf.StructH\x02\x88\x01\x01\x12\x18\n\x0b\x63ontact_urn\x18\x04 \x01(\tH\x03\x88\x01\x01\x12+\n\x05\x65rror\x18\x05 \x01(\x0b\x32\x17.google.protobuf.StructH\x04\x88\x01\x01\x12*\n\x04\x64\x61ta\x18\x06 \x01(\x0b\x32\x17.google.protobuf.StructH\x05\x88\x01\x01\x12-\n\x04\x64\x61te\x18\x07 \x01(\x0b\x32\x1a.google.protobuf.TimestampH\x06\x88\x01\x01\x12\x14\n\x07project\x18\x08 \x01(\tH\x07\x88\x01\x01\x12-\n\x07request\x18\t \x01(\x0b\x32\x17.google.protobuf.StructH\x08\x88\x01\x01\x12.\n\x08response\x18\n \x01(\x0b\x32\x17.google.protobuf.StructH\t\x88\x01\x01\x12\x12\n\x05\x61gent\x18\x0b \x01(\tH\n\x88\x01\x01\x42\t\n\x07_statusB\x0b\n\t_templateB\x15\n\x13_template_variablesB\x0e\n\x0c_contact_urnB\x08\n\x06_errorB\x07\n\x05_dataB\x07\n\x05_dateB\n\n\x08_projectB\n\n\x08_requestB\x0b\n\t_responseB\x08\n\x06_agent"/\n\x1dInsertCommerceWebhookResponse\x12\x0e\n\x06status\x18\x01 \x01(\t"n\n!InsertCommerceWebhookBatchRequest\x12I\n\x11\x63ommerce_webhooks\x18\x01 \x03(\x0b\x32..commerce_webhook.InsertCommerceWebhookRequest"7\n\x13InsertBatchResponse\x12\x0e\n\x06status\x18\x01 \x01(\t\x12\x10\n\x08inserted\x18\x02 \x01(\x03\x32\x88\x03\n\x16\x43ommerceWebhookService\x12|\n\x19InsertCommerceWebhookData\x12..commerce_webhook.InsertCommerceWebhookRequest\x1a/.commerce_webhook.InsertCommerceWebhookResponse\x12x\n\x1aInsertCommerceWebhookBatch\x12\x33.commerce_webhook.InsertCommerceWebhookBatchRequest\x1a%.commerce_webhook.InsertBatchResponse\x12v\n\x1bInsertCommerceWebhookStream\x12..commerce_webhook.InsertCommerceWebhookRequest\x1a%.commerce_webhook.InsertBatchResponse(\x01\x62\x06proto3'
 )
 
 _globals = globals()
@@ -38,6 +38,10 @@ if not _descriptor._USE_C_DESCRIPTORS:
     _globals["_INSERTCOMMERCEWEBHOOKREQUEST"]._serialized_end = 677
     _globals["_INSERTCOMMERCEWEBHOOKRESPONSE"]._serialized_start = 679
     _globals["_INSERTCOMMERCEWEBHOOKRESPONSE"]._serialized_end = 726
-    _globals["_COMMERCEWEBHOOKSERVICE"]._serialized_start = 729
-    _globals["_COMMERCEWEBHOOKSERVICE"]._serialized_end = 879
+    _globals["_INSERTCOMMERCEWEBHOOKBATCHREQUEST"]._serialized_start = 728
+    _globals["_INSERTCOMMERCEWEBHOOKBATCHREQUEST"]._serialized_end = 838
+    _globals["_INSERTBATCHRESPONSE"]._serialized_start = 840
+    _globals["_INSERTBATCHRESPONSE"]._serialized_end = 895
+    _globals["_COMMERCEWEBHOOKSERVICE"]._serialized_start = 898
+    _globals["_COMMERCEWEBHOOKSERVICE"]._serialized_end = 1290
 # @@protoc_insertion_point(module_scope)
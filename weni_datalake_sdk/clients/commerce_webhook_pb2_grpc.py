@@ -44,6 +44,18 @@ class CommerceWebhookServiceStub(object):
             response_deserializer=commerce__webhook__pb2.InsertCommerceWebhookResponse.FromString,
             _registered_method=True,
         )
+        self.InsertCommerceWebhookBatch = channel.unary_unary(
+            "/commerce_webhook.CommerceWebhookService/InsertCommerceWebhookBatch",
+            request_serializer=commerce__webhook__pb2.InsertCommerceWebhookBatchRequest.SerializeToString,
+            response_deserializer=commerce__webhook__pb2.InsertBatchResponse.FromString,
+            _registered_method=True,
+        )
+        self.InsertCommerceWebhookStream = channel.stream_unary(
+            "/commerce_webhook.CommerceWebhookService/InsertCommerceWebhookStream",
+            request_serializer=commerce__webhook__pb2.InsertCommerceWebhookRequest.SerializeToString,
+            response_deserializer=commerce__webhook__pb2.InsertBatchResponse.FromString,
+            _registered_method=True,
+        )
 
 
 class CommerceWebhookServiceServicer(object):
@@ -55,6 +67,18 @@ class CommerceWebhookServiceServicer(object):
         context.set_details("Method not implemented!")
         raise NotImplementedError("Method not implemented!")
 
+    def InsertCommerceWebhookBatch(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details("Method not implemented!")
+        raise NotImplementedError("Method not implemented!")
+
+    def InsertCommerceWebhookStream(self, request_iterator, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details("Method not implemented!")
+        raise NotImplementedError("Method not implemented!")
+
 
 def add_CommerceWebhookServiceServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -63,6 +87,16 @@ def add_CommerceWebhookServiceServicer_to_server(servicer, server):
             request_deserializer=commerce__webhook__pb2.InsertCommerceWebhookRequest.FromString,
             response_serializer=commerce__webhook__pb2.InsertCommerceWebhookResponse.SerializeToString,
         ),
+        "InsertCommerceWebhookBatch": grpc.unary_unary_rpc_method_handler(
+            servicer.InsertCommerceWebhookBatch,
+            request_deserializer=commerce__webhook__pb2.InsertCommerceWebhookBatchRequest.FromString,
+            response_serializer=commerce__webhook__pb2.InsertBatchResponse.SerializeToString,
+        ),
+        "InsertCommerceWebhookStream": grpc.stream_unary_rpc_method_handler(
+            servicer.InsertCommerceWebhookStream,
+            request_deserializer=commerce__webhook__pb2.InsertCommerceWebhookRequest.FromString,
+            response_serializer=commerce__webhook__pb2.InsertBatchResponse.SerializeToString,
+        ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
         "commerce_webhook.CommerceWebhookService", rpc_method_handlers
@@ -106,3 +140,63 @@ class CommerceWebhookService(object):
             metadata,
             _registered_method=True,
         )
+
+    @staticmethod
+    def InsertCommerceWebhookBatch(
+        request,
+        target,
+        options=(),
+        channel_credentials=None,
+        call_credentials=None,
+        insecure=False,
+        compression=None,
+        wait_for_ready=None,
+        timeout=None,
+        metadata=None,
+    ):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            "/commerce_webhook.CommerceWebhookService/InsertCommerceWebhookBatch",
+            commerce__webhook__pb2.InsertCommerceWebhookBatchRequest.SerializeToString,
+            commerce__webhook__pb2.InsertBatchResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True,
+        )
+
+    @staticmethod
+    def InsertCommerceWebhookStream(
+        request_iterator,
+        target,
+        options=(),
+        channel_credentials=None,
+        call_credentials=None,
+        insecure=False,
+        compression=None,
+        wait_for_ready=None,
+        timeout=None,
+        metadata=None,
+    ):
+        return grpc.experimental.stream_unary(
+            request_iterator,
+            target,
+            "/commerce_webhook.CommerceWebhookService/InsertCommerceWebhookStream",
+            commerce__webhook__pb2.InsertCommerceWebhookRequest.SerializeToString,
+            commerce__webhook__pb2.InsertBatchResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True,
+        )
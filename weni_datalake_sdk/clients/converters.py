@@ -0,0 +1,181 @@
+import functools
+import logging
+import os
+from datetime import datetime
+
+from google.protobuf import struct_pb2, timestamp_pb2
+
+from weni_datalake_sdk.clients import (
+    commerce_webhook_pb2,
+    events_pb2,
+    message_templates_pb2,
+    msgs_pb2,
+    traces_pb2,
+)
+
+logger = logging.getLogger(__name__)
+
+DATALAKE_TIMESTAMP_CACHE_SIZE = int(
+    os.environ.get("DATALAKE_TIMESTAMP_CACHE_SIZE", 4096)
+)
+
+VALUE_TYPE_MAP = {
+    "string": events_pb2.VALUE_TYPE_STRING,
+    "int": events_pb2.VALUE_TYPE_INT,
+    "list": events_pb2.VALUE_TYPE_LIST,
+    "bool": events_pb2.VALUE_TYPE_BOOL,
+}
+
+
+def build_data_request(path, data):
+    return msgs_pb2.InsertRequest(path=path.get_table_name(), data=data)
+
+
+def build_trace_request(path_class, data):
+    return traces_pb2.InsertTraceRequest(path=path_class.get_table_name(), data=data)
+
+
+def build_message_template_request(data):
+    return message_templates_pb2.InsertMessageTemplateRequest(data=data)
+
+
+def build_message_template_status_request(data):
+    return message_templates_pb2.InsertMessageTemplateStatusRequest(data=data)
+
+
+@functools.lru_cache(maxsize=DATALAKE_TIMESTAMP_CACHE_SIZE)
+def parse_timestamp(date: str):
+    """
+    Parse an ISO 8601 `date` into `(seconds, nanos)`, or None if invalid.
+    Events of a batch usually share a few timestamps, so results are memoized.
+    """
+    timestamp = timestamp_pb2.Timestamp()
+    try:
+        timestamp.FromDatetime(datetime.fromisoformat(date.replace("Z", "+00:00")))
+    except (ValueError, OverflowError):
+        return None
+    return timestamp.seconds, timestamp.nanos
+
+
+TRUE_STRINGS = ("true", "1", "yes")
+FALSE_STRINGS = ("false", "0", "no")
+
+
+def to_bool(value) -> bool:
+    """Raises ValueError for anything but booleans, 0/1 and true/false strings."""
+    if isinstance(value, str):
+        text = value.strip().lower()
+        if text in TRUE_STRINGS:
+            return True
+        if text in FALSE_STRINGS:
+            return False
+    elif isinstance(value, bool) or value in (0, 1):
+        return bool(value)
+    raise ValueError(f"not a boolean: {value!r}")
+
+
+def to_int(value) -> int:
+    """Raises ValueError for values that are not exactly an integer."""
+    if isinstance(value, bool):
+        raise TypeError(f"not an integer: {value!r}")
+    if isinstance(value, float):
+        if not value.is_integer():
+            raise ValueError(f"not an integer: {value!r}")
+    elif not isinstance(value, (int, str)):
+        raise TypeError(f"not an integer: {value!r}")
+    return int(value)
+
+
+def set_event_value(request, value, value_type: int):
+    """
+    Encode `value` in the ValueData field matching `value_type`, so ints are
+    sent as varints and lists as repeated strings. Values that do not convert
+    exactly (3.7 or True as an int, "abc" as a bool, a dict as a list) are
+    sent as strings with VALUE_TYPE_STRING. None is sent as an empty string.
+    """
+    if value is None:
+        request.value.string_value = ""
+        return
+
+    try:
+        if value_type == events_pb2.VALUE_TYPE_INT:
+            request.value.int_value = to_int(value)
+        elif value_type == events_pb2.VALUE_TYPE_BOOL:
+            request.value.bool_value = to_bool(value)
+        elif value_type == events_pb2.VALUE_TYPE_LIST:
+            if not isinstance(value, (list, tuple)):
+                raise TypeError(f"not a list: {value!r}")
+            request.value.list_value.values.extend(str(item) for item in value)
+        else:
+            request.value.string_value = str(value)
+    except (TypeError, ValueError, OverflowError) as e:
+        logger.warning(
+            "Sending the value of event %r as a string: %s", request.event_name, e
+        )
+        request.value_type = events_pb2.VALUE_TYPE_STRING
+        request.value.string_value = str(value)
+
+
+def build_event_request(data):
+    request = events_pb2.InsertEventRequest()
+    request.event_name = data.get("event_name") or ""
+    request.key = data.get("key") or ""
+    request.project = data.get("project") or ""
+    request.contact_urn = data.get("contact_urn") or ""
+
+    date = data.get("date")
+    parsed = parse_timestamp(date) if date and isinstance(date, str) else None
+    if parsed is None:
+        request.date.GetCurrentTime()
+    else:
+        request.date.seconds, request.date.nanos = parsed
+
+    value_type = VALUE_TYPE_MAP.get(
+        data.get("value_type", "string").lower(), events_pb2.VALUE_TYPE_STRING
+    )
+    request.value_type = value_type
+    set_event_value(request, data.get("value"), value_type)
+
+    if data.get("metadata"):
+        request.metadata.update(data["metadata"])
+
+    return request
+
+
+def build_commerce_webhook_request(data):
+    def to_struct(val):
+        if isinstance(val, dict):
+            s = struct_pb2.Struct()
+            s.update(val)
+            return s
+        return val
+
+    date = None
+    if data.get("date"):
+        try:
+            ts = timestamp_pb2.Timestamp()
+            dt = datetime.fromisoformat(data["date"].replace("Z", "+00:00"))
+            ts.FromDatetime(dt)
+            date = ts
+        except Exception:
+            pass
+
+    return commerce_webhook_pb2.InsertCommerceWebhookRequest(
+        status=data.get("status"),
+        template=data.get("template"),
+        template_variables=to_struct(data.get("template_variables"))
+        if data.get("template_variables") is not None
+        else None,
+        contact_urn=data.get("contact_urn"),
+        error=to_struct(data.get("error")) if data.get("error") is not None else None,
+        data=to_struct(data.get("data")) if data.get("data") is not None else None,
+        date=date,
+        project=data.get("project"),
+        request=to_struct(data.get("request"))
+        if data.get("request") is not None
+        else None,
+        response=to_struct(data.get("response"))
+        if data.get("response") is not None
+        else None,
+        agent=data.get("agent"),
+    )
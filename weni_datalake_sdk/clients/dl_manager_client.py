@@ -1,5 +1,6 @@
 import requests
 
+from weni_datalake_sdk.clients.http import get_session
 from weni_datalake_sdk.paths.validator import validate_path
 from weni_datalake_sdk.utils.exceptions import DLManagerError
 
@@ -9,8 +10,9 @@ class DLManagerClient:
     Client to communicate with DL Manager.
     """
 
-    def __init__(self, base_url="https://dl-manager.example.com/api"):
+    def __init__(self, base_url="https://dl-manager.example.com/api", session=None):
         self.base_url = base_url
+        self.session = session
 
     def insert(self, path_class, data: dict):
         """
@@ -21,7 +23,8 @@ class DLManagerClient:
         payload = {"data": data}
 
         try:
-            response = requests.post(
+            session = self.session or get_session()
+            response = session.post(
                 f"{self.base_url}/{path_class.get_table_name()}/send",
                 json=payload,
                 timeout=10,
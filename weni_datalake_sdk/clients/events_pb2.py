@@ -26,7 +26,7 @@ from google.protobuf import (
 )
 
 DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(
-    b'\n\x0c\x65vents.proto\x12\x06\x65vents\x1a\x1cgoogle/protobuf/struct.proto\x1a\x1fgoogle/protobuf/timestamp.proto"\xf9\x01\n\x12InsertEventRequest\x12\x12\n\nevent_name\x18\x01 \x01(\t\x12\x0b\n\x03key\x18\x02 \x01(\t\x12(\n\x04\x64\x61te\x18\x03 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12\x0f\n\x07project\x18\x04 \x01(\t\x12\x13\n\x0b\x63ontact_urn\x18\x05 \x01(\t\x12%\n\nvalue_type\x18\x06 \x01(\x0e\x32\x11.events.ValueType\x12 \n\x05value\x18\x07 \x01(\x0b\x32\x11.events.ValueData\x12)\n\x08metadata\x18\x08 \x01(\x0b\x32\x17.google.protobuf.Struct"\x81\x01\n\tValueData\x12\x13\n\tint_value\x18\x01 \x01(\x03H\x00\x12\x16\n\x0cstring_value\x18\x02 \x01(\tH\x00\x12\x14\n\nbool_value\x18\x03 \x01(\x08H\x00\x12(\n\nlist_value\x18\x04 \x01(\x0b\x32\x12.events.StringListH\x00\x42\x07\n\x05value"\x1c\n\nStringList\x12\x0e\n\x06values\x18\x01 \x03(\t"%\n\x13InsertEventResponse\x12\x0e\n\x06status\x18\x01 \x01(\t*|\n\tValueType\x12\x1a\n\x16VALUE_TYPE_UNSPECIFIED\x10\x00\x12\x12\n\x0eVALUE_TYPE_INT\x10\x01\x12\x15\n\x11VALUE_TYPE_STRING\x10\x02\x12\x13\n\x0fVALUE_TYPE_BOOL\x10\x03\x12\x13\n\x0fVALUE_TYPE_LIST\x10\x04\x32\x64\n\x16\x44\x61talakeManagerService\x12J\n\x0fInsertEventData\x12\x1a.events.InsertEventRequest\x1a\x1b.events.InsertEventResponseb\x06proto3'
+    b'\n\x0c\x65vents.proto\x12\x06\x65vents\x1a\x1cgoogle/protobuf/struct.proto\x1a\x1fgoogle/protobuf/timestamp.proto"\xf9\x01\n\x12InsertEventRequest\x12\x12\n\nevent_name\x18\x01 \x01(\t\x12\x0b\n\x03key\x18\x02 \x01(\t\x12(\n\x04\x64\x61te\x18\x03 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12\x0f\n\x07project\x18\x04 \x01(\t\x12\x13\n\x0b\x63ontact_urn\x18\x05 \x01(\t\x12%\n\nvalue_type\x18\x06 \x01(\x0e\x32\x11.events.ValueType\x12 \n\x05value\x18\x07 \x01(\x0b\x32\x11.events.ValueData\x12)\n\x08metadata\x18\x08 \x01(\x0b\x32\x17.google.protobuf.Struct"\x81\x01\n\tValueData\x12\x13\n\tint_value\x18\x01 \x01(\x03H\x00\x12\x16\n\x0cstring_value\x18\x02 \x01(\tH\x00\x12\x14\n\nbool_value\x18\x03 \x01(\x08H\x00\x12(\n\nlist_value\x18\x04 \x01(\x0b\x32\x12.events.StringListH\x00\x42\x07\n\x05value"\x1c\n\nStringList\x12\x0e\n\x06values\x18\x01 \x03(\t"%\n\x13InsertEventResponse\x12\x0e\n\x06status\x18\x01 \x01(\t"E\n\x17InsertEventBatchRequest\x12*\n\x06\x65vents\x18\x01 \x03(\x0b\x32\x1a.events.InsertEventRequest"7\n\x13InsertBatchResponse\x12\x0e\n\x06status\x18\x01 \x01(\t\x12\x10\n\x08inserted\x18\x02 \x01(\x03*|\n\tValueType\x12\x1a\n\x16VALUE_TYPE_UNSPECIFIED\x10\x00\x12\x12\n\x0eVALUE_TYPE_INT\x10\x01\x12\x15\n\x11VALUE_TYPE_STRING\x10\x02\x12\x13\n\x0fVALUE_TYPE_BOOL\x10\x03\x12\x13\n\x0fVALUE_TYPE_LIST\x10\x04\x32\x86\x02\n\x16\x44\x61talakeManagerService\x12J\n\x0fInsertEventData\x12\x1a.events.InsertEventRequest\x1a\x1b.events.InsertEventResponse\x12P\n\x10InsertEventBatch\x12\x1f.events.InsertEventBatchRequest\x1a\x1b.events.InsertBatchResponse\x12N\n\x11InsertEventStream\x12\x1a.events.InsertEventRequest\x1a\x1b.events.InsertBatchResponse(\x01\x62\x06proto3'
 )
 
 _globals = globals()
@@ -34,8 +34,8 @@ _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
 _builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, "events_pb2", _globals)
 if not _descriptor._USE_C_DESCRIPTORS:
     DESCRIPTOR._loaded_options = None
-    _globals["_VALUETYPE"]._serialized_start = 540
-    _globals["_VALUETYPE"]._serialized_end = 664
+    _globals["_VALUETYPE"]._serialized_start = 668
+    _globals["_VALUETYPE"]._serialized_end = 792
     _globals["_INSERTEVENTREQUEST"]._serialized_start = 88
     _globals["_INSERTEVENTREQUEST"]._serialized_end = 337
     _globals["_VALUEDATA"]._serialized_start = 340
@@ -44,6 +44,10 @@ if not _descriptor._USE_C_DESCRIPTORS:
     _globals["_STRINGLIST"]._serialized_end = 499
     _globals["_INSERTEVENTRESPONSE"]._serialized_start = 501
     _globals["_INSERTEVENTRESPONSE"]._serialized_end = 538
-    _globals["_DATALAKEMANAGERSERVICE"]._serialized_start = 666
-    _globals["_DATALAKEMANAGERSERVICE"]._serialized_end = 766
+    _globals["_INSERTEVENTBATCHREQUEST"]._serialized_start = 540
+    _globals["_INSERTEVENTBATCHREQUEST"]._serialized_end = 609
+    _globals["_INSERTBATCHRESPONSE"]._serialized_start = 611
+    _globals["_INSERTBATCHRESPONSE"]._serialized_end = 666
+    _globals["_DATALAKEMANAGERSERVICE"]._serialized_start = 795
+    _globals["_DATALAKEMANAGERSERVICE"]._serialized_end = 1057
 # @@protoc_insertion_point(module_scope)
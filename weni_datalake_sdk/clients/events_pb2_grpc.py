@@ -6,7 +6,7 @@ import grpc
 
 from . import events_pb2 as events__pb2
 
-GRPC_GENERATED_VERSION = "1.71.0"
+GRPC_GENERATED_VERSION = "1.73.0"
 GRPC_VERSION = grpc.__version__
 _version_not_supported = False
 
@@ -44,6 +44,18 @@ class DatalakeManagerServiceStub(object):
             response_deserializer=events__pb2.InsertEventResponse.FromString,
             _registered_method=True,
         )
+        self.InsertEventBatch = channel.unary_unary(
+            "/events.DatalakeManagerService/InsertEventBatch",
+            request_serializer=events__pb2.InsertEventBatchRequest.SerializeToString,
+            response_deserializer=events__pb2.InsertBatchResponse.FromString,
+            _registered_method=True,
+        )
+        self.InsertEventStream = channel.stream_unary(
+            "/events.DatalakeManagerService/InsertEventStream",
+            request_serializer=events__pb2.InsertEventRequest.SerializeToString,
+            response_deserializer=events__pb2.InsertBatchResponse.FromString,
+            _registered_method=True,
+        )
 
 
 class DatalakeManagerServiceServicer(object):
@@ -55,6 +67,18 @@ class DatalakeManagerServiceServicer(object):
         context.set_details("Method not implemented!")
         raise NotImplementedError("Method not implemented!")
 
+    def InsertEventBatch(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details("Method not implemented!")
+        raise NotImplementedError("Method not implemented!")
+
+    def InsertEventStream(self, request_iterator, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details("Method not implemented!")
+        raise NotImplementedError("Method not implemented!")
+
 
 def add_DatalakeManagerServiceServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -63,6 +87,16 @@ def add_DatalakeManagerServiceServicer_to_server(servicer, server):
             request_deserializer=events__pb2.InsertEventRequest.FromString,
             response_serializer=events__pb2.InsertEventResponse.SerializeToString,
         ),
+        "InsertEventBatch": grpc.unary_unary_rpc_method_handler(
+            servicer.InsertEventBatch,
+            request_deserializer=events__pb2.InsertEventBatchRequest.FromString,
+            response_serializer=events__pb2.InsertBatchResponse.SerializeToString,
+        ),
+        "InsertEventStream": grpc.stream_unary_rpc_method_handler(
+            servicer.InsertEventStream,
+            request_deserializer=events__pb2.InsertEventRequest.FromString,
+            response_serializer=events__pb2.InsertBatchResponse.SerializeToString,
+        ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
         "events.DatalakeManagerService", rpc_method_handlers
@@ -106,3 +140,63 @@ class DatalakeManagerService(object):
             metadata,
             _registered_method=True,
         )
+
+    @staticmethod
+    def InsertEventBatch(
+        request,
+        target,
+        options=(),
+        channel_credentials=None,
+        call_credentials=None,
+        insecure=False,
+        compression=None,
+        wait_for_ready=None,
+        timeout=None,
+        metadata=None,
+    ):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            "/events.DatalakeManagerService/InsertEventBatch",
+            events__pb2.InsertEventBatchRequest.SerializeToString,
+            events__pb2.InsertBatchResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True,
+        )
+
+    @staticmethod
+    def InsertEventStream(
+        request_iterator,
+        target,
+        options=(),
+        channel_credentials=None,
+        call_credentials=None,
+        insecure=False,
+        compression=None,
+        wait_for_ready=None,
+        timeout=None,
+        metadata=None,
+    ):
+        return grpc.experimental.stream_unary(
+            request_iterator,
+            target,
+            "/events.DatalakeManagerService/InsertEventStream",
+            events__pb2.InsertEventRequest.SerializeToString,
+            events__pb2.InsertBatchResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True,
+        )
@@ -0,0 +1,197 @@
+import atexit
+import os
+import threading
+import weakref
+from collections import deque
+from concurrent.futures import Executor, Future
+
+from weni_datalake_sdk.utils.exceptions import QueueFullError
+
+DATALAKE_MAXIMUN_WORKERS = int(os.environ.get("DATALAKE_MAXIMUN_WORKERS", 5))
+DATALAKE_EXECUTOR_QUEUE_SIZE = int(os.environ.get("DATALAKE_EXECUTOR_QUEUE_SIZE", 1000))
+DATALAKE_EXECUTOR_OVERFLOW_POLICY = os.environ.get(
+    "DATALAKE_EXECUTOR_OVERFLOW_POLICY", "block"
+)
+DATALAKE_EXECUTOR_BLOCK_TIMEOUT = float(
+    os.environ.get("DATALAKE_EXECUTOR_BLOCK_TIMEOUT", 5)
+)
+
+BLOCK = "block"
+DROP_OLDEST = "drop_oldest"
+DROP_NEWEST = "drop_newest"
+SPILL = "spill"
+OVERFLOW_POLICIES = (BLOCK, DROP_OLDEST, DROP_NEWEST, SPILL)
+
+_EXECUTORS = weakref.WeakSet()
+
+
+class BoundedExecutor(Executor):
+    """
+    Thread pool with a bounded work queue.
+
+    When `queue_size` tasks are already waiting, `overflow_policy` decides:
+        - "block": wait up to `block_timeout` seconds for room, then reject
+        - "drop_oldest": reject the oldest queued task to make room
+        - "drop_newest": reject the new task
+        - "spill": hand the new task to `spill(fn, args, kwargs)`, whose
+          return value becomes the Future result
+
+    Rejected tasks get a Future failed with QueueFullError, so callers are
+    never blocked longer than `block_timeout`.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = DATALAKE_MAXIMUN_WORKERS,
+        queue_size: int = DATALAKE_EXECUTOR_QUEUE_SIZE,
+        overflow_policy: str = DATALAKE_EXECUTOR_OVERFLOW_POLICY,
+        block_timeout: float = DATALAKE_EXECUTOR_BLOCK_TIMEOUT,
+        spill=None,
+        name: str = "datalake-executor",
+    ):
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(
+                f"Invalid overflow policy '{overflow_policy}',"
+                f" expected one of {OVERFLOW_POLICIES}"
+            )
+        if overflow_policy == SPILL and spill is None:
+            raise ValueError("The spill policy needs a spill handler")
+        if int(queue_size) < 1:
+            raise ValueError("Queue size must be at least 1")
+
+        self.max_workers = int(max_workers)
+        self.queue_size = int(queue_size)
+        self.overflow_policy = overflow_policy
+        self.block_timeout = block_timeout
+        self.spill = spill
+        self.name = name
+
+        self.submitted = 0
+        self.rejected = 0
+        self.spilled = 0
+
+        self._queue = deque()
+        self._threads = []
+        self._idle = 0
+        self._shutdown = False
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+
+        _EXECUTORS.add(self)
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._queue)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "queue_depth": len(self._queue),
+                "queue_size": self.queue_size,
+                "workers": len(self._threads),
+                "submitted": self.submitted,
+                "rejected": self.rejected,
+                "spilled": self.spilled,
+            }
+
+    def submit(self, fn, /, *args, **kwargs) -> Future:
+        future = Future()
+
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError("cannot schedule new futures after shutdown")
+
+            if len(self._queue) >= self.queue_size:
+                if self.overflow_policy == BLOCK:
+                    self._not_full.wait_for(
+                        lambda: len(self._queue) < self.queue_size or self._shutdown,
+                        self.block_timeout,
+                    )
+                elif self.overflow_policy == DROP_OLDEST:
+                    _, _, _, oldest = self._queue.popleft()
+                    self._reject(oldest)
+
+            if len(self._queue) >= self.queue_size or self._shutdown:
+                if self.overflow_policy != SPILL:
+                    self._reject(future)
+                    return future
+                self.spilled += 1
+            else:
+                self.submitted += 1
+                self._queue.append((fn, args, kwargs, future))
+                self._adjust_workers()
+                self._not_empty.notify()
+                return future
+
+        # Spilling may touch the disk, so it runs outside the lock.
+        try:
+            future.set_result(self.spill(fn, args, kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+        return future
+
+    def _reject(self, future: Future):
+        self.rejected += 1
+        if future.set_running_or_notify_cancel():
+            future.set_exception(
+                QueueFullError(f"{self.name} queue is full ({self.queue_size} tasks)")
+            )
+
+    def _adjust_workers(self):
+        # An idle worker only leaves `_idle` once it wakes up and takes a
+        # task, so compare the queued tasks with the idle workers rather
+        # than waiting for none to be idle.
+        if len(self._queue) > self._idle and len(self._threads) < self.max_workers:
+            thread = threading.Thread(
+                target=self._worker,
+                name=f"{self.name}_{len(self._threads)}",
+                daemon=True,
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def _worker(self):
+        while True:
+            with self._lock:
+                self._idle += 1
+                while not self._queue and not self._shutdown:
+                    self._not_empty.wait()
+                self._idle -= 1
+
+                if not self._queue:
+                    return
+                fn, args, kwargs, future = self._queue.popleft()
+                self._not_full.notify()
+
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                result = fn(*args, **kwargs)
+            except BaseException as e:
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+
+    def shutdown(self, wait=True, *, cancel_futures=False):
+        with self._lock:
+            self._shutdown = True
+            if cancel_futures:
+                while self._queue:
+                    _, _, _, future = self._queue.popleft()
+                    future.cancel()
+            self._not_empty.notify_all()
+            self._not_full.notify_all()
+            threads = list(self._threads)
+
+        if wait:
+            for thread in threads:
+                thread.join()
+
+
+def _shutdown_executors():
+    for executor in list(_EXECUTORS):
+        executor.shutdown(wait=True)
+
+
+atexit.register(_shutdown_executors)
@@ -0,0 +1,86 @@
+"""
+Shared keep-alive HTTP session for the DC API and DL Manager clients.
+"""
+import atexit
+import os
+import threading
+from http.cookiejar import DefaultCookiePolicy
+
+import requests
+from requests.adapters import HTTPAdapter
+
+DATALAKE_HTTP_POOL_CONNECTIONS = int(
+    os.environ.get("DATALAKE_HTTP_POOL_CONNECTIONS", 10)
+)
+DATALAKE_HTTP_POOL_MAXSIZE = int(os.environ.get("DATALAKE_HTTP_POOL_MAXSIZE", 50))
+
+
+def create_session(
+    pool_connections: int = DATALAKE_HTTP_POOL_CONNECTIONS,
+    pool_maxsize: int = DATALAKE_HTTP_POOL_MAXSIZE,
+) -> requests.Session:
+    """
+    Build a session keeping up to `pool_maxsize` open connections for each of
+    `pool_connections` hosts.
+
+    Cookies are never stored, so the session holds no per-request state and
+    can be shared by every thread.
+    """
+    session = requests.Session()
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    session.headers.update(
+        {"Accept-Encoding": "gzip, deflate", "Connection": "keep-alive"}
+    )
+
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+_SESSION = None
+_SESSION_PID = None
+_SESSION_LOCK = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """
+    Return the process-wide session, creating it on first use (and again in a
+    forked child, which must not share the parent's sockets).
+    """
+    global _SESSION, _SESSION_PID
+    with _SESSION_LOCK:
+        if _SESSION is None or _SESSION_PID != os.getpid():
+            _SESSION = create_session()
+            _SESSION_PID = os.getpid()
+        return _SESSION
+
+
+def configure_session(**kwargs) -> requests.Session:
+    """
+    Replace the process-wide session with one built from `kwargs`
+    (`pool_connections`, `pool_maxsize`).
+    """
+    global _SESSION, _SESSION_PID
+    session = create_session(**kwargs)
+    with _SESSION_LOCK:
+        previous = _SESSION
+        _SESSION = session
+        _SESSION_PID = os.getpid()
+
+    if previous is not None:
+        previous.close()
+    return session
+
+
+def close_session():
+    global _SESSION
+    with _SESSION_LOCK:
+        previous = _SESSION
+        _SESSION = None
+
+    if previous is not None:
+        previous.close()
+
+
+atexit.register(close_session)
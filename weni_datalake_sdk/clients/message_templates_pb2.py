@@ -26,7 +26,7 @@ from google.protobuf import (
 )
 
 DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(
-    b'\n\x17message_templates.proto\x12\x10message_template\x1a\x1cgoogle/protobuf/struct.proto\x1a\x1fgoogle/protobuf/timestamp.proto"\xd0\x02\n\x1cInsertMessageTemplateRequest\x12\x13\n\x0b\x63ontact_urn\x18\x01 \x01(\t\x12\x0f\n\x07\x63hannel\x18\x02 \x01(\t\x12\x19\n\x11template_language\x18\x03 \x01(\t\x12\x15\n\rtemplate_name\x18\x04 \x01(\t\x12\x15\n\rtemplate_uuid\x18\x05 \x01(\t\x12\x12\n\nmessage_id\x18\x06 \x01(\t\x12\x30\n\x0cmessage_date\x18\x07 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12\x11\n\tdirection\x18\x08 \x01(\t\x12\x33\n\x12template_variables\x18\t \x01(\x0b\x32\x17.google.protobuf.Struct\x12\x0c\n\x04text\x18\n \x01(\t\x12%\n\x04\x64\x61ta\x18\x0b \x01(\x0b\x32\x17.google.protobuf.Struct"/\n\x1dInsertMessageTemplateResponse\x12\x0e\n\x06status\x18\x01 \x01(\t"\xac\x01\n"InsertMessageTemplateStatusRequest\x12\x13\n\x0b\x63ontact_urn\x18\x01 \x01(\t\x12\x0e\n\x06status\x18\x02 \x01(\t\x12\x12\n\nmessage_id\x18\x03 \x01(\t\x12\x15\n\rtemplate_type\x18\x04 \x01(\t\x12\x0f\n\x07\x63hannel\x18\x05 \x01(\t\x12%\n\x04\x64\x61ta\x18\x06 \x01(\x0b\x32\x17.google.protobuf.Struct"5\n#InsertMessageTemplateStatusResponse\x12\x0e\n\x06status\x18\x01 \x01(\t2\xa7\x02\n\x16\x44\x61talakeManagerService\x12|\n\x19InsertMessageTemplateData\x12..message_template.InsertMessageTemplateRequest\x1a/.message_template.InsertMessageTemplateResponse\x12\x8e\x01\n\x1fInsertMessageTemplateStatusData\x12\x34.message_template.InsertMessageTemplateStatusRequest\x1a\x35.message_template.InsertMessageTemplateStatusResponseb\x06proto3'
+    b'\n\x17message_templates.proto\x12\x10message_template\x1a\x1cgoogle/protobuf/struct.proto\x1a\x1fgoogle/protobuf/timestamp.proto"\xd0\x02\n\x1cInsertMessageTemplateRequest\x12\x13\n\x0b\x63ontact_urn\x18\x01 \x01(\t\x12\x0f\n\x07\x63hannel\x18\x02 \x01(\t\x12\x19\n\x11template_language\x18\x03 \x01(\t\x12\x15\n\rtemplate_name\x18\x04 \x01(\t\x12\x15\n\rtemplate_uuid\x18\x05 \x01(\t\x12\x12\n\nmessage_id\x18\x06 \x01(\t\x12\x30\n\x0cmessage_date\x18\x07 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12\x11\n\tdirection\x18\x08 \x01(\t\x12\x33\n\x12template_variables\x18\t \x01(\x0b\x32\x17.google.protobuf.Struct\x12\x0c\n\x04text\x18\n \x01(\t\x12%\n\x04\x64\x61ta\x18\x0b \x01(\x0b\x32\x17.google.protobuf.Struct"/\n\x1dInsertMessageTemplateResponse\x12\x0e\n\x06status\x18\x01 \x01(\t"\xac\x01\n"InsertMessageTemplateStatusRequest\x12\x13\n\x0b\x63ontact_urn\x18\x01 \x01(\t\x12\x0e\n\x06status\x18\x02 \x01(\t\x12\x12\n\nmessage_id\x18\x03 \x01(\t\x12\x15\n\rtemplate_type\x18\x04 \x01(\t\x12\x0f\n\x07\x63hannel\x18\x05 \x01(\t\x12%\n\x04\x64\x61ta\x18\x06 \x01(\x0b\x32\x17.google.protobuf.Struct"5\n#InsertMessageTemplateStatusResponse\x12\x0e\n\x06status\x18\x01 \x01(\t"n\n!InsertMessageTemplateBatchRequest\x12I\n\x11message_templates\x18\x01 \x03(\x0b\x32..message_template.InsertMessageTemplateRequest"7\n\x13InsertBatchResponse\x12\x0e\n\x06status\x18\x01 \x01(\t\x12\x10\n\x08inserted\x18\x02 \x01(\x03\x32\x9e\x05\n\x16\x44\x61talakeManagerService\x12|\n\x19InsertMessageTemplateData\x12..message_template.InsertMessageTemplateRequest\x1a/.message_template.InsertMessageTemplateResponse\x12\x8e\x01\n\x1fInsertMessageTemplateStatusData\x12\x34.message_template.InsertMessageTemplateStatusRequest\x1a\x35.message_template.InsertMessageTemplateStatusResponse\x12x\n\x1aInsertMessageTemplateBatch\x12\x33.message_template.InsertMessageTemplateBatchRequest\x1a%.message_template.InsertBatchResponse\x12v\n\x1bInsertMessageTemplateStream\x12..message_template.InsertMessageTemplateRequest\x1a%.message_template.InsertBatchResponse(\x01\x12\x82\x01\n!InsertMessageTemplateStatusStream\x12\x34.message_template.InsertMessageTemplateStatusRequest\x1a%.message_template.InsertBatchResponse(\x01\x62\x06proto3'
 )
 
 _globals = globals()
@@ -42,6 +42,10 @@ if not _descriptor._USE_C_DESCRIPTORS:
     _globals["_INSERTMESSAGETEMPLATESTATUSREQUEST"]._serialized_end = 669
     _globals["_INSERTMESSAGETEMPLATESTATUSRESPONSE"]._serialized_start = 671
     _globals["_INSERTMESSAGETEMPLATESTATUSRESPONSE"]._serialized_end = 724
-    _globals["_DATALAKEMANAGERSERVICE"]._serialized_start = 727
-    _globals["_DATALAKEMANAGERSERVICE"]._serialized_end = 1022
+    _globals["_INSERTMESSAGETEMPLATEBATCHREQUEST"]._serialized_start = 726
+    _globals["_INSERTMESSAGETEMPLATEBATCHREQUEST"]._serialized_end = 836
+    _globals["_INSERTBATCHRESPONSE"]._serialized_start = 838
+    _globals["_INSERTBATCHRESPONSE"]._serialized_end = 893
+    _globals["_DATALAKEMANAGERSERVICE"]._serialized_start = 896
+    _globals["_DATALAKEMANAGERSERVICE"]._serialized_end = 1566
 # @@protoc_insertion_point(module_scope)
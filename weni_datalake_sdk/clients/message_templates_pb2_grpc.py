@@ -6,7 +6,7 @@ import grpc
 
 from . import message_templates_pb2 as message__templates__pb2
 
-GRPC_GENERATED_VERSION = "1.71.0"
+GRPC_GENERATED_VERSION = "1.73.0"
 GRPC_VERSION = grpc.__version__
 _version_not_supported = False
 
@@ -50,6 +50,24 @@ class DatalakeManagerServiceStub(object):
             response_deserializer=message__templates__pb2.InsertMessageTemplateStatusResponse.FromString,
             _registered_method=True,
         )
+        self.InsertMessageTemplateBatch = channel.unary_unary(
+            "/message_template.DatalakeManagerService/InsertMessageTemplateBatch",
+            request_serializer=message__templates__pb2.InsertMessageTemplateBatchRequest.SerializeToString,
+            response_deserializer=message__templates__pb2.InsertBatchResponse.FromString,
+            _registered_method=True,
+        )
+        self.InsertMessageTemplateStream = channel.stream_unary(
+            "/message_template.DatalakeManagerService/InsertMessageTemplateStream",
+            request_serializer=message__templates__pb2.InsertMessageTemplateRequest.SerializeToString,
+            response_deserializer=message__templates__pb2.InsertBatchResponse.FromString,
+            _registered_method=True,
+        )
+        self.InsertMessageTemplateStatusStream = channel.stream_unary(
+            "/message_template.DatalakeManagerService/InsertMessageTemplateStatusStream",
+            request_serializer=message__templates__pb2.InsertMessageTemplateStatusRequest.SerializeToString,
+            response_deserializer=message__templates__pb2.InsertBatchResponse.FromString,
+            _registered_method=True,
+        )
 
 
 class DatalakeManagerServiceServicer(object):
@@ -67,6 +85,24 @@ class DatalakeManagerServiceServicer(object):
         context.set_details("Method not implemented!")
         raise NotImplementedError("Method not implemented!")
 
+    def InsertMessageTemplateBatch(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details("Method not implemented!")
+        raise NotImplementedError("Method not implemented!")
+
+    def InsertMessageTemplateStream(self, request_iterator, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details("Method not implemented!")
+        raise NotImplementedError("Method not implemented!")
+
+    def InsertMessageTemplateStatusStream(self, request_iterator, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details("Method not implemented!")
+        raise NotImplementedError("Method not implemented!")
+
 
 def add_DatalakeManagerServiceServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -80,6 +116,21 @@ def add_DatalakeManagerServiceServicer_to_server(servicer, server):
             request_deserializer=message__templates__pb2.InsertMessageTemplateStatusRequest.FromString,
             response_serializer=message__templates__pb2.InsertMessageTemplateStatusResponse.SerializeToString,
         ),
+        "InsertMessageTemplateBatch": grpc.unary_unary_rpc_method_handler(
+            servicer.InsertMessageTemplateBatch,
+            request_deserializer=message__templates__pb2.InsertMessageTemplateBatchRequest.FromString,
+            response_serializer=message__templates__pb2.InsertBatchResponse.SerializeToString,
+        ),
+        "InsertMessageTemplateStream": grpc.stream_unary_rpc_method_handler(
+            servicer.InsertMessageTemplateStream,
+            request_deserializer=message__templates__pb2.InsertMessageTemplateRequest.FromString,
+            response_serializer=message__templates__pb2.InsertBatchResponse.SerializeToString,
+        ),
+        "InsertMessageTemplateStatusStream": grpc.stream_unary_rpc_method_handler(
+            servicer.InsertMessageTemplateStatusStream,
+            request_deserializer=message__templates__pb2.InsertMessageTemplateStatusRequest.FromString,
+            response_serializer=message__templates__pb2.InsertBatchResponse.SerializeToString,
+        ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
         "message_template.DatalakeManagerService", rpc_method_handlers
@@ -153,3 +204,93 @@ class DatalakeManagerService(object):
             metadata,
             _registered_method=True,
         )
+
+    @staticmethod
+    def InsertMessageTemplateBatch(
+        request,
+        target,
+        options=(),
+        channel_credentials=None,
+        call_credentials=None,
+        insecure=False,
+        compression=None,
+        wait_for_ready=None,
+        timeout=None,
+        metadata=None,
+    ):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            "/message_template.DatalakeManagerService/InsertMessageTemplateBatch",
+            message__templates__pb2.InsertMessageTemplateBatchRequest.SerializeToString,
+            message__templates__pb2.InsertBatchResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True,
+        )
+
+    @staticmethod
+    def InsertMessageTemplateStream(
+        request_iterator,
+        target,
+        options=(),
+        channel_credentials=None,
+        call_credentials=None,
+        insecure=False,
+        compression=None,
+        wait_for_ready=None,
+        timeout=None,
+        metadata=None,
+    ):
+        return grpc.experimental.stream_unary(
+            request_iterator,
+            target,
+            "/message_template.DatalakeManagerService/InsertMessageTemplateStream",
+            message__templates__pb2.InsertMessageTemplateRequest.SerializeToString,
+            message__templates__pb2.InsertBatchResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True,
+        )
+
+    @staticmethod
+    def InsertMessageTemplateStatusStream(
+        request_iterator,
+        target,
+        options=(),
+        channel_credentials=None,
+        call_credentials=None,
+        insecure=False,
+        compression=None,
+        wait_for_ready=None,
+        timeout=None,
+        metadata=None,
+    ):
+        return grpc.experimental.stream_unary(
+            request_iterator,
+            target,
+            "/message_template.DatalakeManagerService/InsertMessageTemplateStatusStream",
+            message__templates__pb2.InsertMessageTemplateStatusRequest.SerializeToString,
+            message__templates__pb2.InsertBatchResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True,
+        )
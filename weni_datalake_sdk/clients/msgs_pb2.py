@@ -23,7 +23,7 @@ _sym_db = _symbol_database.Default()
 from google.protobuf import struct_pb2 as google_dot_protobuf_dot_struct__pb2
 
 DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(
-    b'\n\nmsgs.proto\x12\x04msgs\x1a\x1cgoogle/protobuf/struct.proto"D\n\rInsertRequest\x12\x0c\n\x04path\x18\x01 \x01(\t\x12%\n\x04\x64\x61ta\x18\x02 \x01(\x0b\x32\x17.google.protobuf.Struct" \n\x0eInsertResponse\x12\x0e\n\x06status\x18\x01 \x01(\t2Q\n\x16\x44\x61talakeManagerService\x12\x37\n\nInsertData\x12\x13.msgs.InsertRequest\x1a\x14.msgs.InsertResponseb\x06proto3'
+    b'\n\nmsgs.proto\x12\x04msgs\x1a\x1cgoogle/protobuf/struct.proto"D\n\rInsertRequest\x12\x0c\n\x04path\x18\x01 \x01(\t\x12%\n\x04\x64\x61ta\x18\x02 \x01(\x0b\x32\x17.google.protobuf.Struct" \n\x0eInsertResponse\x12\x0e\n\x06status\x18\x01 \x01(\t"7\n\x13InsertBatchResponse\x12\x0e\n\x06status\x18\x01 \x01(\t\x12\x10\n\x08inserted\x18\x02 \x01(\x03\x32\x97\x01\n\x16\x44\x61talakeManagerService\x12\x37\n\nInsertData\x12\x13.msgs.InsertRequest\x1a\x14.msgs.InsertResponse\x12\x44\n\x10InsertDataStream\x12\x13.msgs.InsertRequest\x1a\x19.msgs.InsertBatchResponse(\x01\x62\x06proto3'
 )
 
 _globals = globals()
@@ -35,6 +35,8 @@ if not _descriptor._USE_C_DESCRIPTORS:
     _globals["_INSERTREQUEST"]._serialized_end = 118
     _globals["_INSERTRESPONSE"]._serialized_start = 120
     _globals["_INSERTRESPONSE"]._serialized_end = 152
-    _globals["_DATALAKEMANAGERSERVICE"]._serialized_start = 154
-    _globals["_DATALAKEMANAGERSERVICE"]._serialized_end = 235
+    _globals["_INSERTBATCHRESPONSE"]._serialized_start = 154
+    _globals["_INSERTBATCHRESPONSE"]._serialized_end = 209
+    _globals["_DATALAKEMANAGERSERVICE"]._serialized_start = 212
+    _globals["_DATALAKEMANAGERSERVICE"]._serialized_end = 363
 # @@protoc_insertion_point(module_scope)
@@ -1,5 +1,7 @@
 # Generated by the gRPC Python protocol compiler plugin. DO NOT EDIT!
 """Client and server classes corresponding to protobuf-defined services."""
+import warnings
+
 import grpc
 
 from . import msgs_pb2 as msgs__pb2
@@ -42,6 +44,12 @@ class DatalakeManagerServiceStub(object):
             response_deserializer=msgs__pb2.InsertResponse.FromString,
             _registered_method=True,
         )
+        self.InsertDataStream = channel.stream_unary(
+            "/msgs.DatalakeManagerService/InsertDataStream",
+            request_serializer=msgs__pb2.InsertRequest.SerializeToString,
+            response_deserializer=msgs__pb2.InsertBatchResponse.FromString,
+            _registered_method=True,
+        )
 
 
 class DatalakeManagerServiceServicer(object):
@@ -53,6 +61,12 @@ class DatalakeManagerServiceServicer(object):
         context.set_details("Method not implemented!")
         raise NotImplementedError("Method not implemented!")
 
+    def InsertDataStream(self, request_iterator, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details("Method not implemented!")
+        raise NotImplementedError("Method not implemented!")
+
 
 def add_DatalakeManagerServiceServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -61,6 +75,11 @@ def add_DatalakeManagerServiceServicer_to_server(servicer, server):
             request_deserializer=msgs__pb2.InsertRequest.FromString,
             response_serializer=msgs__pb2.InsertResponse.SerializeToString,
         ),
+        "InsertDataStream": grpc.stream_unary_rpc_method_handler(
+            servicer.InsertDataStream,
+            request_deserializer=msgs__pb2.InsertRequest.FromString,
+            response_serializer=msgs__pb2.InsertBatchResponse.SerializeToString,
+        ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
         "msgs.DatalakeManagerService", rpc_method_handlers
@@ -104,3 +123,33 @@ class DatalakeManagerService(object):
             metadata,
             _registered_method=True,
         )
+
+    @staticmethod
+    def InsertDataStream(
+        request_iterator,
+        target,
+        options=(),
+        channel_credentials=None,
+        call_credentials=None,
+        insecure=False,
+        compression=None,
+        wait_for_ready=None,
+        timeout=None,
+        metadata=None,
+    ):
+        return grpc.experimental.stream_unary(
+            request_iterator,
+            target,
+            "/msgs.DatalakeManagerService/InsertDataStream",
+            msgs__pb2.InsertRequest.SerializeToString,
+            msgs__pb2.InsertBatchResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True,
+        )
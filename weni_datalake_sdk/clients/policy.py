@@ -0,0 +1,340 @@
+"""
+Deadlines, retries and hedging for the unary insert RPCs.
+
+Policies are set per path (table name) with `configure_policy`; paths without
+one use the default policy, which can be tuned through env variables.
+"""
+import asyncio
+import json
+import os
+import random
+import threading
+import time
+from concurrent.futures import Future, InvalidStateError
+from dataclasses import dataclass, field
+
+import grpc
+
+DATALAKE_GRPC_TIMEOUT = float(os.environ.get("DATALAKE_GRPC_TIMEOUT", 10))
+DATALAKE_GRPC_MAX_ATTEMPTS = int(os.environ.get("DATALAKE_GRPC_MAX_ATTEMPTS", 3))
+DATALAKE_GRPC_DEADLINE = float(os.environ.get("DATALAKE_GRPC_DEADLINE", 30))
+
+
+@dataclass
+class CallPolicy:
+    """
+    `timeout` is the deadline of each attempt, in seconds, and `deadline` the
+    deadline of the whole call across attempts and backoffs (None for no cap:
+    up to `max_attempts * timeout` plus the backoffs). Retries wait
+    `initial_backoff * backoff_multiplier ** n` seconds (capped at
+    `max_backoff`) plus or minus `jitter` percent, and are not started when
+    the backoff would end past `deadline`.
+
+    With `hedging_delay` set, a new attempt is started every `hedging_delay`
+    seconds while none has answered, up to `max_attempts`, and the first
+    success wins. Hedging may insert a record twice, so only enable it on
+    latency-critical paths where that is acceptable.
+    """
+
+    timeout: float = DATALAKE_GRPC_TIMEOUT
+    max_attempts: int = DATALAKE_GRPC_MAX_ATTEMPTS
+    initial_backoff: float = 0.1
+    max_backoff: float = 2.0
+    backoff_multiplier: float = 2.0
+    jitter: float = 0.2
+    retryable_codes: tuple = (grpc.StatusCode.UNAVAILABLE,)
+    hedging_delay: float = None
+    deadline: float = DATALAKE_GRPC_DEADLINE
+
+    def backoff(self, retry: int) -> float:
+        delay = min(
+            self.initial_backoff * self.backoff_multiplier**retry, self.max_backoff
+        )
+        return delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def end_time(self) -> float:
+        """Monotonic time at which a call starting now must end, or None."""
+        if self.deadline is None:
+            return None
+        return time.monotonic() + self.deadline
+
+    def attempt_timeout(self, end: float) -> float:
+        if end is None:
+            return self.timeout
+        return max(0.0, min(self.timeout, end - time.monotonic()))
+
+    def has_time(self, end: float, delay: float = 0.0) -> bool:
+        return end is None or time.monotonic() + delay < end
+
+
+@dataclass
+class RetryBudget:
+    """
+    Token bucket shared by every call, as in gRPC retry throttling: each
+    failure costs one token, each success gives back `token_ratio`, and
+    retries or hedges are only allowed while more than half of `max_tokens`
+    are left. This stops retry storms while the server is struggling.
+    """
+
+    max_tokens: float = 10.0
+    token_ratio: float = 0.1
+    tokens: float = None
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def __post_init__(self):
+        if self.tokens is None:
+            self.tokens = self.max_tokens
+
+    def on_success(self):
+        with self._lock:
+            self.tokens = min(self.tokens + self.token_ratio, self.max_tokens)
+
+    def on_failure(self):
+        with self._lock:
+            self.tokens = max(self.tokens - 1, 0)
+
+    def allow_retry(self) -> bool:
+        with self._lock:
+            return self.tokens > self.max_tokens / 2
+
+
+DEFAULT_POLICY = CallPolicy()
+RETRY_BUDGET = RetryBudget()
+
+_POLICIES = {}
+
+
+def configure_policy(path: str, policy: CallPolicy):
+    """
+    Use `policy` for inserts into `path` (e.g. "events"). None resets it.
+    """
+    if policy is None:
+        _POLICIES.pop(path, None)
+    else:
+        _POLICIES[path] = policy
+
+
+def get_policy(path: str) -> CallPolicy:
+    return _POLICIES.get(path, DEFAULT_POLICY)
+
+
+def call_with_policy(method, request, policy: CallPolicy, budget: RetryBudget):
+    """
+    Call the unary `method` multicallable following `policy`.
+    """
+    if policy.hedging_delay is not None:
+        return _call_hedged(method, request, policy, budget)
+
+    end = policy.end_time()
+    attempt = 0
+    while True:
+        attempt += 1
+        try:
+            response = method(request, timeout=policy.attempt_timeout(end))
+        except grpc.RpcError as e:
+            budget.on_failure()
+            delay = policy.backoff(attempt - 1)
+            if (
+                e.code() not in policy.retryable_codes
+                or attempt >= policy.max_attempts
+                or not budget.allow_retry()
+                or not policy.has_time(end, delay)
+            ):
+                raise
+            time.sleep(delay)
+        else:
+            budget.on_success()
+            return response
+
+
+def _call_hedged(method, request, policy: CallPolicy, budget: RetryBudget):
+    end = policy.end_time()
+    done = threading.Condition()
+    futures = []
+    finished = []
+    failed = 0
+    error = None
+
+    def on_done(future):
+        with done:
+            finished.append(future)
+            done.notify()
+
+    def start():
+        future = method.future(request, timeout=policy.attempt_timeout(end))
+        futures.append(future)
+        future.add_done_callback(on_done)
+
+    with done:
+        start()
+        while True:
+            can_hedge = len(futures) < policy.max_attempts
+            if not finished:
+                done.wait(policy.hedging_delay if can_hedge else None)
+
+            while finished:
+                future = finished.pop(0)
+                try:
+                    response = future.result()
+                except grpc.RpcError as e:
+                    budget.on_failure()
+                    failed += 1
+                    error = e
+                    if e.code() not in policy.retryable_codes:
+                        _cancel(futures)
+                        raise
+                else:
+                    budget.on_success()
+                    _cancel(futures)
+                    return response
+
+            if (
+                len(futures) < policy.max_attempts
+                and budget.allow_retry()
+                and policy.has_time(end)
+            ):
+                start()
+            elif failed == len(futures):
+                raise error
+
+
+def call_future_with_policy(
+    method, request, policy: CallPolicy, budget: RetryBudget
+) -> Future:
+    """
+    Non-blocking `call_with_policy`: issues `method.future(...)` and returns a
+    concurrent.futures.Future with the response. Retries are scheduled from the
+    gRPC completion callback, so no thread waits on the call. Hedging is not
+    applied in this mode.
+    """
+    result = Future()
+    end = policy.end_time()
+    attempt = 0
+
+    def start():
+        nonlocal attempt
+        attempt += 1
+        try:
+            call = method.future(request, timeout=policy.attempt_timeout(end))
+        except Exception as e:
+            _settle(result.set_exception, e)
+            return
+        result.add_done_callback(lambda f: f.cancelled() and call.cancel())
+        call.add_done_callback(on_done)
+
+    def on_done(call):
+        # The caller may cancel `result` while the call is in flight.
+        if result.done():
+            return
+        try:
+            response = call.result()
+        except grpc.FutureCancelledError:
+            result.cancel()
+        except grpc.RpcError as e:
+            budget.on_failure()
+            delay = policy.backoff(attempt - 1)
+            if (
+                e.code() not in policy.retryable_codes
+                or attempt >= policy.max_attempts
+                or not budget.allow_retry()
+                or not policy.has_time(end, delay)
+            ):
+                _settle(result.set_exception, e)
+                return
+            timer = threading.Timer(delay, start)
+            timer.daemon = True
+            timer.start()
+        else:
+            budget.on_success()
+            _settle(result.set_result, response)
+
+    start()
+    return result
+
+
+async def call_async_with_policy(
+    method, request, policy: CallPolicy, budget: RetryBudget
+):
+    """
+    `call_with_policy` for a `grpc.aio` unary `method`: backoffs are awaited
+    instead of slept. Hedging is not applied in this mode.
+    """
+    end = policy.end_time()
+    attempt = 0
+    while True:
+        attempt += 1
+        try:
+            response = await method(request, timeout=policy.attempt_timeout(end))
+        except grpc.RpcError as e:
+            budget.on_failure()
+            delay = policy.backoff(attempt - 1)
+            if (
+                e.code() not in policy.retryable_codes
+                or attempt >= policy.max_attempts
+                or not budget.allow_retry()
+                or not policy.has_time(end, delay)
+            ):
+                raise
+            await asyncio.sleep(delay)
+        else:
+            budget.on_success()
+            return response
+
+
+def _settle(set_outcome, value):
+    try:
+        set_outcome(value)
+    except InvalidStateError:
+        pass
+
+
+def _cancel(futures: list):
+    for future in futures:
+        if not future.done():
+            future.cancel()
+
+
+def to_service_config(policies: dict, budget: RetryBudget = RETRY_BUDGET) -> str:
+    """
+    Render `policies` as a gRPC service config JSON, to let the gRPC core
+    retry instead of the SDK. Pass it with
+    `configure_channel_pool(service_config=...)` and set `max_attempts=1` on
+    the SDK policies so calls are not retried twice.
+
+    The service config works per method, not per path, so `policies` maps a
+    method path to its policy, e.g.
+    {"/events.DatalakeManagerService/InsertEventData": CallPolicy(timeout=2)}.
+    """
+    method_config = []
+    for method_path, policy in policies.items():
+        service, _, method = method_path.strip("/").partition("/")
+        config = {
+            "name": [{"service": service, "method": method}],
+            "timeout": f"{policy.timeout}s",
+        }
+        codes = [code.name for code in policy.retryable_codes]
+        if policy.hedging_delay is not None:
+            config["hedgingPolicy"] = {
+                "maxAttempts": policy.max_attempts,
+                "hedgingDelay": f"{policy.hedging_delay}s",
+                "nonFatalStatusCodes": codes,
+            }
+        elif policy.max_attempts > 1:
+            config["retryPolicy"] = {
+                "maxAttempts": policy.max_attempts,
+                "initialBackoff": f"{policy.initial_backoff}s",
+                "maxBackoff": f"{policy.max_backoff}s",
+                "backoffMultiplier": policy.backoff_multiplier,
+                "retryableStatusCodes": codes,
+            }
+        method_config.append(config)
+
+    return json.dumps(
+        {
+            "methodConfig": method_config,
+            "retryThrottling": {
+                "maxTokens": budget.max_tokens,
+                "tokenRatio": budget.token_ratio,
+            },
+        }
+    )
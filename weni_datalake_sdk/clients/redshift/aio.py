@@ -0,0 +1,366 @@
+"""
+asyncio counterparts of the DC API queries: `query_dc_api`, the get_events*
+functions, `get_traces`, `get_message_templates` and `get_installed_apps`.
+
+Requests go through one pooled aiohttp session per event loop and share the
+token cache of the sync API. At most `DATALAKE_AIO_QUERY_CONCURRENCY`
+requests of a loop are in flight, so `asyncio.gather` over many queries is
+safe. Needs aiohttp (`pip install weni-datalake-sdk[aio]`).
+"""
+import asyncio
+import os
+from urllib.parse import urlencode
+
+from weni_datalake_sdk.clients.http import DATALAKE_HTTP_POOL_MAXSIZE
+from weni_datalake_sdk.clients.redshift import redshift_client
+from weni_datalake_sdk.clients.redshift.batch import QueryResult
+from weni_datalake_sdk.clients.redshift.cache import (
+    MISSING,
+    make_key,
+    resolve_cache,
+)
+from weni_datalake_sdk.clients.redshift.credentials import TOKEN_MANAGER
+from weni_datalake_sdk.clients.redshift.events import loads_clean, valid_tables
+from weni_datalake_sdk.utils.loops import PerLoop
+
+try:
+    import aiohttp
+    from yarl import URL
+except ImportError:  # pragma: no cover
+    aiohttp = None
+
+DATALAKE_AIO_QUERY_CONCURRENCY = int(
+    os.environ.get("DATALAKE_AIO_QUERY_CONCURRENCY", 16)
+)
+
+
+def create_session(limit: int = DATALAKE_HTTP_POOL_MAXSIZE):
+    """
+    Build a session keeping up to `limit` open connections. Like the sync
+    session, it stores no cookies and does not verify certificates.
+    """
+    if aiohttp is None:
+        raise ImportError("aiohttp is required for the asyncio DC API client")
+
+    return aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit=limit, ssl=False),
+        cookie_jar=aiohttp.DummyCookieJar(),
+        headers={"Accept-Encoding": "gzip, deflate"},
+    )
+
+
+class _LoopSession:
+    """The session of one event loop and the semaphore limiting its requests."""
+
+    def __init__(self):
+        self.session = create_session()
+        self.semaphore = asyncio.Semaphore(DATALAKE_AIO_QUERY_CONCURRENCY)
+
+    async def close(self):
+        await self.session.close()
+
+
+# aiohttp sessions are bound to the loop that created them, so each loop gets
+# its own, closed when `asyncio.run` shuts the loop down.
+_SESSIONS = PerLoop(_LoopSession, _LoopSession.close)
+
+
+def get_session():
+    """
+    Return the running loop's session, creating it on first use.
+    """
+    loop_session = _SESSIONS.get()
+    if loop_session.session.closed:
+        loop_session.session = create_session()
+    return loop_session.session
+
+
+def _get_semaphore() -> asyncio.Semaphore:
+    return _SESSIONS.get().semaphore
+
+
+async def close_session():
+    """
+    Close the session opened by the running event loop.
+    """
+    loop_session = _SESSIONS.pop()
+    if loop_session is not None:
+        await loop_session.close()
+
+
+async def get_secrets(force_refresh: bool = False, rejected: str = None):
+    """
+    Return the DC API token. Only a missing or rejected token is fetched, in a
+    worker thread so the loop keeps running.
+    """
+    if not force_refresh and rejected is None:
+        token = TOKEN_MANAGER.cached_token()
+        if token is not None:
+            return token
+    return await asyncio.to_thread(TOKEN_MANAGER.get_token, force_refresh, rejected)
+
+
+async def query_dc_api(metric: str, query_params: dict = None):
+    """
+    Same as `redshift_client.query_dc_api`. The returned response has its body
+    already read, so `await response.json()` works after the call.
+    """
+    base_url = redshift_client.REDSHIFT_QUERY_BASE_URL
+    if not base_url:
+        raise EnvironmentError("Missing REDSHIFT_QUERY_BASE_URL env variable")
+
+    url = f"{base_url.rstrip('/')}/{metric}"
+
+    token = await get_secrets()
+
+    headers_auth = {
+        "Content-Type": "application/x-www-form-urlencoded;charset=utf-8",
+        "secretsaccesstoken": token,
+    }
+
+    query_string = urlencode(query_params or {}, safe=":")
+    request_url = URL(f"{url}?{query_string}" if query_string else url, encoded=True)
+
+    async with _get_semaphore():
+        async with get_session().get(request_url, headers=headers_auth) as response:
+            await response.read()
+
+    if response.status != 200:
+        if response.status == 401:
+            token_old = token
+            # Refresh token
+            token = await get_secrets(rejected=token_old)
+            if token_old == token:
+                raise Exception(
+                    f"Could not send message to DC API! Error: <Response [{response.status}]> - Token was updated!"
+                    + f" URL: {url}"
+                )
+            else:
+                return await query_dc_api(metric, query_params)
+        raise Exception(
+            f"Could not send message to DC API! Error: <Response [{response.status}]>"
+            + f" URL: {url}"
+        )
+    return response
+
+
+async def _fetch(metric: str, params: dict, cache=None, clean: bool = False):
+    cache = resolve_cache(cache)
+    key = make_key(metric, params)
+    data = MISSING if cache is None else cache.get(key, MISSING)
+    if data is MISSING:
+        response = await query_dc_api(metric=metric, query_params=params)
+        if clean:
+            data = await response.json(content_type=None, loads=loads_clean)
+        else:
+            data = await response.json(content_type=None)
+        if cache is not None:
+            cache.set(key, data)
+    return data
+
+
+REQUIRED = {
+    "project": "Project is required",
+    "date_start": "Date start is required",
+    "date_end": "Date end is required",
+    "metadata_key": "metadata_key is required",
+}
+RANGE = ("project", "date_start", "date_end")
+
+
+async def _get_events(
+    metric_name: str,
+    kwargs: dict,
+    label: str,
+    required: tuple = RANGE,
+    silver: bool = False,
+    clean: bool = False,
+    cacheable: bool = True,
+):
+    """
+    Validate `kwargs` and query the metric named by the `metric_name` env
+    variable, the way the matching sync get_events* function does.
+    """
+    metric = os.environ.get(metric_name)
+    cache = kwargs.pop("cache", None) if cacheable else False
+    table = kwargs.get("table")
+
+    for field in required:
+        if not kwargs.get(field):
+            raise Exception(REQUIRED[field])
+
+    if silver:
+        if not table:
+            raise Exception("Table is required")
+
+        if table not in valid_tables:
+            raise Exception("Table is not valid")
+
+    try:
+        return await _fetch(metric, kwargs, cache, clean)
+
+    except Exception as e:
+        raise Exception(f"Error querying {label}: {e}")
+
+
+async def get_events(**kwargs) -> dict:
+    return await _get_events(
+        "EVENTS_METRIC_NAME", kwargs, "events", clean=True, cacheable=False
+    )
+
+
+async def get_events_count(**kwargs) -> dict:
+    return await _get_events("EVENTS_COUNT_METRIC_NAME", kwargs, "events count")
+
+
+async def get_events_sum(**kwargs) -> dict:
+    return await _get_events("EVENTS_SUM_METRIC_NAME", kwargs, "events sum")
+
+
+async def get_events_avg(**kwargs) -> dict:
+    return await _get_events("EVENTS_AVG_METRIC_NAME", kwargs, "events avg")
+
+
+async def get_events_max(**kwargs) -> dict:
+    return await _get_events("EVENTS_MAX_METRIC_NAME", kwargs, "events max")
+
+
+async def get_events_min(**kwargs) -> dict:
+    return await _get_events("EVENTS_MIN_METRIC_NAME", kwargs, "events min")
+
+
+async def get_events_unique_contact_urns(**kwargs) -> dict:
+    return await _get_events(
+        "EVENTS_UNIQUE_CONTACT_URNS_METRIC_NAME",
+        kwargs,
+        "events unique contact urns",
+        required=(),
+    )
+
+
+async def get_events_recurring_contact_urns(**kwargs) -> dict:
+    return await _get_events(
+        "EVENTS_RECURRING_CONTACT_URNS_METRIC_NAME",
+        kwargs,
+        "events recurring contact urns",
+    )
+
+
+async def get_events_silver_unique_contact_urns(**kwargs) -> dict:
+    return await _get_events(
+        "EVENTS_SILVER_UNIQUE_CONTACT_URNS_METRIC_NAME",
+        kwargs,
+        "events silver unique contact urns",
+        silver=True,
+    )
+
+
+async def get_events_silver_recurring_contact_urns(**kwargs) -> dict:
+    return await _get_events(
+        "EVENTS_SILVER_RECURRING_CONTACT_URNS_METRIC_NAME",
+        kwargs,
+        "events silver recurring contact urns",
+        silver=True,
+    )
+
+
+async def get_events_count_by_group(**kwargs) -> dict:
+    return await _get_events(
+        "EVENTS_COUNT_BY_GROUP_METRIC_NAME",
+        kwargs,
+        "events count",
+        required=RANGE + ("metadata_key",),
+        clean=True,
+    )
+
+
+async def get_events_silver(**kwargs) -> dict:
+    return await _get_events(
+        "EVENTS_SILVER_METRIC_NAME",
+        kwargs,
+        "events silver",
+        silver=True,
+        clean=True,
+        cacheable=False,
+    )
+
+
+async def get_events_silver_count(**kwargs) -> dict:
+    return await _get_events(
+        "EVENTS_SILVER_COUNT_METRIC_NAME",
+        kwargs,
+        "events silver",
+        silver=True,
+        clean=True,
+    )
+
+
+async def get_events_silver_count_by_group(**kwargs) -> dict:
+    return await _get_events(
+        "EVENTS_SILVER_COUNT_BY_GROUP_METRIC_NAME",
+        kwargs,
+        "events count",
+        required=RANGE + ("metadata_key",),
+        silver=True,
+        clean=True,
+    )
+
+
+async def get_traces(query_params: dict = None):
+    metric = os.environ.get("TRACES_METRIC_NAME")
+    try:
+        result = await query_dc_api(metric=metric, query_params=query_params)
+        return result
+
+    except Exception as e:
+        raise Exception(f"Error querying traces: {e}")
+
+
+async def get_message_templates(
+    contact_urn: str = None, template_uuid: str = None, query_params: dict = None
+):
+    metric = os.environ.get("MESSAGE_TEMPLATES_METRIC_NAME")
+
+    final_params = query_params.copy() if query_params else {}
+
+    if contact_urn:
+        final_params["contact_urn"] = contact_urn
+    if template_uuid:
+        final_params["template_uuid"] = template_uuid
+
+    try:
+        result = await query_dc_api(metric=metric, query_params=final_params)
+        return result
+
+    except Exception as e:
+        raise Exception(f"Error querying message templates: {e}")
+
+
+async def get_installed_apps(**kwargs) -> dict:
+    metric = os.environ.get("INSTALLED_APPS_METRIC_NAME")
+
+    try:
+        result = await query_dc_api(metric=metric, query_params=kwargs)
+        data = await result.json(content_type=None)
+        return data
+
+    except Exception as e:
+        raise Exception(f"Error querying installed apps: {e}")
+
+
+async def query_many(function, param_list) -> list:
+    """
+    Await `function(**params)` (any async get_* function) for every params of
+    `param_list` concurrently. Like batch.query_many, each call gets a
+    QueryResult holding its result or error, in input order.
+    """
+    param_list = list(param_list)
+    outcomes = await asyncio.gather(
+        *(function(**params) for params in param_list), return_exceptions=True
+    )
+    return [
+        QueryResult(index, params, error=outcome)
+        if isinstance(outcome, BaseException)
+        else QueryResult(index, params, result=outcome)
+        for index, (params, outcome) in enumerate(zip(param_list, outcomes))
+    ]
@@ -0,0 +1,216 @@
+"""
+Concurrent fan-out of DC API queries, e.g. the same count for many projects,
+or several aggregates of the same events (get_events_stats).
+"""
+import concurrent.futures
+import os
+from dataclasses import dataclass
+from typing import Any
+
+from weni_datalake_sdk.clients.redshift.events import (
+    get_events_avg,
+    get_events_count,
+    get_events_max,
+    get_events_min,
+    get_events_sum,
+    valid_tables,
+)
+from weni_datalake_sdk.clients.redshift.partitions import (
+    is_number,
+    single_number,
+)
+
+DATALAKE_QUERY_MAX_WORKERS = int(os.environ.get("DATALAKE_QUERY_MAX_WORKERS", 16))
+
+
+@dataclass
+class QueryResult:
+    """Outcome of one query: its position in the input, `result` or `error`."""
+
+    index: int
+    params: dict
+    result: Any = None
+    error: Exception = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def _outcome(index: int, params: dict, future) -> QueryResult:
+    error = future.exception()
+    if error is not None:
+        return QueryResult(index, params, error=error)
+    return QueryResult(index, params, result=future.result())
+
+
+def _iter_completed(executor, futures: dict, param_list: list):
+    try:
+        for future in concurrent.futures.as_completed(futures):
+            index = futures[future]
+            yield _outcome(index, param_list[index], future)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def query_many(
+    function,
+    param_list,
+    max_workers: int = DATALAKE_QUERY_MAX_WORKERS,
+    as_completed: bool = False,
+):
+    """
+    Call `function(**params)` (any get_events_* function) for every params of
+    `param_list`, at most `max_workers` at a time.
+
+    A failing call does not stop the others: its QueryResult holds the
+    error. Results are returned in input order, or yielded as they complete
+    when `as_completed` is set.
+    """
+    param_list = list(param_list)
+    executor = concurrent.futures.ThreadPoolExecutor(
+        max(1, min(max_workers, len(param_list))), thread_name_prefix="datalake-query"
+    )
+    futures = {
+        executor.submit(function, **params): index
+        for index, params in enumerate(param_list)
+    }
+
+    if as_completed:
+        return _iter_completed(executor, futures, param_list)
+
+    with executor:
+        results = [
+            _outcome(index, param_list[index], future)
+            for future, index in futures.items()
+        ]
+    return results
+
+
+def query_tables(function, tables: list = None, **kwargs) -> dict:
+    """
+    Run a silver query (e.g. get_events_silver_count) with the same `kwargs`
+    on every table of `tables` (all valid tables by default), concurrently.
+    Returns a QueryResult per table.
+    """
+    tables = valid_tables if tables is None else tables
+    results = query_many(function, [dict(kwargs, table=table) for table in tables])
+    return {table: result for table, result in zip(tables, results)}
+
+
+def get_events_count_many(param_list, **kwargs):
+    """
+    get_events_count for every params of `param_list`; see query_many.
+    """
+    return query_many(get_events_count, param_list, **kwargs)
+
+
+STATS_QUERIES = {
+    "count": get_events_count,
+    "sum": get_events_sum,
+    "avg": get_events_avg,
+    "min": get_events_min,
+    "max": get_events_max,
+}
+
+
+@dataclass
+class EventsStats:
+    """
+    Aggregates of get_events_stats. Each requested one holds its number, or
+    the query result as returned when that is not a single number (e.g.
+    grouped rows); the others are None.
+    """
+
+    count: Any = None
+    sum: Any = None
+    avg: Any = None
+    min: Any = None
+    max: Any = None
+
+
+def _stat_value(result):
+    if isinstance(result, dict) and list(result.values()) == [None]:
+        return None
+    try:
+        return single_number(result)
+    except Exception:
+        return result
+
+
+def _is_grouped(value) -> bool:
+    return value is not None and not is_number(value)
+
+
+def _query_stats(queries: list, derive_avg: bool, kwargs: dict) -> dict:
+    with concurrent.futures.ThreadPoolExecutor(
+        len(queries) + derive_avg, thread_name_prefix="datalake-query"
+    ) as executor:
+        pending = {
+            executor.submit(STATS_QUERIES[name], **kwargs): name for name in queries
+        }
+        avg = None
+        stats = {}
+        while pending:
+            done, _ = concurrent.futures.wait(
+                pending, return_when=concurrent.futures.FIRST_COMPLETED
+            )
+            for future in done:
+                name = pending.pop(future)
+                stats[name] = _stat_value(future.result())
+                # Grouped counts or sums cannot give the averages: query them
+                # now, alongside the queries still running.
+                if (
+                    derive_avg
+                    and avg is None
+                    and name in ("count", "sum")
+                    and _is_grouped(stats[name])
+                ):
+                    avg = executor.submit(get_events_avg, **kwargs)
+
+        if derive_avg:
+            count, total = stats["count"], stats["sum"]
+            if count == 0:
+                stats["avg"] = None
+            elif is_number(count) and is_number(total):
+                stats["avg"] = total / count
+            else:
+                if avg is None:
+                    avg = executor.submit(get_events_avg, **kwargs)
+                stats["avg"] = _stat_value(avg.result())
+    return stats
+
+
+def get_events_stats(aggregates=tuple(STATS_QUERIES), **kwargs) -> EventsStats:
+    """
+    Several of count/sum/avg/min/max for the same `kwargs` in one call. Each
+    needed metric is queried once, concurrently, through the matching
+    get_events_* function (so `cache`, `partition`, etc. apply). When count
+    and sum are both asked for, avg is derived from them instead of queried.
+    """
+    aggregates = list(dict.fromkeys(aggregates))
+    for aggregate in aggregates:
+        if aggregate not in STATS_QUERIES:
+            raise Exception(f"Aggregate is not valid: {aggregate}")
+
+    if not kwargs.get("project"):
+        raise Exception("Project is required")
+
+    if not kwargs.get("date_start"):
+        raise Exception("Date start is required")
+
+    if not kwargs.get("date_end"):
+        raise Exception("Date end is required")
+
+    derive_avg = {"count", "sum", "avg"} <= set(aggregates)
+    queries = [name for name in aggregates if not (derive_avg and name == "avg")]
+
+    try:
+        if len(queries) == 1:
+            stats = {queries[0]: _stat_value(STATS_QUERIES[queries[0]](**kwargs))}
+        else:
+            stats = _query_stats(queries, derive_avg, kwargs)
+    except Exception as e:
+        raise Exception(f"Error querying events stats: {e}")
+
+    return EventsStats(**stats)
@@ -0,0 +1,496 @@
+"""
+Result cache for DC API queries.
+
+Results are kept as JSON bytes in an in-process LRU bounded by size, and
+optionally in a shared backend (anything implementing `CacheBackend`) so
+several processes can reuse them. `SQLiteBackend` is one, shared by the
+processes of a host through a file.
+"""
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+DATALAKE_QUERY_CACHE = os.environ.get("DATALAKE_QUERY_CACHE", "0") == "1"
+DATALAKE_QUERY_CACHE_TTL = float(os.environ.get("DATALAKE_QUERY_CACHE_TTL", 60))
+DATALAKE_QUERY_CACHE_MAX_BYTES = int(
+    os.environ.get("DATALAKE_QUERY_CACHE_MAX_BYTES", 64 * 1024 * 1024)
+)
+# When set, the process-wide cache is backed by a SQLiteBackend at this path.
+DATALAKE_QUERY_CACHE_PATH = os.environ.get("DATALAKE_QUERY_CACHE_PATH")
+DATALAKE_QUERY_CACHE_DISK_MAX_BYTES = int(
+    os.environ.get("DATALAKE_QUERY_CACHE_DISK_MAX_BYTES", 512 * 1024 * 1024)
+)
+
+MISSING = object()
+
+
+def make_key(metric: str, params: dict = None) -> str:
+    """
+    Key for a query: the same metric and parameters give the same key,
+    whatever the order the parameters were passed in.
+    """
+    canonical = json.dumps(
+        [metric, params or {}], sort_keys=True, separators=(",", ":"), default=str
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class CacheBackend:
+    """
+    Storage for cached results. Values are bytes; `get` returns None for
+    missing or expired keys.
+    """
+
+    def get(self, key: str):
+        raise NotImplementedError
+
+    def get_entry(self, key: str):
+        """
+        `(value, seconds left)` for `key`, or None. Backends that cannot tell
+        how long an entry has left report 0, so it is not copied locally.
+        """
+        value = self.get(key)
+        return None if value is None else (value, 0)
+
+    def set(self, key: str, value: bytes, ttl: float):
+        raise NotImplementedError
+
+    def delete(self, key: str):
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+
+class LRUBackend(CacheBackend):
+    """
+    In-memory backend evicting the least recently used entries once the
+    stored values exceed `max_bytes`.
+    """
+
+    def __init__(self, max_bytes: int = DATALAKE_QUERY_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key: str):
+        entry = self.get_entry(key)
+        return None if entry is None else entry[0]
+
+    def get_entry(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            expires_at, value = entry
+            remaining = expires_at - time.monotonic()
+            if remaining <= 0:
+                self._remove(key)
+                return None
+
+            self._entries.move_to_end(key)
+            return value, remaining
+
+    def set(self, key: str, value: bytes, ttl: float):
+        with self._lock:
+            # An older value must not survive a new one too large to store.
+            self._remove(key)
+            if len(value) > self.max_bytes:
+                return
+
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self.size += len(value)
+
+            while self.size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+
+    def delete(self, key: str):
+        with self._lock:
+            self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size -= len(entry[1])
+
+
+class SQLiteBackend(CacheBackend):
+    """
+    Backend in a SQLite database file, in WAL mode, so every process of a
+    host shares the same entries and they survive restarts.
+
+    Values are zlib-compressed. Once the compressed values exceed
+    `max_bytes`, expired entries are dropped, then those closest to expiring.
+    Reads never write, so they do not contend with other processes. Each
+    thread (and each process after a fork) opens its own connection.
+    """
+
+    EVICT_BATCH = 64
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int = DATALAKE_QUERY_CACHE_DISK_MAX_BYTES,
+        compress_level: int = 1,
+        timeout: float = 5.0,
+    ):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.compress_level = compress_level
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is not None and self._local.pid == os.getpid():
+            return connection
+
+        connection = sqlite3.connect(
+            self.path, timeout=self.timeout, isolation_level=None
+        )
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        with self._transaction(connection):
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, "
+                "size INTEGER NOT NULL, expires_at REAL NOT NULL)"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS entries_expires_at "
+                "ON entries (expires_at)"
+            )
+            # Total size of the values, kept up to date by every write.
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS meta ("
+                "id INTEGER PRIMARY KEY CHECK (id = 0), size INTEGER NOT NULL)"
+            )
+            connection.execute("INSERT OR IGNORE INTO meta VALUES (0, 0)")
+
+        self._local.connection = connection
+        self._local.pid = os.getpid()
+        return connection
+
+    @contextmanager
+    def _transaction(self, connection=None):
+        connection = connection or self._connection()
+        # Take the write lock up front instead of upgrading a read lock,
+        # which fails right away when another process writes.
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield connection
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+
+    def __len__(self):
+        return self._connection().execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    @property
+    def size(self) -> int:
+        return self._connection().execute("SELECT size FROM meta").fetchone()[0]
+
+    def get(self, key: str):
+        entry = self.get_entry(key)
+        return None if entry is None else entry[0]
+
+    def get_entry(self, key: str):
+        row = (
+            self._connection()
+            .execute("SELECT value, expires_at FROM entries WHERE key = ?", (key,))
+            .fetchone()
+        )
+        if row is None:
+            return None
+        remaining = row[1] - time.time()
+        if remaining <= 0:
+            return None
+        return zlib.decompress(row[0]), remaining
+
+    def set(self, key: str, value: bytes, ttl: float):
+        value = zlib.compress(value, self.compress_level)
+        with self._transaction() as connection:
+            self._remove(connection, key)
+            if len(value) > self.max_bytes:
+                return
+
+            connection.execute(
+                "INSERT INTO entries VALUES (?, ?, ?, ?)",
+                (key, value, len(value), time.time() + ttl),
+            )
+            connection.execute("UPDATE meta SET size = size + ?", (len(value),))
+            self._evict(connection)
+
+    def delete(self, key: str):
+        with self._transaction() as connection:
+            self._remove(connection, key)
+
+    def clear(self):
+        with self._transaction() as connection:
+            connection.execute("DELETE FROM entries")
+            connection.execute("UPDATE meta SET size = 0")
+
+    def _remove(self, connection, key: str):
+        row = connection.execute(
+            "SELECT size FROM entries WHERE key = ?", (key,)
+        ).fetchone()
+        if row is not None:
+            connection.execute("DELETE FROM entries WHERE key = ?", (key,))
+            connection.execute("UPDATE meta SET size = size - ?", (row[0],))
+
+    def _evict(self, connection):
+        size = connection.execute("SELECT size FROM meta").fetchone()[0]
+        if size <= self.max_bytes:
+            return
+
+        now = time.time()
+        expired = connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM entries WHERE expires_at <= ?", (now,)
+        ).fetchone()[0]
+        connection.execute("DELETE FROM entries WHERE expires_at <= ?", (now,))
+        size -= expired
+
+        while size > self.max_bytes:
+            rows = connection.execute(
+                "SELECT key, size FROM entries ORDER BY expires_at LIMIT ?",
+                (self.EVICT_BATCH,),
+            ).fetchall()
+            if not rows:
+                size = 0
+                break
+            for key, entry_size in rows:
+                if size <= self.max_bytes:
+                    break
+                connection.execute("DELETE FROM entries WHERE key = ?", (key,))
+                size -= entry_size
+        connection.execute("UPDATE meta SET size = ?", (size,))
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    # Hits past their fresh TTL, served while a refresh runs.
+    stale: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class QueryCache:
+    """
+    Caches decoded query results for `ttl` seconds.
+
+    Lookups go to the local LRU first, then to the shared `backend` if any.
+    Errors raised by the backend are logged and treated as misses, so an
+    unavailable backend only costs the cache, never the query.
+    """
+
+    def __init__(
+        self,
+        ttl: float = DATALAKE_QUERY_CACHE_TTL,
+        max_bytes: int = DATALAKE_QUERY_CACHE_MAX_BYTES,
+        backend: CacheBackend = None,
+    ):
+        self.ttl = ttl
+        self.local = LRUBackend(max_bytes)
+        self.backend = backend
+        self.stats = CacheStats()
+        self._stats_lock = threading.Lock()
+        self._revalidating = set()
+        self._revalidating_lock = threading.Lock()
+
+    def get(self, key: str, default=None):
+        value = self.local.get(key)
+        if value is None and self.backend is not None:
+            entry = None
+            try:
+                entry = self.backend.get_entry(key)
+            except Exception:
+                logger.warning("Query cache backend get failed", exc_info=True)
+            if entry is not None:
+                value, remaining = entry
+                # Only for as long as the backend keeps it, so a local copy
+                # never outlives the TTL it was stored with.
+                if remaining > 0:
+                    self.local.set(key, value, remaining)
+
+        with self._stats_lock:
+            if value is None:
+                self.stats.misses += 1
+            else:
+                self.stats.hits += 1
+
+        if value is None:
+            return default
+        return json.loads(value)
+
+    def set(self, key: str, result, ttl: float = None):
+        ttl = self.ttl if ttl is None else ttl
+        value = json.dumps(result, separators=(",", ":")).encode()
+        self.local.set(key, value, ttl)
+        if self.backend is not None:
+            try:
+                self.backend.set(key, value, ttl)
+            except Exception:
+                logger.warning("Query cache backend set failed", exc_info=True)
+
+    def get_or_fetch(self, key: str, fetch, ttl: float = None):
+        """
+        Return the cached result for `key`, or call `fetch()` and cache what it
+        returns for `ttl` seconds (the cache's TTL by default). Errors are not
+        cached.
+        """
+        result = self.get(key, MISSING)
+        if result is MISSING:
+            result = fetch()
+            self.set(key, result, ttl)
+        return result
+
+    def get_or_revalidate(
+        self, key: str, fetch, fresh_ttl: float = None, stale_ttl: float = None
+    ):
+        """
+        Stale-while-revalidate lookup. A result younger than `fresh_ttl` (the
+        cache's TTL by default) is returned as is. One younger than
+        `stale_ttl` is returned as well, and `fetch()` refreshes it in the
+        background, once per key at a time. Otherwise `fetch()` is called now.
+        """
+        fresh_ttl = self.ttl if fresh_ttl is None else fresh_ttl
+        stale_ttl = fresh_ttl if stale_ttl is None else max(stale_ttl, fresh_ttl)
+
+        entry = self.get(key, MISSING)
+        if entry is MISSING:
+            return self._store(key, fetch(), stale_ttl)
+
+        if time.time() - entry["fetched_at"] >= fresh_ttl:
+            with self._stats_lock:
+                self.stats.stale += 1
+            self._revalidate(key, fetch, stale_ttl)
+        return entry["result"]
+
+    def _store(self, key: str, result, ttl: float):
+        # Wall-clock time, so the age is right in any process sharing the
+        # backend.
+        self.set(key, {"fetched_at": time.time(), "result": result}, ttl)
+        return result
+
+    def _revalidate(self, key: str, fetch, ttl: float):
+        with self._revalidating_lock:
+            if key in self._revalidating:
+                return
+            self._revalidating.add(key)
+
+        def refresh():
+            try:
+                self._store(key, fetch(), ttl)
+            except Exception:
+                logger.warning("Query cache revalidation failed", exc_info=True)
+            finally:
+                with self._revalidating_lock:
+                    self._revalidating.discard(key)
+
+        threading.Thread(
+            target=refresh, name="datalake-query-revalidate", daemon=True
+        ).start()
+
+    def clear(self):
+        self.local.clear()
+        if self.backend is not None:
+            self.backend.clear()
+        with self._stats_lock:
+            self.stats = CacheStats()
+
+
+_QUERY_CACHE = QueryCache(
+    backend=SQLiteBackend(DATALAKE_QUERY_CACHE_PATH)
+    if DATALAKE_QUERY_CACHE_PATH
+    else None
+)
+_QUERY_CACHE_ENABLED = DATALAKE_QUERY_CACHE
+
+
+def get_query_cache() -> QueryCache:
+    return _QUERY_CACHE
+
+
+def configure_query_cache(enabled: bool = True, **kwargs) -> QueryCache:
+    """
+    Replace the process-wide cache with one built from `kwargs` (`ttl`,
+    `max_bytes`, `backend`). With `enabled=False` queries only use it when
+    called with `cache=True`.
+    """
+    global _QUERY_CACHE, _QUERY_CACHE_ENABLED
+    _QUERY_CACHE = QueryCache(**kwargs)
+    _QUERY_CACHE_ENABLED = enabled
+    return _QUERY_CACHE
+
+
+def resolve_cache(cache=None):
+    """
+    Cache to use for a call given its `cache=` argument: None for the
+    process-wide cache when enabled, True or False to force it on or off, or a
+    `QueryCache` instance.
+    """
+    if cache is None:
+        cache = _QUERY_CACHE_ENABLED
+    if cache is True:
+        return _QUERY_CACHE
+    if cache is False:
+        return None
+    return cache
+
+
+def cached_query(metric: str, params: dict, fetch, cache=None, ttl: float = None):
+    """
+    Return `fetch()` for the query (`metric`, `params`), going through the
+    cache selected by `cache`.
+    """
+    cache = resolve_cache(cache)
+    if cache is None:
+        return fetch()
+    return cache.get_or_fetch(make_key(metric, params), fetch, ttl)
+
+
+def revalidated_query(
+    metric: str,
+    params: dict,
+    fetch,
+    fresh_ttl: float = None,
+    stale_ttl: float = None,
+    cache=None,
+):
+    """
+    Like cached_query, in stale-while-revalidate mode (see
+    QueryCache.get_or_revalidate). Asking for it turns the process-wide cache
+    on for the call; only `cache=False` skips it.
+    """
+    cache = resolve_cache(True if cache is None else cache)
+    if cache is None:
+        return fetch()
+    # Entries carry their fetch time, so they are kept apart from plain ones.
+    key = make_key(metric, params) + ":swr"
+    return cache.get_or_revalidate(key, fetch, fresh_ttl, stale_ttl)
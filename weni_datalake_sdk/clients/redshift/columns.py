@@ -0,0 +1,194 @@
+"""
+Columnar decoding of DC API rows.
+
+`to_columns` turns rows (dicts) into one array per field: numbers and
+booleans become typed arrays, strings are dictionary-encoded (an int32 code
+per row plus the list of distinct values) and anything else stays a list.
+With NumPy installed the arrays are NumPy arrays, built without copying;
+otherwise they are stdlib `array.array`s. Rows are consumed one by one, so
+a streamed response is never held as a list of dicts.
+"""
+from array import array
+from dataclasses import dataclass
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+_NAN = float("nan")
+
+
+@dataclass
+class DictColumn:
+    """
+    Dictionary-encoded strings: row i is `categories[codes[i]]`, a code of
+    -1 is a missing value.
+    """
+
+    codes: object
+    categories: list
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getitem__(self, index):
+        code = self.codes[index]
+        return None if code < 0 else self.categories[code]
+
+    def __iter__(self):
+        categories = self.categories
+        for code in self.codes:
+            yield None if code < 0 else categories[code]
+
+    def to_list(self) -> list:
+        return list(self)
+
+    def value_counts(self) -> dict:
+        """Number of rows holding each category."""
+        if numpy is not None:
+            codes = numpy.asarray(self.codes)
+            counts = numpy.bincount(
+                codes[codes >= 0], minlength=len(self.categories)
+            ).tolist()
+        else:
+            counts = [0] * len(self.categories)
+            for code in self.codes:
+                if code >= 0:
+                    counts[code] += 1
+        return dict(zip(self.categories, counts))
+
+
+class _Column:
+    def __init__(self, missing: int = 0):
+        # Values are typed when the first non-null one arrives; the nulls
+        # before it are only counted.
+        self.kind = None
+        self.missing = missing
+        self.data = None
+        self.index = None
+
+    def start(self, value):
+        kind = type(value)
+        if kind is int and self.missing:
+            kind = float
+        elif kind is bool and self.missing:
+            kind = object
+
+        self.kind = kind
+        if kind is int:
+            self.data = array("q")
+        elif kind is float:
+            self.data = array("d", [_NAN]) * self.missing
+        elif kind is bool:
+            self.data = array("b")
+        elif kind is str:
+            self.data = array("i", [-1]) * self.missing
+            self.index = {}
+        else:
+            self.kind = object
+            self.data = [None] * self.missing
+
+    def to_objects(self):
+        values = list(self.values())
+        self.kind = object
+        self.data = values
+        self.index = None
+
+    def values(self):
+        if self.kind is str:
+            return DictColumn(self.data, list(self.index))
+        if self.kind is bool:
+            return [bool(value) for value in self.data]
+        return self.data
+
+    def append(self, value):
+        kind = self.kind
+        if kind is None:
+            if value is None:
+                self.missing += 1
+                return
+            self.start(value)
+            kind = self.kind
+
+        value_kind = type(value)
+        if kind is str:
+            if value_kind is str:
+                code = self.index.get(value)
+                if code is None:
+                    code = self.index[value] = len(self.index)
+                self.data.append(code)
+                return
+            if value is None:
+                self.data.append(-1)
+                return
+        elif kind is float:
+            if value_kind is float or value_kind is int:
+                self.data.append(value)
+                return
+            if value is None:
+                self.data.append(_NAN)
+                return
+        elif kind is int:
+            if value_kind is int:
+                try:
+                    self.data.append(value)
+                    return
+                except OverflowError:
+                    pass
+            elif value_kind is float or value is None:
+                self.kind = float
+                self.data = array("d", self.data)
+                self.append(value)
+                return
+        elif kind is bool:
+            if value_kind is bool:
+                self.data.append(value)
+                return
+        elif kind is object:
+            self.data.append(value)
+            return
+
+        self.to_objects()
+        self.data.append(value)
+
+    def finish(self, length: int):
+        if self.kind is None:
+            return [None] * length
+
+        values = self.values()
+        if numpy is None:
+            return values
+        if self.kind is int:
+            return numpy.frombuffer(self.data, dtype=numpy.int64)
+        if self.kind is float:
+            return numpy.frombuffer(self.data, dtype=numpy.float64)
+        if self.kind is bool:
+            return numpy.frombuffer(self.data, dtype=numpy.int8).view(numpy.bool_)
+        if self.kind is str:
+            values.codes = numpy.frombuffer(self.data, dtype=numpy.int32)
+        return values
+
+
+def to_columns(rows) -> dict:
+    """
+    Decode an iterable of row dicts into a dict of columns, one per field.
+    A field missing from a row is a null: NaN in float columns (int columns
+    holding nulls become float), -1 in string codes, None otherwise.
+    """
+    columns = {}
+    length = 0
+    for row in rows:
+        for name, value in row.items():
+            column = columns.get(name)
+            if column is None:
+                column = columns[name] = _Column(length)
+            column.append(value)
+        length += 1
+        # Fields this row did not have.
+        if len(row) != len(columns):
+            for name, column in columns.items():
+                if name not in row:
+                    column.append(None)
+
+    return {name: column.finish(length) for name, column in columns.items()}
@@ -0,0 +1,153 @@
+"""
+Cache for the DC API access token and the assumed-role credentials used to
+read it from Secrets Manager.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import boto3
+
+logger = logging.getLogger(__name__)
+
+REDSHIFT_TOKEN_TTL = float(os.environ.get("REDSHIFT_TOKEN_TTL", 300))
+REDSHIFT_TOKEN_REFRESH_AHEAD = float(os.environ.get("REDSHIFT_TOKEN_REFRESH_AHEAD", 60))
+REDSHIFT_CREDENTIALS_EXPIRY_MARGIN = float(
+    os.environ.get("REDSHIFT_CREDENTIALS_EXPIRY_MARGIN", 300)
+)
+
+
+class TokenManager:
+    """
+    Keeps the assumed-role credentials until `credentials_margin` seconds
+    before their Expiration, and the token for `ttl` seconds.
+
+    A token in its last `refresh_ahead` seconds is still returned, while a
+    background thread fetches the next one. Threads reporting a `rejected`
+    token that was already replaced (e.g. many requests getting a 401
+    together) get the new one instead of fetching another.
+    """
+
+    def __init__(
+        self,
+        ttl: float = REDSHIFT_TOKEN_TTL,
+        refresh_ahead: float = REDSHIFT_TOKEN_REFRESH_AHEAD,
+        credentials_margin: float = REDSHIFT_CREDENTIALS_EXPIRY_MARGIN,
+    ):
+        self.ttl = ttl
+        self.refresh_ahead = refresh_ahead
+        self.credentials_margin = credentials_margin
+
+        self._lock = threading.Lock()
+        self._refreshing_lock = threading.Lock()
+        self._token = None
+        self._token_expires_at = 0.0
+        self._generation = 0
+        self._refreshing = False
+
+        self._sts_client = None
+        self._secrets_client = None
+        self._credentials_expire_at = None
+
+    def _get_secrets_client(self):
+        now = datetime.now(timezone.utc)
+        if self._secrets_client is None or now >= self._credentials_expire_at:
+            if self._sts_client is None:
+                self._sts_client = boto3.client("sts")
+            credentials = self._sts_client.assume_role(
+                RoleArn=os.environ.get("REDSHIFT_ROLE_ARN"),
+                RoleSessionName="be-another-me",
+            )["Credentials"]
+
+            self._secrets_client = boto3.client(
+                "secretsmanager",
+                aws_access_key_id=credentials["AccessKeyId"],
+                aws_secret_access_key=credentials["SecretAccessKey"],
+                aws_session_token=credentials["SessionToken"],
+            )
+            self._credentials_expire_at = credentials["Expiration"] - timedelta(
+                seconds=self.credentials_margin
+            )
+        return self._secrets_client
+
+    def _fetch_token(self) -> str:
+        secret_id = os.environ.get("REDSHIFT_SECRET")
+        if not secret_id:
+            raise EnvironmentError("Missing REDSHIFT_SECRET env variable")
+
+        secrets_client = self._get_secrets_client()
+        try:
+            current_secrets = secrets_client.get_secret_value(
+                SecretId=secret_id, VersionStage="AWSCURRENT"
+            )
+            current_dict = json.loads(current_secrets["SecretString"])
+            return current_dict["token"]
+        except Exception as e:
+            raise Exception(e)
+
+    def _refresh(self):
+        self._token = self._fetch_token()
+        self._token_expires_at = time.monotonic() + self.ttl
+        self._generation += 1
+
+    def get_token(self, force_refresh: bool = False, rejected: str = None) -> str:
+        """
+        Return the cached token, fetching it when missing, expired or when
+        `force_refresh` is set. After the API rejected a token, pass it as
+        `rejected`: a new one is fetched unless it was already replaced.
+        """
+        if not force_refresh and rejected is None:
+            token = self.cached_token()
+            if token is not None:
+                return token
+
+        with self._lock:
+            expired = time.monotonic() >= self._token_expires_at
+            if force_refresh or expired or self._token == rejected:
+                self._refresh()
+            return self._token
+
+    def cached_token(self):
+        """
+        Return the cached token without blocking, or None when it is missing
+        or expired. A token close to expiry starts a background refresh.
+        """
+        token = self._token
+        now = time.monotonic()
+        if now >= self._token_expires_at:
+            return None
+        if now >= self._token_expires_at - self.refresh_ahead:
+            self._refresh_in_background()
+        return token
+
+    def _refresh_in_background(self):
+        with self._refreshing_lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        def refresh():
+            try:
+                with self._lock:
+                    self._refresh()
+            except Exception:
+                logger.exception("Background token refresh failed")
+            finally:
+                self._refreshing = False
+
+        threading.Thread(
+            target=refresh, name="datalake-token-refresh", daemon=True
+        ).start()
+
+    def clear(self):
+        with self._lock:
+            self._token = None
+            self._token_expires_at = 0.0
+            self._secrets_client = None
+            self._credentials_expire_at = None
+
+
+TOKEN_MANAGER = TokenManager()
@@ -1,5 +1,20 @@
+import json
 import os
 
+from weni_datalake_sdk.clients.redshift.cache import (
+    cached_query,
+    revalidated_query,
+)
+from weni_datalake_sdk.clients.redshift.columns import to_columns
+from weni_datalake_sdk.clients.redshift.json_stream import (
+    iter_response_rows,
+    loads_nested,
+)
+from weni_datalake_sdk.clients.redshift.pagination import (
+    DATALAKE_QUERY_PAGE_SIZE,
+    paginate,
+)
+from weni_datalake_sdk.clients.redshift.partitions import partitioned_query
 from weni_datalake_sdk.clients.redshift.redshift_client import query_dc_api
 
 valid_tables = [
@@ -10,22 +25,187 @@ valid_tables = [
     "conversion_lead",
 ]
 
+# "columnar" decodes get_events/get_events_silver rows into column arrays
+# (see columns.to_columns).
+FORMATS = ("rows", "columnar")
+
+
+def _strip_quotes(value: str) -> str:
+    if value.startswith('"') and value.endswith('"'):
+        return value[1:-1]
+    return value
+
 
 def clean_quotes(obj):
-    if isinstance(obj, dict):
-        return {k: clean_quotes(v) for k, v in obj.items()}
-    elif isinstance(obj, list):
-        return [clean_quotes(item) for item in obj]
-    elif isinstance(obj, str):
-        if obj.startswith('"') and obj.endswith('"'):
-            return obj[1:-1]
-        return obj
-    else:
+    """
+    Copy of `obj` with the surrounding double quotes stripped from every
+    string value. Walks the data with an explicit stack, so any depth works.
+    """
+    if isinstance(obj, str):
+        return _strip_quotes(obj)
+    if not isinstance(obj, (dict, list)):
         return obj
 
+    root = {} if isinstance(obj, dict) else [None] * len(obj)
+    stack = [(obj, root)]
+    while stack:
+        source, target = stack.pop()
+        items = source.items() if isinstance(source, dict) else enumerate(source)
+        for key, value in items:
+            if isinstance(value, dict):
+                copy = {}
+                stack.append((value, copy))
+                value = copy
+            elif isinstance(value, list):
+                copy = [None] * len(value)
+                stack.append((value, copy))
+                value = copy
+            elif isinstance(value, str):
+                value = _strip_quotes(value)
+            target[key] = value
+    return root
+
+
+def _clean_list(items: list):
+    # Dicts were already cleaned by _clean_object, only strings and nested
+    # lists are left.
+    stack = [items]
+    while stack:
+        items = stack.pop()
+        for index, value in enumerate(items):
+            if isinstance(value, str):
+                items[index] = _strip_quotes(value)
+            elif isinstance(value, list):
+                stack.append(value)
+
+
+def _clean_object(obj: dict) -> dict:
+    """
+    json `object_hook` doing clean_quotes while decoding. Each object is
+    cleaned as soon as it is built, so no second pass or copy is needed.
+    """
+    for key, value in obj.items():
+        if isinstance(value, str):
+            obj[key] = _strip_quotes(value)
+        elif isinstance(value, list):
+            _clean_list(value)
+    return obj
+
+
+def _clean_top(data):
+    if isinstance(data, list):
+        _clean_list(data)
+    elif isinstance(data, str):
+        return _strip_quotes(data)
+    return data
+
+
+def loads_clean(text):
+    """
+    Same as clean_quotes(json.loads(text)), in a single decoding pass. Text
+    nested too deeply for json.loads is decoded by json_stream.loads_nested.
+    """
+    try:
+        return _clean_top(json.loads(text, object_hook=_clean_object))
+    except RecursionError:
+        return _clean_top(loads_nested(text, object_hook=_clean_object))
+
+
+def json_clean(response):
+    """
+    Same as clean_quotes(response.json()), in a single decoding pass.
+    """
+    try:
+        return _clean_top(response.json(object_hook=_clean_object))
+    except RecursionError:
+        return _clean_top(loads_nested(response.text, object_hook=_clean_object))
+
+
+def _fetch(metric: str, params: dict, clean: bool = False):
+    response = query_dc_api(metric=metric, query_params=params)
+    return json_clean(response) if clean else response.json()
+
+
+def _query(
+    metric: str,
+    kwargs: dict,
+    cache=None,
+    partition=None,
+    aggregate=None,
+    clean: bool = False,
+    cacheable: bool = True,
+):
+    """
+    Decoded DC API result for an aggregation, served from the query cache
+    when `cache` allows it (see cache.resolve_cache). With `partition`
+    ("hour" or "day") the range is queried bucket by bucket (see partitions).
+    `clean` strips the quotes of string values while decoding.
+
+    `fresh_ttl`/`stale_ttl` in `kwargs` switch to stale-while-revalidate
+    (see cache.revalidated_query), the only mode in which results that are
+    not `cacheable` are cached.
+    """
+    fresh_ttl = kwargs.pop("fresh_ttl", None)
+    stale_ttl = kwargs.pop("stale_ttl", None)
+
+    def fetch():
+        if partition:
+            return partitioned_query(
+                metric,
+                kwargs,
+                _fetch,
+                unit=partition,
+                aggregate=aggregate,
+                cache=cache,
+                count_metric=os.environ.get("EVENTS_COUNT_METRIC_NAME"),
+            )
+        return _fetch(metric, kwargs, clean)
+
+    if fresh_ttl is not None or stale_ttl is not None:
+        return revalidated_query(metric, kwargs, fetch, fresh_ttl, stale_ttl, cache)
+    if partition or not cacheable:
+        return fetch()
+    return cached_query(metric, kwargs, fetch, cache)
+
+
+def _stream(metric: str, kwargs: dict, label: str):
+    """
+    Start the query now and return a generator of its rows, decoded and
+    cleaned one at a time as the response is downloaded.
+    """
+    try:
+        response = query_dc_api(metric=metric, query_params=kwargs, stream=True)
+    except Exception as e:
+        raise Exception(f"Error querying {label}: {e}")
+
+    rows = iter_response_rows(response, object_hook=_clean_object)
+    return _wrap_errors(map(_clean_top, rows), label)
+
+
+def _wrap_errors(rows, label: str):
+    try:
+        yield from rows
+    except Exception as e:
+        raise Exception(f"Error querying {label}: {e}")
+
+
+def _paginate(metric: str, kwargs: dict, label: str):
+    page_size = kwargs.pop("page_size", DATALAKE_QUERY_PAGE_SIZE)
+    cursor = kwargs.pop("cursor", None)
+    prefetch = kwargs.pop("prefetch", True)
+
+    def fetch(params):
+        return json_clean(query_dc_api(metric=metric, query_params=params))
+
+    rows = paginate(fetch, kwargs, page_size, cursor=cursor, prefetch=prefetch)
+    return _wrap_errors(rows, label)
+
 
 def get_events(**kwargs) -> dict:
     metric = os.environ.get("EVENTS_METRIC_NAME")
+    stream = kwargs.pop("stream", False)
+    output_format = kwargs.pop("format", "rows")
+    cache = kwargs.pop("cache", None)
 
     if not kwargs.get("project"):
         raise Exception("Project is required")
@@ -36,10 +216,17 @@ def get_events(**kwargs) -> dict:
     if not kwargs.get("date_end"):
         raise Exception("Date end is required")
 
+    if output_format not in FORMATS:
+        raise Exception("Format is not valid")
+
+    if output_format == "columnar":
+        return to_columns(_stream(metric, kwargs, "events"))
+
+    if stream:
+        return _stream(metric, kwargs, "events")
+
     try:
-        result = query_dc_api(metric=metric, query_params=kwargs)
-        data = result.json()
-        return clean_quotes(data)
+        return _query(metric, kwargs, cache, clean=True, cacheable=False)
 
     except Exception as e:
         raise Exception(f"Error querying events: {e}")
@@ -47,6 +234,8 @@ def get_events(**kwargs) -> dict:
 
 def get_events_count(**kwargs) -> dict:
     metric = os.environ.get("EVENTS_COUNT_METRIC_NAME")
+    cache = kwargs.pop("cache", None)
+    partition = kwargs.pop("partition", None)
 
     if not kwargs.get("project"):
         raise Exception("Project is required")
@@ -58,8 +247,7 @@ def get_events_count(**kwargs) -> dict:
         raise Exception("Date end is required")
 
     try:
-        result = query_dc_api(metric=metric, query_params=kwargs)
-        data = result.json()
+        data = _query(metric, kwargs, cache, partition, "count")
         return data
 
     except Exception as e:
@@ -68,6 +256,8 @@ def get_events_count(**kwargs) -> dict:
 
 def get_events_sum(**kwargs) -> dict:
     metric = os.environ.get("EVENTS_SUM_METRIC_NAME")
+    cache = kwargs.pop("cache", None)
+    partition = kwargs.pop("partition", None)
 
     if not kwargs.get("project"):
         raise Exception("Project is required")
@@ -79,8 +269,7 @@ def get_events_sum(**kwargs) -> dict:
         raise Exception("Date end is required")
 
     try:
-        result = query_dc_api(metric=metric, query_params=kwargs)
-        data = result.json()
+        data = _query(metric, kwargs, cache, partition, "sum")
         return data
 
     except Exception as e:
@@ -89,6 +278,8 @@ def get_events_sum(**kwargs) -> dict:
 
 def get_events_avg(**kwargs) -> dict:
     metric = os.environ.get("EVENTS_AVG_METRIC_NAME")
+    cache = kwargs.pop("cache", None)
+    partition = kwargs.pop("partition", None)
 
     if not kwargs.get("project"):
         raise Exception("Project is required")
@@ -100,8 +291,7 @@ def get_events_avg(**kwargs) -> dict:
         raise Exception("Date end is required")
 
     try:
-        result = query_dc_api(metric=metric, query_params=kwargs)
-        data = result.json()
+        data = _query(metric, kwargs, cache, partition, "avg")
         return data
 
     except Exception as e:
@@ -110,6 +300,8 @@ def get_events_avg(**kwargs) -> dict:
 
 def get_events_max(**kwargs) -> dict:
     metric = os.environ.get("EVENTS_MAX_METRIC_NAME")
+    cache = kwargs.pop("cache", None)
+    partition = kwargs.pop("partition", None)
 
     if not kwargs.get("project"):
         raise Exception("Project is required")
@@ -121,8 +313,7 @@ def get_events_max(**kwargs) -> dict:
         raise Exception("Date end is required")
 
     try:
-        result = query_dc_api(metric=metric, query_params=kwargs)
-        data = result.json()
+        data = _query(metric, kwargs, cache, partition, "max")
         return data
 
     except Exception as e:
@@ -131,6 +322,8 @@ def get_events_max(**kwargs) -> dict:
 
 def get_events_min(**kwargs) -> dict:
     metric = os.environ.get("EVENTS_MIN_METRIC_NAME")
+    cache = kwargs.pop("cache", None)
+    partition = kwargs.pop("partition", None)
 
     if not kwargs.get("project"):
         raise Exception("Project is required")
@@ -142,8 +335,7 @@ def get_events_min(**kwargs) -> dict:
         raise Exception("Date end is required")
 
     try:
-        result = query_dc_api(metric=metric, query_params=kwargs)
-        data = result.json()
+        data = _query(metric, kwargs, cache, partition, "min")
         return data
 
     except Exception as e:
@@ -152,10 +344,10 @@ def get_events_min(**kwargs) -> dict:
 
 def get_events_unique_contact_urns(**kwargs) -> dict:
     metric = os.environ.get("EVENTS_UNIQUE_CONTACT_URNS_METRIC_NAME")
+    cache = kwargs.pop("cache", None)
 
     try:
-        result = query_dc_api(metric=metric, query_params=kwargs)
-        data = result.json()
+        data = _query(metric, kwargs, cache)
         return data
 
     except Exception as e:
@@ -164,6 +356,7 @@ def get_events_unique_contact_urns(**kwargs) -> dict:
 
 def get_events_recurring_contact_urns(**kwargs) -> dict:
     metric = os.environ.get("EVENTS_RECURRING_CONTACT_URNS_METRIC_NAME")
+    cache = kwargs.pop("cache", None)
 
     if not kwargs.get("project"):
         raise Exception("Project is required")
@@ -175,8 +368,7 @@ def get_events_recurring_contact_urns(**kwargs) -> dict:
         raise Exception("Date end is required")
 
     try:
-        result = query_dc_api(metric=metric, query_params=kwargs)
-        data = result.json()
+        data = _query(metric, kwargs, cache)
         return data
 
     except Exception as e:
@@ -185,6 +377,7 @@ def get_events_recurring_contact_urns(**kwargs) -> dict:
 
 def get_events_silver_unique_contact_urns(**kwargs) -> dict:
     metric = os.environ.get("EVENTS_SILVER_UNIQUE_CONTACT_URNS_METRIC_NAME")
+    cache = kwargs.pop("cache", None)
 
     table = kwargs.get("table")
 
@@ -204,8 +397,7 @@ def get_events_silver_unique_contact_urns(**kwargs) -> dict:
         raise Exception("Table is not valid")
 
     try:
-        result = query_dc_api(metric=metric, query_params=kwargs)
-        data = result.json()
+        data = _query(metric, kwargs, cache)
         return data
 
     except Exception as e:
@@ -214,6 +406,7 @@ def get_events_silver_unique_contact_urns(**kwargs) -> dict:
 
 def get_events_silver_recurring_contact_urns(**kwargs) -> dict:
     metric = os.environ.get("EVENTS_SILVER_RECURRING_CONTACT_URNS_METRIC_NAME")
+    cache = kwargs.pop("cache", None)
 
     table = kwargs.get("table")
 
@@ -233,8 +426,7 @@ def get_events_silver_recurring_contact_urns(**kwargs) -> dict:
         raise Exception("Table is not valid")
 
     try:
-        result = query_dc_api(metric=metric, query_params=kwargs)
-        data = result.json()
+        data = _query(metric, kwargs, cache)
         return data
 
     except Exception as e:
@@ -243,6 +435,7 @@ def get_events_silver_recurring_contact_urns(**kwargs) -> dict:
 
 def get_events_count_by_group(**kwargs) -> dict:
     metric = os.environ.get("EVENTS_COUNT_BY_GROUP_METRIC_NAME")
+    cache = kwargs.pop("cache", None)
 
     if not kwargs.get("project"):
         raise Exception("Project is required")
@@ -257,9 +450,7 @@ def get_events_count_by_group(**kwargs) -> dict:
         raise Exception("metadata_key is required")
 
     try:
-        result = query_dc_api(metric=metric, query_params=kwargs)
-        data = result.json()
-        return clean_quotes(data)
+        return _query(metric, kwargs, cache, clean=True)
 
     except Exception as e:
         raise Exception(f"Error querying events count: {e}")
@@ -267,6 +458,9 @@ def get_events_count_by_group(**kwargs) -> dict:
 
 def get_events_silver(**kwargs) -> dict:
     metric = os.environ.get("EVENTS_SILVER_METRIC_NAME")
+    stream = kwargs.pop("stream", False)
+    output_format = kwargs.pop("format", "rows")
+    cache = kwargs.pop("cache", None)
     table = kwargs.get("table")
 
     if not kwargs.get("project"):
@@ -284,16 +478,24 @@ def get_events_silver(**kwargs) -> dict:
     if table not in valid_tables:
         raise Exception("Table is not valid")
 
+    if output_format not in FORMATS:
+        raise Exception("Format is not valid")
+
+    if output_format == "columnar":
+        return to_columns(_stream(metric, kwargs, "events silver"))
+
+    if stream:
+        return _stream(metric, kwargs, "events silver")
+
     try:
-        result = query_dc_api(metric=metric, query_params=kwargs)
-        data = result.json()
-        return clean_quotes(data)
+        return _query(metric, kwargs, cache, clean=True, cacheable=False)
     except Exception as e:
         raise Exception(f"Error querying events silver: {e}")
 
 
 def get_events_silver_count(**kwargs) -> dict:
     metric = os.environ.get("EVENTS_SILVER_COUNT_METRIC_NAME")
+    cache = kwargs.pop("cache", None)
     table = kwargs.get("table")
 
     if not kwargs.get("project"):
@@ -312,15 +514,14 @@ def get_events_silver_count(**kwargs) -> dict:
         raise Exception("Table is not valid")
 
     try:
-        result = query_dc_api(metric=metric, query_params=kwargs)
-        data = result.json()
-        return clean_quotes(data)
+        return _query(metric, kwargs, cache, clean=True)
     except Exception as e:
         raise Exception(f"Error querying events silver: {e}")
 
 
 def get_events_silver_count_by_group(**kwargs) -> dict:
     metric = os.environ.get("EVENTS_SILVER_COUNT_BY_GROUP_METRIC_NAME")
+    cache = kwargs.pop("cache", None)
     table = kwargs.get("table")
 
     if not kwargs.get("project"):
@@ -342,9 +543,52 @@ def get_events_silver_count_by_group(**kwargs) -> dict:
         raise Exception("Table is not valid")
 
     try:
-        result = query_dc_api(metric=metric, query_params=kwargs)
-        data = result.json()
-        return clean_quotes(data)
+        return _query(metric, kwargs, cache, clean=True)
 
     except Exception as e:
         raise Exception(f"Error querying events count: {e}")
+
+
+def iter_events(**kwargs):
+    """
+    Iterate over the rows of get_events page by page (`page_size` rows per
+    request), fetching the next page in the background. Pass `cursor="date"`
+    to chain pages on the row date instead of an offset.
+    """
+    metric = os.environ.get("EVENTS_METRIC_NAME")
+
+    if not kwargs.get("project"):
+        raise Exception("Project is required")
+
+    if not kwargs.get("date_start"):
+        raise Exception("Date start is required")
+
+    if not kwargs.get("date_end"):
+        raise Exception("Date end is required")
+
+    return _paginate(metric, kwargs, "events")
+
+
+def iter_events_silver(**kwargs):
+    """
+    Same as iter_events, for get_events_silver.
+    """
+    metric = os.environ.get("EVENTS_SILVER_METRIC_NAME")
+    table = kwargs.get("table")
+
+    if not kwargs.get("project"):
+        raise Exception("Project is required")
+
+    if not kwargs.get("date_start"):
+        raise Exception("Date start is required")
+
+    if not kwargs.get("date_end"):
+        raise Exception("Date end is required")
+
+    if not table:
+        raise Exception("Table is required")
+
+    if table not in valid_tables:
+        raise Exception("Table is not valid")
+
+    return _paginate(metric, kwargs, "events silver")
@@ -0,0 +1,241 @@
+"""
+Incremental decoding of large JSON arrays, one element at a time.
+
+Only the current element and one chunk of the input are kept in memory, so
+rows can be processed while the response is still being downloaded.
+`loads_nested` decodes documents nested too deeply for `json.loads`.
+"""
+import codecs
+import json
+import os
+from json.decoder import JSONDecodeError, scanstring
+from json.scanner import NUMBER_RE
+
+DATALAKE_STREAM_CHUNK_SIZE = int(
+    os.environ.get("DATALAKE_STREAM_CHUNK_SIZE", 64 * 1024)
+)
+
+_WHITESPACE = " \t\n\r"
+_DELIMITERS = _WHITESPACE + ",]}"
+_LITERALS = (
+    ("null", None),
+    ("true", True),
+    ("false", False),
+    ("NaN", float("nan")),
+    ("Infinity", float("inf")),
+    ("-Infinity", float("-inf")),
+)
+
+
+class _Reader:
+    def __init__(self, chunks, object_hook=None):
+        self.chunks = iter(chunks)
+        self.decoder = codecs.getincrementaldecoder("utf-8")()
+        self.json = json.JSONDecoder(object_hook=object_hook)
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        if self.eof:
+            return False
+
+        # Drop what was already decoded before growing the buffer.
+        self.buffer = self.buffer[self.pos :]
+        self.pos = 0
+
+        chunk = next(self.chunks, None)
+        if chunk is None:
+            self.eof = True
+            self.buffer += self.decoder.decode(b"", final=True)
+        elif isinstance(chunk, str):
+            self.buffer += chunk
+        else:
+            self.buffer += self.decoder.decode(chunk)
+        return True
+
+    def peek(self) -> str:
+        """Next non-whitespace character, or "" at the end of the input."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                return ""
+
+    def expect(self, characters: str) -> str:
+        character = self.peek()
+        if not character or character not in characters:
+            raise ValueError(
+                f"Expected one of {characters!r} at offset {self.pos}, got {character!r}"
+            )
+        self.pos += 1
+        return character
+
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                value, end = self.json.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if not self.fill():
+                    raise
+                continue
+
+            # A number is only complete once followed by a delimiter, it may go
+            # on in the next chunk ("12" + "3.5").
+            incomplete = end == len(self.buffer) or (
+                isinstance(value, (int, float)) and self.buffer[end] not in _DELIMITERS
+            )
+            if incomplete and self.fill():
+                continue
+
+            self.pos = end
+            return value
+
+
+def _iter_array(reader: _Reader):
+    if reader.peek() == "]":
+        reader.pos += 1
+        return
+
+    while True:
+        yield reader.value()
+        if reader.expect(",]") == "]":
+            return
+
+
+def iter_json_array(chunks, key: str = None, object_hook=None):
+    """
+    Yield the elements of the JSON array read from `chunks` (bytes or str).
+
+    When the document is an object, the array under `key` is read instead,
+    or the first array found when `key` is not given; other members are
+    skipped. `object_hook` is passed on to the JSON decoder.
+    """
+    reader = _Reader(chunks, object_hook)
+    start = reader.expect("[{")
+    if start == "[":
+        yield from _iter_array(reader)
+        return
+
+    found = False
+    if reader.peek() == "}":
+        return
+    while True:
+        name = reader.value()
+        reader.expect(":")
+        if not found and reader.peek() == "[" and key in (None, name):
+            found = True
+            reader.pos += 1
+            yield from _iter_array(reader)
+        else:
+            reader.value()
+        if reader.expect(",}") == "}":
+            return
+
+
+def iter_response_rows(
+    response,
+    key: str = None,
+    chunk_size: int = DATALAKE_STREAM_CHUNK_SIZE,
+    object_hook=None,
+):
+    """
+    Yield the rows of a DC API response requested with `stream=True`, then
+    release its connection.
+    """
+    try:
+        yield from iter_json_array(response.iter_content(chunk_size), key, object_hook)
+    finally:
+        response.close()
+
+
+def _skip(text: str, pos: int) -> int:
+    while pos < len(text) and text[pos] in _WHITESPACE:
+        pos += 1
+    return pos
+
+
+def _scalar(text: str, pos: int):
+    match = NUMBER_RE.match(text, pos)
+    if match is not None:
+        integer, frac, exp = match.groups()
+        if frac or exp:
+            return float(integer + (frac or "") + (exp or "")), match.end()
+        return int(integer), match.end()
+    for name, value in _LITERALS:
+        if text.startswith(name, pos):
+            return value, pos + len(name)
+    raise JSONDecodeError("Expecting value", text, pos)
+
+
+def _key(text: str, pos: int):
+    if text[pos : pos + 1] != '"':
+        raise JSONDecodeError(
+            "Expecting property name enclosed in double quotes", text, pos
+        )
+    key, pos = scanstring(text, pos + 1)
+    pos = _skip(text, pos)
+    if text[pos : pos + 1] != ":":
+        raise JSONDecodeError("Expecting ':' delimiter", text, pos)
+    return key, _skip(text, pos + 1)
+
+
+def loads_nested(text: str, object_hook=None):
+    """
+    Same as json.loads(text, object_hook=object_hook), but arrays and objects
+    are built with an explicit stack instead of recursive calls, so any depth
+    works. Slower, meant as a fallback when json.loads hits the recursion
+    limit.
+    """
+    stack = []  # (container, key) of the arrays and objects still open
+    pos = _skip(text, 0)
+    while True:
+        character = text[pos : pos + 1]
+        if character in ("[", "{"):
+            container = [] if character == "[" else {}
+            pos = _skip(text, pos + 1)
+            if text[pos : pos + 1] == ("]" if character == "[" else "}"):
+                value, pos = container, pos + 1
+            elif character == "[":
+                stack.append((container, None))
+                continue
+            else:
+                key, pos = _key(text, pos)
+                stack.append((container, key))
+                continue
+        elif character == '"':
+            value, pos = scanstring(text, pos + 1)
+        else:
+            value, pos = _scalar(text, pos)
+
+        # Store the value in its container, closing those that end with it.
+        while True:
+            if isinstance(value, dict) and object_hook is not None:
+                value = object_hook(value)
+            if not stack:
+                pos = _skip(text, pos)
+                if pos != len(text):
+                    raise JSONDecodeError("Extra data", text, pos)
+                return value
+
+            container, key = stack[-1]
+            if key is None:
+                container.append(value)
+            else:
+                container[key] = value
+
+            pos = _skip(text, pos)
+            character = text[pos : pos + 1]
+            if character == ",":
+                pos = _skip(text, pos + 1)
+                if key is not None:
+                    key, pos = _key(text, pos)
+                    stack[-1] = (container, key)
+                break
+            if character != ("]" if key is None else "}"):
+                raise JSONDecodeError("Expecting ',' delimiter", text, pos)
+            stack.pop()
+            value, pos = container, pos + 1
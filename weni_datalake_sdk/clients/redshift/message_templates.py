@@ -1,19 +1,25 @@
 import os
 
+from weni_datalake_sdk.clients.redshift.cache import revalidated_query
 from weni_datalake_sdk.clients.redshift.redshift_client import query_dc_api
 
 
-def get_message_templates(
-    contact_urn: str = None, template_uuid: str = None, query_params: dict = None
-) -> dict:
-    metric = os.environ.get("MESSAGE_TEMPLATES_METRIC_NAME")
-
+def _params(contact_urn: str, template_uuid: str, query_params: dict) -> dict:
     final_params = query_params.copy() if query_params else {}
 
     if contact_urn:
         final_params["contact_urn"] = contact_urn
     if template_uuid:
         final_params["template_uuid"] = template_uuid
+    return final_params
+
+
+def get_message_templates(
+    contact_urn: str = None, template_uuid: str = None, query_params: dict = None
+) -> dict:
+    metric = os.environ.get("MESSAGE_TEMPLATES_METRIC_NAME")
+
+    final_params = _params(contact_urn, template_uuid, query_params)
 
     try:
         result = query_dc_api(metric=metric, query_params=final_params)
@@ -21,3 +27,33 @@ def get_message_templates(
 
     except Exception as e:
         raise Exception(f"Error querying message templates: {e}")
+
+
+def get_message_templates_data(
+    contact_urn: str = None,
+    template_uuid: str = None,
+    query_params: dict = None,
+    fresh_ttl: float = None,
+    stale_ttl: float = None,
+    cache=None,
+):
+    """
+    Decoded result of get_message_templates, served stale-while-revalidate
+    (see cache.revalidated_query).
+    """
+    metric = os.environ.get("MESSAGE_TEMPLATES_METRIC_NAME")
+
+    final_params = _params(contact_urn, template_uuid, query_params)
+
+    try:
+        return revalidated_query(
+            metric,
+            final_params,
+            lambda: query_dc_api(metric=metric, query_params=final_params).json(),
+            fresh_ttl,
+            stale_ttl,
+            cache,
+        )
+
+    except Exception as e:
+        raise Exception(f"Error querying message templates: {e}")
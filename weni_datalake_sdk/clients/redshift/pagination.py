@@ -0,0 +1,95 @@
+"""
+Page-by-page iteration over DC API results.
+
+Pages are requested with `limit`/`offset`, or with a keyset cursor: the next
+page starts at the last row's `cursor` value, and `offset` only skips the
+rows already returned with that same value. The next page is fetched in the
+background while the caller processes the current one.
+"""
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+DATALAKE_QUERY_PAGE_SIZE = int(os.environ.get("DATALAKE_QUERY_PAGE_SIZE", 1000))
+
+LIMIT_PARAM = "limit"
+OFFSET_PARAM = "offset"
+
+
+def page_rows(data) -> list:
+    """
+    Rows of a page: the page itself when it is a list, else its first list
+    member (e.g. {"data": [...]}).
+    """
+    if isinstance(data, list):
+        return data
+    if isinstance(data, dict):
+        for value in data.values():
+            if isinstance(value, list):
+                return value
+    return []
+
+
+class _Deferred:
+    def __init__(self, fetch, params):
+        self.fetch = fetch
+        self.params = params
+
+    def result(self):
+        return self.fetch(self.params)
+
+
+def _next_params(params: dict, rows: list, cursor: str, cursor_param: str):
+    if cursor is None:
+        return dict(params, **{OFFSET_PARAM: params[OFFSET_PARAM] + len(rows)})
+
+    last = rows[-1][cursor]
+    ties = 0
+    for row in reversed(rows):
+        if row[cursor] != last:
+            break
+        ties += 1
+
+    # Every row of the page had the cursor value the page started from.
+    if ties == len(rows) and params.get(cursor_param) == last:
+        ties += params[OFFSET_PARAM]
+    return dict(params, **{cursor_param: last, OFFSET_PARAM: ties})
+
+
+def paginate(
+    fetch,
+    params: dict,
+    page_size: int = DATALAKE_QUERY_PAGE_SIZE,
+    cursor: str = None,
+    cursor_param: str = "date_start",
+    prefetch: bool = True,
+):
+    """
+    Yield the rows of every page returned by `fetch(params)`, until a page has
+    fewer than `page_size` rows.
+
+    With `cursor` (a row field such as "date", by which the API sorts), pages
+    are chained on that field through `cursor_param` instead of a growing
+    offset, which keeps deep pages as cheap as the first ones.
+    """
+    params = dict(params, **{LIMIT_PARAM: page_size, OFFSET_PARAM: 0})
+    executor = None
+    if prefetch:
+        executor = ThreadPoolExecutor(1, thread_name_prefix="datalake-page")
+
+    def submit(params):
+        if executor is None:
+            return _Deferred(fetch, params)
+        return executor.submit(fetch, params)
+
+    try:
+        page = submit(params)
+        while page is not None:
+            rows = page_rows(page.result())
+            page = None
+            if rows and len(rows) >= page_size:
+                params = _next_params(params, rows, cursor, cursor_param)
+                page = submit(params)
+            yield from rows
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,264 @@
+"""
+Incremental aggregation over a date range split into hour or day buckets.
+
+Buckets that ended before `settle` seconds ago are closed: their result can
+no longer change and is cached for `DATALAKE_QUERY_PARTITION_TTL` (six hours
+by default, so late or backfilled events show up eventually). Only missing and still-open buckets are queried, concurrently, and
+the partial results are merged client-side.
+"""
+import json
+import os
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+from weni_datalake_sdk.clients.redshift.cache import cached_query
+
+DATALAKE_QUERY_PARTITION_WORKERS = int(
+    os.environ.get("DATALAKE_QUERY_PARTITION_WORKERS", 8)
+)
+DATALAKE_QUERY_PARTITION_SETTLE = float(
+    os.environ.get("DATALAKE_QUERY_PARTITION_SETTLE", 300)
+)
+DATALAKE_QUERY_PARTITION_TTL = float(
+    os.environ.get("DATALAKE_QUERY_PARTITION_TTL", 6 * 3600)
+)
+
+UNITS = {"hour": timedelta(hours=1), "day": timedelta(days=1)}
+DATE_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+# Inner bucket ends are inclusive and whole seconds, like the bounds callers
+# usually send: a bucket ends one second before the next one starts.
+SECOND = timedelta(seconds=1)
+
+
+@dataclass
+class Bucket:
+    date_start: str
+    date_end: str
+    closed: bool
+
+
+def parse_date(value: str) -> datetime:
+    """
+    Parse an ISO 8601 date or datetime. Naive values are taken as UTC.
+    """
+    date = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if date.tzinfo is None:
+        return date.replace(tzinfo=timezone.utc)
+    return date.astimezone(timezone.utc)
+
+
+def end_of_range(value: str) -> datetime:
+    """
+    First instant after the inclusive range end `value`, reading a bare date as
+    the whole day so a range is never closed too early.
+    """
+    date = parse_date(value)
+    if len(value) == 10:
+        return date + UNITS["day"]
+    return date + SECOND
+
+
+def format_date(date: datetime) -> str:
+    return date.strftime(DATE_FORMAT)
+
+
+def floor_date(date: datetime, unit: str) -> datetime:
+    date = date.replace(minute=0, second=0, microsecond=0)
+    if unit == "day":
+        date = date.replace(hour=0)
+    return date
+
+
+def split_range(
+    date_start: str,
+    date_end: str,
+    unit: str = "day",
+    now: datetime = None,
+    settle: float = DATALAKE_QUERY_PARTITION_SETTLE,
+) -> list:
+    """
+    Split the inclusive range [date_start, date_end] into buckets aligned on
+    `unit`. The first bucket starts at `date_start` and the last one ends at
+    `date_end`, both as given, so the buckets cover what the unpartitioned
+    query would; the bounds between buckets are whole seconds.
+    """
+    if unit not in UNITS:
+        raise Exception(f"Partition must be one of {', '.join(UNITS)}")
+
+    start, end = parse_date(date_start), parse_date(date_end)
+    if start > end:
+        raise Exception("date_start must not be after date_end")
+    closed_before = (now or datetime.now(timezone.utc)) - timedelta(seconds=settle)
+
+    buckets = []
+    bucket_start = date_start
+    while True:
+        next_start = floor_date(start, unit) + UNITS[unit]
+        if next_start > end:
+            buckets.append(
+                Bucket(
+                    date_start=bucket_start,
+                    date_end=date_end,
+                    closed=end_of_range(date_end) <= closed_before,
+                )
+            )
+            return buckets
+
+        buckets.append(
+            Bucket(
+                date_start=bucket_start,
+                date_end=format_date(next_start - SECOND),
+                closed=next_start <= closed_before,
+            )
+        )
+        start = next_start
+        bucket_start = format_date(start)
+
+
+def is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _row_key(row, index: int):
+    if isinstance(row, dict):
+        return json.dumps(
+            {k: v for k, v in row.items() if not is_number(v)},
+            sort_keys=True,
+            default=str,
+        )
+    return index
+
+
+def _combine(items: list, leaf):
+    values = [value for value, _ in items if value is not None]
+    if not values:
+        return None
+
+    first = values[0]
+    if isinstance(first, dict):
+        keys = OrderedDict.fromkeys(k for value in values for k in value)
+        return {
+            key: _combine(
+                [(v.get(key), w) for v, w in items if isinstance(v, dict)], leaf
+            )
+            for key in keys
+        }
+
+    if isinstance(first, list):
+        rows = OrderedDict()
+        for value, weight in items:
+            for index, row in enumerate(value or []):
+                rows.setdefault(_row_key(row, index), []).append((row, weight))
+        return [_combine(group, leaf) for group in rows.values()]
+
+    if is_number(first):
+        return leaf([(v, w) for v, w in items if is_number(v)])
+    return first
+
+
+def _weighted_average(items: list):
+    total = sum(weight for _, weight in items)
+    if not total:
+        return None
+    return sum(value * weight for value, weight in items) / total
+
+
+REDUCERS = {
+    "count": lambda items: sum(value for value, _ in items),
+    "sum": lambda items: sum(value for value, _ in items),
+    "min": lambda items: min(value for value, _ in items),
+    "max": lambda items: max(value for value, _ in items),
+    "avg": _weighted_average,
+}
+
+
+def merge_results(results: list, aggregate: str, weights: list = None):
+    """
+    Merge the results of the same query over several buckets.
+
+    Numbers are reduced according to `aggregate`. Dicts are merged key by key,
+    and lists of dicts row by row, rows being matched on their non-numeric
+    fields. An average is weighted by each bucket's `weights` (its count).
+    """
+    if aggregate not in REDUCERS:
+        raise Exception(f"Cannot merge {aggregate} results")
+    if weights is None:
+        weights = [1] * len(results)
+    return _combine(list(zip(results, weights)), REDUCERS[aggregate])
+
+
+def single_number(result):
+    """
+    The only number in `result`, e.g. the count of a count query.
+    """
+    numbers = []
+
+    def walk(value):
+        if is_number(value):
+            numbers.append(value)
+        elif isinstance(value, dict):
+            for item in value.values():
+                walk(item)
+        elif isinstance(value, list):
+            for item in value:
+                walk(item)
+
+    walk(result)
+    if len(numbers) != 1:
+        raise Exception(f"Expected a single number in {result!r}")
+    return numbers[0]
+
+
+def partitioned_query(
+    metric: str,
+    params: dict,
+    fetch,
+    unit: str = "day",
+    aggregate: str = "sum",
+    cache=None,
+    count_metric: str = None,
+    max_workers: int = DATALAKE_QUERY_PARTITION_WORKERS,
+):
+    """
+    Run `fetch(metric, params)` once per bucket of the params' date range and
+    merge the results.
+
+    Closed buckets go through the query cache (the process-wide one unless
+    `cache` says otherwise) with `DATALAKE_QUERY_PARTITION_TTL`; open buckets
+    only use it as a plain query would. An `avg` also fetches `count_metric`
+    per bucket to weight the bucket averages.
+    """
+    buckets = split_range(params["date_start"], params["date_end"], unit)
+
+    def run(metric, bucket):
+        bucket_params = dict(
+            params, date_start=bucket.date_start, date_end=bucket.date_end
+        )
+        if bucket.closed:
+            return cached_query(
+                metric,
+                bucket_params,
+                lambda: fetch(metric, bucket_params),
+                True if cache is None else cache,
+                DATALAKE_QUERY_PARTITION_TTL,
+            )
+        return cached_query(
+            metric, bucket_params, lambda: fetch(metric, bucket_params), cache
+        )
+
+    metrics = [metric]
+    if aggregate == "avg":
+        if not count_metric:
+            raise Exception("A count metric is required to merge averages")
+        metrics.append(count_metric)
+
+    tasks = [(m, bucket) for m in metrics for bucket in buckets]
+    with ThreadPoolExecutor(max(1, min(max_workers, len(tasks)))) as executor:
+        results = list(executor.map(lambda task: run(*task), tasks))
+
+    weights = None
+    if aggregate == "avg":
+        weights = [single_number(count) for count in results[len(buckets) :]]
+    return merge_results(results[: len(buckets)], aggregate, weights)
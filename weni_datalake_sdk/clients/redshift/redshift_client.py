@@ -1,14 +1,38 @@
-import json
 import os
 from urllib.parse import urlencode
 
-import boto3
-import requests
+from weni_datalake_sdk.clients.http import get_session
+from weni_datalake_sdk.clients.redshift.cache import make_key
+from weni_datalake_sdk.clients.redshift.credentials import TOKEN_MANAGER
+from weni_datalake_sdk.clients.redshift.singleflight import SingleFlight
 
 REDSHIFT_QUERY_BASE_URL = os.environ.get("REDSHIFT_QUERY_BASE_URL")
+DATALAKE_QUERY_COALESCE = os.environ.get("DATALAKE_QUERY_COALESCE", "1") == "1"
 
+# Identical queries running at the same time share one request;
+# QUERY_FLIGHTS.coalesced counts the calls that did not send their own.
+QUERY_FLIGHTS = SingleFlight()
 
-def query_dc_api(metric: str, query_params: dict = None) -> dict:
+
+def query_dc_api(metric: str, query_params: dict = None, stream: bool = False) -> dict:
+    """
+    GET `metric` from the DC API. With `stream`, the body is not read up front
+    and the caller must close the response (see json_stream).
+
+    Unless streaming, a call made while the same metric and parameters are
+    already being queried waits for that request and gets its response or
+    exception (disabled with DATALAKE_QUERY_COALESCE=0).
+    """
+    if stream or not DATALAKE_QUERY_COALESCE:
+        return _request(metric, query_params, stream)
+
+    return QUERY_FLIGHTS.do(
+        make_key(metric, query_params),
+        lambda: _request(metric, query_params),
+    )
+
+
+def _request(metric: str, query_params: dict = None, stream: bool = False):
     if not REDSHIFT_QUERY_BASE_URL:
         raise EnvironmentError("Missing REDSHIFT_QUERY_BASE_URL env variable")
 
@@ -24,51 +48,39 @@ def query_dc_api(metric: str, query_params: dict = None) -> dict:
     payload = query_params or {}
     query_string = urlencode(payload, safe=":")
 
-    response = requests.request(
-        "GET", url, headers=headers_auth, params=query_string, verify=False
+    request_kwargs = {"stream": True} if stream else {}
+    response = get_session().request(
+        "GET",
+        url,
+        headers=headers_auth,
+        params=query_string,
+        verify=False,
+        **request_kwargs,
     )
 
     if response.status_code != 200:
+        response.close()
         if response.status_code == 401:
             token_old = token
             # Refresh token
-            token = get_secrets()
+            token = get_secrets(rejected=token_old)
             if token_old == token:
                 raise Exception(
                     f"Could not send message to DC API! Error: {str(response)} - Token was updated!"
                     + f" URL: {url}"
                 )
             else:
-                return query_dc_api(metric, query_params)
+                return _request(metric, query_params, stream)
         raise Exception(
             f"Could not send message to DC API! Error: {str(response)}" + f" URL: {url}"
         )
     return response
 
 
-def get_secrets():
-    REDSHIFT_SECRET = os.environ.get("REDSHIFT_SECRET")
-    if not REDSHIFT_SECRET:
-        raise EnvironmentError("Missing REDSHIFT_SECRET env variable")
-
-    REDSHIFT_ROLE_ARN = os.environ.get("REDSHIFT_ROLE_ARN")
-    client_sts = boto3.client("sts")
-    credentials = client_sts.assume_role(
-        RoleArn=REDSHIFT_ROLE_ARN, RoleSessionName="be-another-me"
-    )["Credentials"]
-
-    SECRETS_CLIENT = boto3.client(
-        "secretsmanager",
-        aws_access_key_id=credentials["AccessKeyId"],
-        aws_secret_access_key=credentials["SecretAccessKey"],
-        aws_session_token=credentials["SessionToken"],
-    )
-
-    try:
-        current_secrets = SECRETS_CLIENT.get_secret_value(
-            SecretId=REDSHIFT_SECRET, VersionStage="AWSCURRENT"
-        )
-        current_dict = json.loads(current_secrets["SecretString"])
-        return current_dict["token"]
-    except Exception as e:
-        raise Exception(e)
+def get_secrets(force_refresh: bool = False, rejected: str = None):
+    """
+    Return the DC API token. The token and the assumed-role credentials are
+    cached (see credentials.TokenManager); `force_refresh` fetches a new token,
+    `rejected` replaces the token the API rejected unless already done.
+    """
+    return TOKEN_MANAGER.get_token(force_refresh=force_refresh, rejected=rejected)
@@ -1,5 +1,10 @@
 import os
 
+from weni_datalake_sdk.clients.redshift.cache import revalidated_query
+from weni_datalake_sdk.clients.redshift.pagination import (
+    DATALAKE_QUERY_PAGE_SIZE,
+    paginate,
+)
 from weni_datalake_sdk.clients.redshift.redshift_client import query_dc_api
 
 
@@ -11,3 +16,50 @@ def get_traces(query_params: dict = None) -> dict:
 
     except Exception as e:
         raise Exception(f"Error querying traces: {e}")
+
+
+def get_traces_data(
+    query_params: dict = None,
+    fresh_ttl: float = None,
+    stale_ttl: float = None,
+    cache=None,
+):
+    """
+    Decoded result of get_traces, served stale-while-revalidate (see
+    cache.revalidated_query).
+    """
+    metric = os.environ.get("TRACES_METRIC_NAME")
+    try:
+        return revalidated_query(
+            metric,
+            query_params,
+            lambda: query_dc_api(metric=metric, query_params=query_params).json(),
+            fresh_ttl,
+            stale_ttl,
+            cache,
+        )
+
+    except Exception as e:
+        raise Exception(f"Error querying traces: {e}")
+
+
+def iter_traces(
+    query_params: dict = None,
+    page_size: int = DATALAKE_QUERY_PAGE_SIZE,
+    cursor: str = None,
+    prefetch: bool = True,
+):
+    """
+    Iterate over the rows of get_traces page by page, fetching the next page
+    in the background (see pagination.paginate).
+    """
+    metric = os.environ.get("TRACES_METRIC_NAME")
+
+    def fetch(params):
+        return query_dc_api(metric=metric, query_params=params).json()
+
+    rows = paginate(fetch, query_params or {}, page_size, cursor, prefetch=prefetch)
+    try:
+        yield from rows
+    except Exception as e:
+        raise Exception(f"Error querying traces: {e}")
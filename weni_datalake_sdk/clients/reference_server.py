@@ -0,0 +1,230 @@
+"""
+In-memory stand-in for the datalake manager gRPC services.
+
+Meant for local testing and benchmarks: every servicer keeps the requests it
+receives and answers with a "success" status.
+"""
+import threading
+from collections import Counter
+from concurrent import futures
+
+import grpc
+from grpc_health.v1 import health_pb2, health_pb2_grpc
+
+from weni_datalake_sdk.clients import (
+    commerce_webhook_pb2,
+    commerce_webhook_pb2_grpc,
+    events_pb2,
+    events_pb2_grpc,
+    message_templates_pb2,
+    message_templates_pb2_grpc,
+    msgs_pb2,
+    msgs_pb2_grpc,
+    traces_pb2,
+    traces_pb2_grpc,
+)
+
+SUCCESS_STATUS = "success"
+
+
+class RecordingServicer:
+    """Keeps received records and counts calls per RPC method."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.records = []
+        self.calls = Counter()
+
+    def record(self, method: str, records: list):
+        with self._lock:
+            self.calls[method] += 1
+            self.records.extend(records)
+        return len(records)
+
+    def record_stream(self, method: str, request_iterator):
+        # Materialize first so a stream that fails midway records nothing.
+        return self.record(method, list(request_iterator))
+
+
+class EventServicer(RecordingServicer, events_pb2_grpc.DatalakeManagerServiceServicer):
+    def InsertEventData(self, request, context):
+        self.record("InsertEventData", [request])
+        return events_pb2.InsertEventResponse(status=SUCCESS_STATUS)
+
+    def InsertEventBatch(self, request, context):
+        inserted = self.record("InsertEventBatch", request.events)
+        return events_pb2.InsertBatchResponse(status=SUCCESS_STATUS, inserted=inserted)
+
+    def InsertEventStream(self, request_iterator, context):
+        inserted = self.record_stream("InsertEventStream", request_iterator)
+        return events_pb2.InsertBatchResponse(status=SUCCESS_STATUS, inserted=inserted)
+
+
+class TraceServicer(RecordingServicer, traces_pb2_grpc.DatalakeManagerServiceServicer):
+    def InsertTraceData(self, request, context):
+        self.record("InsertTraceData", [request])
+        return traces_pb2.InsertTraceResponse(status=SUCCESS_STATUS)
+
+    def InsertTraceBatch(self, request, context):
+        inserted = self.record("InsertTraceBatch", request.traces)
+        return traces_pb2.InsertBatchResponse(status=SUCCESS_STATUS, inserted=inserted)
+
+    def InsertTraceStream(self, request_iterator, context):
+        inserted = self.record_stream("InsertTraceStream", request_iterator)
+        return traces_pb2.InsertBatchResponse(status=SUCCESS_STATUS, inserted=inserted)
+
+
+class MessageTemplateServicer(
+    RecordingServicer, message_templates_pb2_grpc.DatalakeManagerServiceServicer
+):
+    def InsertMessageTemplateData(self, request, context):
+        self.record("InsertMessageTemplateData", [request])
+        return message_templates_pb2.InsertMessageTemplateResponse(
+            status=SUCCESS_STATUS
+        )
+
+    def InsertMessageTemplateStatusData(self, request, context):
+        self.record("InsertMessageTemplateStatusData", [request])
+        return message_templates_pb2.InsertMessageTemplateStatusResponse(
+            status=SUCCESS_STATUS
+        )
+
+    def InsertMessageTemplateBatch(self, request, context):
+        inserted = self.record("InsertMessageTemplateBatch", request.message_templates)
+        return message_templates_pb2.InsertBatchResponse(
+            status=SUCCESS_STATUS, inserted=inserted
+        )
+
+    def InsertMessageTemplateStream(self, request_iterator, context):
+        inserted = self.record_stream("InsertMessageTemplateStream", request_iterator)
+        return message_templates_pb2.InsertBatchResponse(
+            status=SUCCESS_STATUS, inserted=inserted
+        )
+
+    def InsertMessageTemplateStatusStream(self, request_iterator, context):
+        inserted = self.record_stream(
+            "InsertMessageTemplateStatusStream", request_iterator
+        )
+        return message_templates_pb2.InsertBatchResponse(
+            status=SUCCESS_STATUS, inserted=inserted
+        )
+
+
+class MsgServicer(RecordingServicer, msgs_pb2_grpc.DatalakeManagerServiceServicer):
+    def InsertData(self, request, context):
+        self.record("InsertData", [request])
+        return msgs_pb2.InsertResponse(status=SUCCESS_STATUS)
+
+    def InsertDataStream(self, request_iterator, context):
+        inserted = self.record_stream("InsertDataStream", request_iterator)
+        return msgs_pb2.InsertBatchResponse(status=SUCCESS_STATUS, inserted=inserted)
+
+
+class CommerceWebhookServicer(
+    RecordingServicer, commerce_webhook_pb2_grpc.CommerceWebhookServiceServicer
+):
+    def InsertCommerceWebhookData(self, request, context):
+        self.record("InsertCommerceWebhookData", [request])
+        return commerce_webhook_pb2.InsertCommerceWebhookResponse(status=SUCCESS_STATUS)
+
+    def InsertCommerceWebhookBatch(self, request, context):
+        inserted = self.record("InsertCommerceWebhookBatch", request.commerce_webhooks)
+        return commerce_webhook_pb2.InsertBatchResponse(
+            status=SUCCESS_STATUS, inserted=inserted
+        )
+
+    def InsertCommerceWebhookStream(self, request_iterator, context):
+        inserted = self.record_stream("InsertCommerceWebhookStream", request_iterator)
+        return commerce_webhook_pb2.InsertBatchResponse(
+            status=SUCCESS_STATUS, inserted=inserted
+        )
+
+
+class HealthServicer(health_pb2_grpc.HealthServicer):
+    """
+    grpc.health.v1 Check for the whole server. Watch is left unimplemented,
+    which gRPC's client-side health checking treats as healthy.
+    """
+
+    def __init__(self):
+        self.status = health_pb2.HealthCheckResponse.SERVING
+
+    def Check(self, request, context):
+        return health_pb2.HealthCheckResponse(status=self.status)
+
+    def Watch(self, request, context):
+        context.abort(grpc.StatusCode.UNIMPLEMENTED, "Watch is not supported")
+
+
+class ReferenceServer:
+    """
+    gRPC server exposing every reference servicer on a single port.
+
+    Usage:
+        with ReferenceServer() as server:
+            client.SERVER_ADDRESS = server.target
+            ...
+            server.events.records
+    """
+
+    def __init__(self, address: str = "localhost:0", max_workers: int = 10):
+        self.address = address
+        self.max_workers = max_workers
+        self.target = None
+
+        self.events = EventServicer()
+        self.traces = TraceServicer()
+        self.message_templates = MessageTemplateServicer()
+        self.msgs = MsgServicer()
+        self.commerce_webhooks = CommerceWebhookServicer()
+        self.health = HealthServicer()
+
+        self._server = None
+
+    def start(self) -> str:
+        self._server = grpc.server(
+            futures.ThreadPoolExecutor(max_workers=self.max_workers)
+        )
+        events_pb2_grpc.add_DatalakeManagerServiceServicer_to_server(
+            self.events, self._server
+        )
+        traces_pb2_grpc.add_DatalakeManagerServiceServicer_to_server(
+            self.traces, self._server
+        )
+        message_templates_pb2_grpc.add_DatalakeManagerServiceServicer_to_server(
+            self.message_templates, self._server
+        )
+        msgs_pb2_grpc.add_DatalakeManagerServiceServicer_to_server(
+            self.msgs, self._server
+        )
+        commerce_webhook_pb2_grpc.add_CommerceWebhookServiceServicer_to_server(
+            self.commerce_webhooks, self._server
+        )
+        health_pb2_grpc.add_HealthServicer_to_server(self.health, self._server)
+
+        host = self.address.rsplit(":", 1)[0]
+        port = self._server.add_insecure_port(self.address)
+        self._server.start()
+
+        self.target = f"{host}:{port}"
+        return self.target
+
+    def set_serving(self, serving: bool):
+        """
+        Change the status reported by the grpc.health.v1 service.
+        """
+        self.health.status = health_pb2.HealthCheckResponse.SERVING
+        if not serving:
+            self.health.status = health_pb2.HealthCheckResponse.NOT_SERVING
+
+    def stop(self, grace: float = None):
+        if self._server is not None:
+            self._server.stop(grace)
+            self._server = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
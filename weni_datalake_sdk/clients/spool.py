@@ -0,0 +1,554 @@
+"""
+Write-ahead spool for inserts that could not reach the datalake manager.
+
+Each record is the serialized request plus the full gRPC method path, stored
+in segmented append-only files as:
+
+    [4 bytes length][4 bytes crc32][2 bytes method length][method][request]
+
+A background drainer replays the records in order once the server answers
+again, and removes or compacts the segments it has consumed.
+
+Processes sharing a spool directory (gunicorn/celery prefork workers) each
+write to their own subdirectory, locked while they run. The segments of a
+subdirectory whose process is gone are adopted by a live one.
+"""
+import logging
+import mmap
+import os
+import struct
+import threading
+import zlib
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+import grpc
+
+from weni_datalake_sdk.clients.channel_pool import get_channel_pool
+from weni_datalake_sdk.utils.exceptions import SpoolFullError
+
+logger = logging.getLogger(__name__)
+
+DATALAKE_SPOOL_DIR = os.environ.get("DATALAKE_SPOOL_DIR")
+DATALAKE_SPOOL_MAX_BYTES = int(
+    os.environ.get("DATALAKE_SPOOL_MAX_BYTES", 1024 * 1024 * 1024)
+)
+DATALAKE_SPOOL_SEGMENT_BYTES = int(
+    os.environ.get("DATALAKE_SPOOL_SEGMENT_BYTES", 64 * 1024 * 1024)
+)
+
+HEADER = struct.Struct(">II")
+METHOD_LENGTH = struct.Struct(">H")
+OFFSET = struct.Struct(">Q")
+
+SEGMENT_PREFIX = "segment-"
+SEGMENT_SUFFIX = ".log"
+ACK_SUFFIX = ".ack"
+LOCK_NAME = ".lock"
+
+# Codes that mean "the server is not there right now": the record is kept
+# and replayed later. Any other error drops the record.
+RETRYABLE_CODES = (grpc.StatusCode.UNAVAILABLE, grpc.StatusCode.DEADLINE_EXCEEDED)
+
+
+def encode_record(method: str, request: bytes) -> bytes:
+    method = method.encode()
+    payload = METHOD_LENGTH.pack(len(method)) + method + request
+    return HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+
+
+def _is_segment(name: str) -> bool:
+    return name.startswith(SEGMENT_PREFIX) and name.endswith(SEGMENT_SUFFIX)
+
+
+def _try_lock(directory: str):
+    """
+    Open and lock `directory`'s lock file without blocking. Returns the open
+    file, or None when another spool holds it.
+    """
+    lock_file = open(os.path.join(directory, LOCK_NAME), "a+b")
+    if fcntl is not None:
+        try:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return None
+    return lock_file
+
+
+def _is_running(name: str) -> bool:
+    """
+    Whether the spool subdirectory `name` is named after another process
+    that is still running. Such a directory may not be locked yet.
+    """
+    pid = name.split(".")[0]
+    if fcntl is None or not pid.isdigit() or int(pid) == os.getpid():
+        return False
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        pass
+    return True
+
+
+class Spool:
+    """
+    Append-only segmented record log on local disk.
+
+    The log lives in a subdirectory of `root` owned by this spool (named
+    after the process id), so several processes can share `root`. Segments
+    left in `root` by processes that are gone are adopted (see
+    adopt_orphans).
+
+    `max_bytes` caps the disk used by every segment of this spool together;
+    `segment_bytes` is the size at which the active segment is sealed and a
+    new one started.
+    """
+
+    def __init__(
+        self,
+        root: str,
+        max_bytes: int = DATALAKE_SPOOL_MAX_BYTES,
+        segment_bytes: int = DATALAKE_SPOOL_SEGMENT_BYTES,
+    ):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.segment_bytes = segment_bytes
+
+        os.makedirs(root, exist_ok=True)
+        self.directory, self._lock_file = self._claim_directory()
+
+        self._lock = threading.Lock()
+        self._segments = sorted(
+            name for name in os.listdir(self.directory) if _is_segment(name)
+        )
+        self._size = sum(self._file_size(name) for name in self._segments)
+        self._active = None
+        self._active_file = None
+        self._reading = set()
+        self.adopt_orphans()
+
+    def _claim_directory(self):
+        # A second spool of the same process on the same root gets its own
+        # directory too.
+        base = str(os.getpid())
+        for index in range(1000):
+            name = base if index == 0 else f"{base}.{index}"
+            directory = os.path.join(self.root, name)
+            lock_file = self._lock_directory(directory)
+            if lock_file is not None:
+                return directory, lock_file
+        raise RuntimeError(f"No free spool directory in {self.root}")
+
+    @staticmethod
+    def _lock_directory(directory: str):
+        # Until it is locked, the new directory looks orphaned, so another
+        # spool's adopt_orphans may remove it (and its lock file) meanwhile:
+        # start over until the lock held is the one on disk.
+        while True:
+            os.makedirs(directory, exist_ok=True)
+            try:
+                lock_file = _try_lock(directory)
+            except FileNotFoundError:
+                continue
+            if lock_file is None:
+                return None
+            try:
+                on_disk = os.stat(os.path.join(directory, LOCK_NAME))
+            except FileNotFoundError:
+                on_disk = None
+            if on_disk is not None and os.path.samestat(
+                on_disk, os.fstat(lock_file.fileno())
+            ):
+                return lock_file
+            lock_file.close()
+
+    def adopt_orphans(self) -> int:
+        """
+        Move into this spool the segments of every subdirectory of `root`
+        that no live spool holds and no running process is named after, and
+        those written straight into `root` by older versions. Returns the number of segments adopted.
+        """
+        adopted = 0
+        for name in sorted(os.listdir(self.root)):
+            path = os.path.join(self.root, name)
+            if path == self.directory:
+                continue
+            if _is_segment(name):
+                adopted += self._adopt(self.root, [name])
+                continue
+            if not os.path.isdir(path) or _is_running(name):
+                continue
+
+            lock_file = _try_lock(path)
+            if lock_file is None:
+                continue
+            try:
+                segments = sorted(n for n in os.listdir(path) if _is_segment(n))
+                adopted += self._adopt(path, segments)
+                os.remove(os.path.join(path, LOCK_NAME))
+                try:
+                    os.rmdir(path)
+                except OSError:
+                    pass
+            finally:
+                lock_file.close()
+        return adopted
+
+    def _adopt(self, directory: str, segments: list) -> int:
+        adopted = 0
+        with self._lock:
+            for name in segments:
+                new_name = self._next_name()
+                try:
+                    os.rename(os.path.join(directory, name), self._path(new_name))
+                except FileNotFoundError:
+                    # Another process adopted it first.
+                    continue
+                try:
+                    os.rename(
+                        os.path.join(directory, name + ACK_SUFFIX),
+                        self._path(new_name + ACK_SUFFIX),
+                    )
+                except FileNotFoundError:
+                    pass
+                if self._active is not None:
+                    # Keep the active segment last.
+                    self._segments.insert(len(self._segments) - 1, new_name)
+                else:
+                    self._segments.append(new_name)
+                self._size += self._file_size(new_name)
+                adopted += 1
+        return adopted
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def _file_size(self, name: str) -> int:
+        try:
+            return os.path.getsize(self._path(name))
+        except FileNotFoundError:
+            return 0
+
+    def _sequence(self, name: str) -> int:
+        return int(name[len(SEGMENT_PREFIX) : -len(SEGMENT_SUFFIX)])
+
+    def _next_name(self) -> str:
+        sequence = max(map(self._sequence, self._segments), default=-1) + 1
+        return f"{SEGMENT_PREFIX}{sequence:012d}{SEGMENT_SUFFIX}"
+
+    def _open_segment(self):
+        self._active = self._next_name()
+        self._active_file = open(self._path(self._active), "ab")
+        self._segments.append(self._active)
+
+    def _seal(self):
+        if self._active_file is not None:
+            self._active_file.close()
+        self._active = None
+        self._active_file = None
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def append(self, method: str, request: bytes):
+        """
+        Append a serialized request for `method` (e.g. "/events.X/InsertEventData").
+        Raises SpoolFullError when the disk cap would be exceeded.
+        """
+        record = encode_record(method, request)
+
+        with self._lock:
+            if self._size + len(record) > self.max_bytes:
+                self._compact()
+                if self._size + len(record) > self.max_bytes:
+                    raise SpoolFullError(
+                        f"Spool at {self.directory} is full ({self._size} bytes)"
+                    )
+
+            if self._active_file is None:
+                self._open_segment()
+
+            self._active_file.write(record)
+            self._active_file.flush()
+            self._size += len(record)
+
+            if self._active_file.tell() >= self.segment_bytes:
+                self._seal()
+
+    def sealed_segments(self, seal_active: bool = True) -> list:
+        """
+        Segments ready to be drained, oldest first. With `seal_active` a
+        non-empty active segment is sealed so the drainer can catch up with the
+        writer; without it the active segment is only sealed once full.
+        """
+        with self._lock:
+            if (
+                seal_active
+                and self._active_file is not None
+                and self._active_file.tell() > 0
+            ):
+                self._seal()
+            return [name for name in self._segments if name != self._active]
+
+    def read(self, name: str):
+        """
+        Yield `(end_offset, method, request)` for every unacknowledged record
+        of segment `name`. Reading stops at the first truncated or corrupted
+        record, which is what a crash in the middle of a write leaves behind.
+        """
+        with self._lock:
+            self._reading.add(name)
+        try:
+            yield from self._read(name)
+        finally:
+            with self._lock:
+                self._reading.discard(name)
+
+    def _read(self, name: str):
+        path = self._path(name)
+        offset = self.acked_offset(name)
+
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size == 0:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                while offset + HEADER.size <= size:
+                    length, checksum = HEADER.unpack_from(data, offset)
+                    start = offset + HEADER.size
+                    end = start + length
+                    if end > size:
+                        logger.warning("Truncated record in %s at %d", name, offset)
+                        return
+
+                    payload = data[start:end]
+                    if zlib.crc32(payload) != checksum:
+                        logger.warning("Corrupted record in %s at %d", name, offset)
+                        return
+
+                    (method_length,) = METHOD_LENGTH.unpack_from(payload)
+                    method_end = METHOD_LENGTH.size + method_length
+                    method = payload[METHOD_LENGTH.size : method_end].decode()
+
+                    yield end, method, payload[method_end:]
+                    offset = end
+
+    def acked_offset(self, name: str) -> int:
+        try:
+            with open(self._path(name + ACK_SUFFIX), "rb") as f:
+                return OFFSET.unpack(f.read(OFFSET.size))[0]
+        except (FileNotFoundError, struct.error):
+            return 0
+
+    def ack(self, name: str, offset: int):
+        """
+        Record that everything in `name` before `offset` was delivered.
+        """
+        with open(self._path(name + ACK_SUFFIX), "wb") as f:
+            f.write(OFFSET.pack(offset))
+
+    def remove(self, name: str):
+        with self._lock:
+            self._remove(name)
+
+    def _remove(self, name: str):
+        # The drainer removes the segments it finished, which compaction may
+        # already have done.
+        if name not in self._segments:
+            return
+        self._size -= self._file_size(name)
+        for path in (self._path(name), self._path(name + ACK_SUFFIX)):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        self._segments.remove(name)
+
+    def compact(self):
+        with self._lock:
+            self._compact()
+
+    def _compact(self):
+        # Drop fully delivered segments and rewrite partially delivered ones
+        # without their acknowledged prefix, so the cap only counts pending data.
+        for name in list(self._segments):
+            if name == self._active or name in self._reading:
+                continue
+
+            offset = self.acked_offset(name)
+            size = self._file_size(name)
+            if offset == 0:
+                continue
+            if offset >= size:
+                self._remove(name)
+                continue
+
+            path = self._path(name)
+            tmp_path = path + ".tmp"
+            with open(path, "rb") as src, open(tmp_path, "wb") as dst:
+                src.seek(offset)
+                dst.write(src.read())
+            os.replace(tmp_path, path)
+            self.ack(name, 0)
+            self._size -= offset
+
+    def close(self):
+        with self._lock:
+            self._seal()
+            if self._lock_file is not None:
+                self._lock_file.close()
+                self._lock_file = None
+
+
+class SpoolDrainer:
+    """
+    Background thread replaying spooled records to `target` in order.
+
+    On a retryable error it backs off (up to `max_backoff` seconds) and
+    resumes from the first record that was not delivered.
+    """
+
+    def __init__(
+        self,
+        spool: Spool,
+        target: str,
+        interval: float = 1.0,
+        max_backoff: float = 30.0,
+        timeout: float = 10.0,
+    ):
+        self.spool = spool
+        self.target = target
+        self.interval = interval
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+
+        self.replayed = 0
+        self.dropped = 0
+        self.healthy = True
+
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="datalake-spool-drainer", daemon=True
+        )
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def replay(self, method: str, request: bytes):
+        channel = get_channel_pool().get_channel(self.target)
+        # Without serializers the request bytes are sent as-is.
+        return channel.unary_unary(method)(request, timeout=self.timeout)
+
+    def drain(self) -> bool:
+        """
+        Replay every pending record. Returns False if the server is still
+        unavailable.
+        """
+        self.spool.adopt_orphans()
+        # While the server is down, sealing the active segment on every pass
+        # would only leave a trail of tiny segments behind.
+        for name in self.spool.sealed_segments(seal_active=self.healthy):
+            for offset, method, request in self.spool.read(name):
+                try:
+                    self.replay(method, request)
+                    self.replayed += 1
+                except grpc.RpcError as e:
+                    if e.code() in RETRYABLE_CODES:
+                        self.healthy = False
+                        return False
+                    logger.error("Dropping spooled record for %s: %s", method, e)
+                    self.dropped += 1
+                self.spool.ack(name, offset)
+            self.spool.remove(name)
+        self.healthy = True
+        return True
+
+    def _run(self):
+        backoff = self.interval
+        while not self._stop.is_set():
+            try:
+                healthy = self.drain()
+            except Exception:
+                logger.exception("Spool drain failed")
+                healthy = False
+
+            backoff = self.interval if healthy else min(backoff * 2, self.max_backoff)
+            self._stop.wait(backoff)
+
+
+_SPOOL = None
+_DRAINER = None
+_SPOOL_PID = None
+_SPOOL_ARGS = None
+_SPOOL_LOCK = threading.Lock()
+
+
+def _start(directory: str, target: str, **kwargs) -> Spool:
+    global _SPOOL, _DRAINER, _SPOOL_PID, _SPOOL_ARGS
+    _SPOOL = Spool(directory, **kwargs)
+    _DRAINER = SpoolDrainer(_SPOOL, target)
+    _DRAINER.start()
+    _SPOOL_PID = os.getpid()
+    _SPOOL_ARGS = (directory, target, kwargs)
+    return _SPOOL
+
+
+def _check_fork():
+    # The drainer thread does not survive a fork, and the parent keeps
+    # writing to its own directory: a child (gunicorn/celery prefork) starts
+    # a spool of its own.
+    global _SPOOL, _DRAINER
+    if _SPOOL is not None and _SPOOL_PID != os.getpid():
+        # Only drops this process' copy of the parent's files and lock.
+        _SPOOL.close()
+        _SPOOL = _DRAINER = None
+        directory, target, kwargs = _SPOOL_ARGS
+        _start(directory, target, **kwargs)
+
+
+def enable_spool(directory: str, target: str, **kwargs) -> Spool:
+    """
+    Turn on spooling to `directory` and start draining it to `target`.
+    """
+    disable_spool()
+    with _SPOOL_LOCK:
+        return _start(directory, target, **kwargs)
+
+
+def disable_spool():
+    global _SPOOL, _DRAINER
+    with _SPOOL_LOCK:
+        spool, drainer = _SPOOL, _DRAINER
+        _SPOOL = None
+        _DRAINER = None
+
+    if drainer is not None:
+        drainer.stop()
+    if spool is not None:
+        spool.close()
+
+
+def get_spool(target: str = None):
+    """
+    Return the active spool, enabling it from DATALAKE_SPOOL_DIR on first use.
+    Returns None when spooling is off.
+    """
+    if _SPOOL is not None and _SPOOL_PID != os.getpid():
+        with _SPOOL_LOCK:
+            _check_fork()
+    if _SPOOL is None and DATALAKE_SPOOL_DIR and target:
+        with _SPOOL_LOCK:
+            if _SPOOL is None:
+                _start(DATALAKE_SPOOL_DIR, target)
+    return _SPOOL
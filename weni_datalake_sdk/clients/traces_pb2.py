@@ -23,7 +23,7 @@ _sym_db = _symbol_database.Default()
 from google.protobuf import struct_pb2 as google_dot_protobuf_dot_struct__pb2
 
 DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(
-    b'\n\x0ctraces.proto\x12\x06traces\x1a\x1cgoogle/protobuf/struct.proto"I\n\x12InsertTraceRequest\x12\x0c\n\x04path\x18\x01 \x01(\t\x12%\n\x04\x64\x61ta\x18\x02 \x01(\x0b\x32\x17.google.protobuf.Struct"%\n\x13InsertTraceResponse\x12\x0e\n\x06status\x18\x01 \x01(\t2d\n\x16\x44\x61talakeManagerService\x12J\n\x0fInsertTraceData\x12\x1a.traces.InsertTraceRequest\x1a\x1b.traces.InsertTraceResponseb\x06proto3'
+    b'\n\x0ctraces.proto\x12\x06traces\x1a\x1cgoogle/protobuf/struct.proto"I\n\x12InsertTraceRequest\x12\x0c\n\x04path\x18\x01 \x01(\t\x12%\n\x04\x64\x61ta\x18\x02 \x01(\x0b\x32\x17.google.protobuf.Struct"%\n\x13InsertTraceResponse\x12\x0e\n\x06status\x18\x01 \x01(\t"E\n\x17InsertTraceBatchRequest\x12*\n\x06traces\x18\x01 \x03(\x0b\x32\x1a.traces.InsertTraceRequest"7\n\x13InsertBatchResponse\x12\x0e\n\x06status\x18\x01 \x01(\t\x12\x10\n\x08inserted\x18\x02 \x01(\x03\x32\x86\x02\n\x16\x44\x61talakeManagerService\x12J\n\x0fInsertTraceData\x12\x1a.traces.InsertTraceRequest\x1a\x1b.traces.InsertTraceResponse\x12P\n\x10InsertTraceBatch\x12\x1f.traces.InsertTraceBatchRequest\x1a\x1b.traces.InsertBatchResponse\x12N\n\x11InsertTraceStream\x12\x1a.traces.InsertTraceRequest\x1a\x1b.traces.InsertBatchResponse(\x01\x62\x06proto3'
 )
 
 _globals = globals()
@@ -35,6 +35,10 @@ if not _descriptor._USE_C_DESCRIPTORS:
     _globals["_INSERTTRACEREQUEST"]._serialized_end = 127
     _globals["_INSERTTRACERESPONSE"]._serialized_start = 129
     _globals["_INSERTTRACERESPONSE"]._serialized_end = 166
-    _globals["_DATALAKEMANAGERSERVICE"]._serialized_start = 168
-    _globals["_DATALAKEMANAGERSERVICE"]._serialized_end = 268
+    _globals["_INSERTTRACEBATCHREQUEST"]._serialized_start = 168
+    _globals["_INSERTTRACEBATCHREQUEST"]._serialized_end = 237
+    _globals["_INSERTBATCHRESPONSE"]._serialized_start = 239
+    _globals["_INSERTBATCHRESPONSE"]._serialized_end = 294
+    _globals["_DATALAKEMANAGERSERVICE"]._serialized_start = 297
+    _globals["_DATALAKEMANAGERSERVICE"]._serialized_end = 559
 # @@protoc_insertion_point(module_scope)
@@ -1,6 +1,6 @@
 # Generated by the gRPC Python protocol compiler plugin. DO NOT EDIT!
 """Client and server classes corresponding to protobuf-defined services."""
-import warnings  # noqa: F401, E402
+import warnings
 
 import grpc
 
@@ -44,6 +44,18 @@ class DatalakeManagerServiceStub(object):
             response_deserializer=traces__pb2.InsertTraceResponse.FromString,
             _registered_method=True,
         )
+        self.InsertTraceBatch = channel.unary_unary(
+            "/traces.DatalakeManagerService/InsertTraceBatch",
+            request_serializer=traces__pb2.InsertTraceBatchRequest.SerializeToString,
+            response_deserializer=traces__pb2.InsertBatchResponse.FromString,
+            _registered_method=True,
+        )
+        self.InsertTraceStream = channel.stream_unary(
+            "/traces.DatalakeManagerService/InsertTraceStream",
+            request_serializer=traces__pb2.InsertTraceRequest.SerializeToString,
+            response_deserializer=traces__pb2.InsertBatchResponse.FromString,
+            _registered_method=True,
+        )
 
 
 class DatalakeManagerServiceServicer(object):
@@ -55,6 +67,18 @@ class DatalakeManagerServiceServicer(object):
         context.set_details("Method not implemented!")
         raise NotImplementedError("Method not implemented!")
 
+    def InsertTraceBatch(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details("Method not implemented!")
+        raise NotImplementedError("Method not implemented!")
+
+    def InsertTraceStream(self, request_iterator, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details("Method not implemented!")
+        raise NotImplementedError("Method not implemented!")
+
 
 def add_DatalakeManagerServiceServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -63,6 +87,16 @@ def add_DatalakeManagerServiceServicer_to_server(servicer, server):
             request_deserializer=traces__pb2.InsertTraceRequest.FromString,
             response_serializer=traces__pb2.InsertTraceResponse.SerializeToString,
         ),
+        "InsertTraceBatch": grpc.unary_unary_rpc_method_handler(
+            servicer.InsertTraceBatch,
+            request_deserializer=traces__pb2.InsertTraceBatchRequest.FromString,
+            response_serializer=traces__pb2.InsertBatchResponse.SerializeToString,
+        ),
+        "InsertTraceStream": grpc.stream_unary_rpc_method_handler(
+            servicer.InsertTraceStream,
+            request_deserializer=traces__pb2.InsertTraceRequest.FromString,
+            response_serializer=traces__pb2.InsertBatchResponse.SerializeToString,
+        ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
         "traces.DatalakeManagerService", rpc_method_handlers
@@ -106,3 +140,63 @@ class DatalakeManagerService(object):
             metadata,
             _registered_method=True,
         )
+
+    @staticmethod
+    def InsertTraceBatch(
+        request,
+        target,
+        options=(),
+        channel_credentials=None,
+        call_credentials=None,
+        insecure=False,
+        compression=None,
+        wait_for_ready=None,
+        timeout=None,
+        metadata=None,
+    ):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            "/traces.DatalakeManagerService/InsertTraceBatch",
+            traces__pb2.InsertTraceBatchRequest.SerializeToString,
+            traces__pb2.InsertBatchResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True,
+        )
+
+    @staticmethod
+    def InsertTraceStream(
+        request_iterator,
+        target,
+        options=(),
+        channel_credentials=None,
+        call_credentials=None,
+        insecure=False,
+        compression=None,
+        wait_for_ready=None,
+        timeout=None,
+        metadata=None,
+    ):
+        return grpc.experimental.stream_unary(
+            request_iterator,
+            target,
+            "/traces.DatalakeManagerService/InsertTraceStream",
+            traces__pb2.InsertTraceRequest.SerializeToString,
+            traces__pb2.InsertBatchResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True,
+        )
@@ -0,0 +1,71 @@
+"""
+Stand-ins shared by the tests: a gRPC error with a given code and a local
+HTTP server for the DC API and session tests.
+"""
+import json
+import threading
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import grpc
+
+from weni_datalake_sdk.clients.redshift import redshift_client
+
+
+class RpcError(grpc.RpcError):
+    def __init__(self, code):
+        self._code = code
+
+    def code(self):
+        return self._code
+
+
+def unavailable():
+    return RpcError(grpc.StatusCode.UNAVAILABLE)
+
+
+class Handler(BaseHTTPRequestHandler):
+    """Request handler speaking HTTP/1.1, without access logs."""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def send_json(self, data, headers: dict = None):
+        body = json.dumps(data).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@contextmanager
+def http_server(handler):
+    """
+    Serve `handler` on a free localhost port from a thread and yield its URL.
+    """
+    server = ThreadingHTTPServer(("localhost", 0), handler)
+    thread = threading.Thread(target=server.serve_forever, args=(0.01,), daemon=True)
+    thread.start()
+    try:
+        yield f"http://localhost:{server.server_port}"
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+
+
+def use_dc_api(monkeypatch, url: str, **metrics):
+    """
+    Send the DC API queries to `url` with a fixed token. `metrics` sets the
+    metric name env variables, e.g. EVENTS_METRIC_NAME="events".
+    """
+    monkeypatch.setattr(redshift_client, "REDSHIFT_QUERY_BASE_URL", url)
+    monkeypatch.setattr(redshift_client, "get_secrets", lambda **kwargs: "token")
+    for name, value in metrics.items():
+        monkeypatch.setenv(name, value)
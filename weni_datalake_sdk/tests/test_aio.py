@@ -0,0 +1,258 @@
+import asyncio
+import threading
+from unittest import mock
+
+import grpc
+import pytest
+
+from weni_datalake_sdk import aio
+from weni_datalake_sdk.clients import client, events_pb2_grpc
+from weni_datalake_sdk.clients.balancer import EndpointBalancer
+from weni_datalake_sdk.clients.channel_pool import close_channel_pool
+from weni_datalake_sdk.clients.converters import build_event_request
+from weni_datalake_sdk.clients.policy import CallPolicy, configure_policy
+from weni_datalake_sdk.clients.reference_server import ReferenceServer
+from weni_datalake_sdk.clients.spool import Spool
+from weni_datalake_sdk.paths.commerce_webhook import CommerceWebhookPath
+from weni_datalake_sdk.paths.events_path import EventPath
+from weni_datalake_sdk.paths.message_template_path import MessageTemplatePath
+from weni_datalake_sdk.paths.message_template_status_path import (
+    MessageTemplateStatusPath,
+)
+from weni_datalake_sdk.paths.msg_path import MsgPath
+from weni_datalake_sdk.paths.trace_path import TracePath
+from weni_datalake_sdk.tests.helpers import RpcError
+from weni_datalake_sdk.utils.exceptions import ValidationError
+
+
+@pytest.fixture
+def server(monkeypatch):
+    with ReferenceServer() as server:
+        monkeypatch.setattr(client, "SERVER_ADDRESS", server.target)
+        yield server
+
+
+def run(coro_func):
+    async def wrapper():
+        try:
+            return await coro_func()
+        finally:
+            await aio.close_channels()
+
+    return asyncio.run(wrapper())
+
+
+@pytest.fixture
+def events_policy():
+    configure_policy(
+        EventPath.get_table_name(),
+        CallPolicy(timeout=1, max_attempts=2, initial_backoff=0.01),
+    )
+    yield
+    configure_policy(EventPath.get_table_name(), None)
+
+
+class FakePath:
+    @staticmethod
+    def get_table_name():
+        return "invalid_table"
+
+
+class TestAioSendEventData:
+    def test_gather_many_inserts(self, server):
+        async def main():
+            return await asyncio.gather(
+                *(
+                    aio.send_event_data(
+                        EventPath,
+                        dict(event_name="event1", project="proj1", value=i),
+                    )
+                    for i in range(500)
+                )
+            )
+
+        statuses = run(main)
+
+        assert statuses == ["success"] * 500
+        assert server.events.calls["InsertEventData"] == 500
+
+    def test_shares_one_channel_per_loop(self, server):
+        async def main():
+            first = aio.get_stub(events_pb2_grpc.DatalakeManagerServiceStub)
+            second = aio.get_stub(events_pb2_grpc.DatalakeManagerServiceStub)
+            return first, second
+
+        first, second = run(main)
+
+        assert first is second
+
+    def test_request_matches_sync_conversion(self, server):
+        data = dict(
+            event_name="event1",
+            key="key1",
+            date="2024-01-01T00:00:00Z",
+            project="proj1",
+            contact_urn="urn1",
+            value="val1",
+            value_type="string",
+            metadata={"meta": "data"},
+        )
+
+        run(lambda: aio.send_event_data(EventPath, data))
+
+        assert server.events.records[0] == build_event_request(data)
+
+    def test_invalid_path(self, server):
+        with pytest.raises(ValidationError):
+            run(lambda: aio.send_event_data(FakePath, {}))
+
+
+class TestAioPolicyAndSpool:
+    def test_unavailable_is_retried_with_the_path_policy(self, events_policy):
+        stub = mock.Mock()
+        stub.InsertEventData = mock.AsyncMock(
+            side_effect=[
+                RpcError(grpc.StatusCode.UNAVAILABLE),
+                mock.Mock(status="success"),
+            ]
+        )
+
+        with mock.patch.object(aio, "_get_stub", mock.AsyncMock(return_value=stub)):
+            status = run(lambda: aio.send_event_data(EventPath, {"event_name": "e"}))
+
+        assert status == "success"
+        assert stub.InsertEventData.call_count == 2
+        assert stub.InsertEventData.call_args.kwargs == {"timeout": 1}
+
+    def test_spooled_while_unavailable(self, monkeypatch, tmp_path, events_policy):
+        monkeypatch.setattr(client, "SERVER_ADDRESS", "127.0.0.1:1")
+        spool = Spool(str(tmp_path))
+
+        with mock.patch.object(aio, "get_spool", return_value=spool):
+            status = run(lambda: aio.send_event_data(EventPath, {"event_name": "e"}))
+
+        assert status == client.SPOOLED_STATUS
+        (segment,) = spool.sealed_segments()
+        ((_, method, _),) = list(spool.read(segment))
+        assert method == client.METHOD_PATHS["InsertEventData"]
+        spool.close()
+
+
+class TestChannelsPerLoop:
+    def get_channel(self):
+        stub = aio.get_stub(events_pb2_grpc.DatalakeManagerServiceStub)
+        return stub.InsertEventData._channel
+
+    def test_closed_when_the_loop_shuts_down(self, server):
+        async def main():
+            return self.get_channel()
+
+        channels = [asyncio.run(main()) for _ in range(3)]
+
+        assert len(aio._CHANNELS) == 0
+        assert all(channel.closed() for channel in channels)
+
+    def test_dropped_after_the_loop_is_closed(self, server):
+        async def main():
+            self.get_channel()
+
+        loop = asyncio.new_event_loop()
+        loop.run_until_complete(main())
+        loop.close()
+        assert len(aio._CHANNELS) == 1
+
+        run(main)
+
+        assert len(aio._CHANNELS) == 0
+
+    def test_cleanup_task_ends_with_close_channels(self, server):
+        async def main():
+            self.get_channel()
+            await aio.close_channels()
+            await asyncio.sleep(0)
+            return asyncio.all_tasks() - {asyncio.current_task()}
+
+        assert run(main) == set()
+
+    def test_close_channels(self, server):
+        async def main():
+            channel = self.get_channel()
+            await aio.close_channels()
+            assert self.get_channel() is not channel
+            return channel
+
+        assert run(main).closed()
+
+
+class TestMultiAddressTarget:
+    def test_warm_up_probe_runs_off_the_loop(self, monkeypatch):
+        check_all = EndpointBalancer.check_all
+        threads = []
+
+        def record(balancer):
+            threads.append(threading.current_thread())
+            return check_all(balancer)
+
+        async def main():
+            return await asyncio.gather(
+                *(
+                    aio.send_event_data(EventPath, dict(event_name="e", value=i))
+                    for i in range(4)
+                )
+            )
+
+        with ReferenceServer() as first, ReferenceServer() as second:
+            monkeypatch.setattr(
+                client, "SERVER_ADDRESS", f"{first.target},{second.target}"
+            )
+            try:
+                with mock.patch.object(EndpointBalancer, "check_all", record):
+                    statuses = run(main)
+            finally:
+                close_channel_pool()
+
+        assert statuses == ["success"] * 4
+        assert threads[0] is not threading.main_thread()
+        assert (
+            first.events.calls["InsertEventData"]
+            + second.events.calls["InsertEventData"]
+            == 4
+        )
+
+
+class TestAioOtherSends:
+    def test_send_data(self, server):
+        assert run(lambda: aio.send_data(MsgPath, {"text": "Oi!"})) == "success"
+        assert server.msgs.records[0].path == "messages"
+
+    def test_send_trace_data(self, server):
+        assert run(lambda: aio.send_trace_data(TracePath, {"a": "b"})) == "success"
+        assert server.traces.calls["InsertTraceData"] == 1
+
+    def test_send_message_template_data(self, server):
+        status = run(
+            lambda: aio.send_message_template_data(MessageTemplatePath, {"a": "b"})
+        )
+
+        assert status == "success"
+        assert server.message_templates.calls["InsertMessageTemplateData"] == 1
+
+    def test_send_message_template_status_data(self, server):
+        status = run(
+            lambda: aio.send_message_template_status_data(
+                MessageTemplateStatusPath, {"status": "approved"}
+            )
+        )
+
+        assert status == "success"
+        assert server.message_templates.calls["InsertMessageTemplateStatusData"] == 1
+
+    def test_send_commerce_webhook_data(self, server):
+        status = run(
+            lambda: aio.send_commerce_webhook_data(
+                CommerceWebhookPath, {"project": "proj1"}
+            )
+        )
+
+        assert status == "success"
+        assert server.commerce_webhooks.records[0].project == "proj1"
@@ -0,0 +1,174 @@
+import json
+import threading
+from unittest import mock
+
+import grpc
+import pytest
+
+from weni_datalake_sdk.clients import client
+from weni_datalake_sdk.clients.balancer import (
+    EndpointBalancer,
+    is_multi_target,
+    split_targets,
+)
+from weni_datalake_sdk.clients.channel_pool import (
+    ChannelPool,
+    close_channel_pool,
+    configure_channel_pool,
+    warm_up,
+)
+from weni_datalake_sdk.clients.client import send_event_data
+from weni_datalake_sdk.clients.reference_server import ReferenceServer
+from weni_datalake_sdk.paths.events_path import EventPath
+from weni_datalake_sdk.tests.helpers import RpcError
+
+
+@pytest.fixture
+def servers(monkeypatch):
+    with ReferenceServer() as first, ReferenceServer() as second:
+        monkeypatch.setattr(client, "SERVER_ADDRESS", f"{first.target},{second.target}")
+        yield first, second
+        close_channel_pool()
+
+
+def test_split_targets():
+    assert split_targets("a:1, b:2,") == ["a:1", "b:2"]
+    assert is_multi_target("a:1,b:2")
+    assert not is_multi_target("dns:///datalake:50051")
+    assert not is_multi_target(None)
+
+
+class TestEndpointBalancer:
+    def make_balancer(self, statuses):
+        balancer = EndpointBalancer(["a:1", "b:2", "c:3"], get_channel=mock.Mock())
+        balancer.check = lambda address: statuses[address]
+        return balancer
+
+    def test_round_robin(self):
+        balancer = self.make_balancer({})
+
+        assert [balancer.next_address() for _ in range(4)] == [
+            "a:1",
+            "b:2",
+            "c:3",
+            "a:1",
+        ]
+
+    def test_unhealthy_addresses_leave_rotation(self):
+        balancer = self.make_balancer({"a:1": True, "b:2": False, "c:3": True})
+
+        balancer.check_all()
+
+        assert balancer.healthy_addresses() == ["a:1", "c:3"]
+        assert {balancer.next_address() for _ in range(4)} == {"a:1", "c:3"}
+
+    def test_uses_every_address_when_none_is_healthy(self):
+        balancer = self.make_balancer({"a:1": False, "b:2": False, "c:3": False})
+
+        balancer.check_all()
+
+        assert {balancer.next_address() for _ in range(3)} == {"a:1", "b:2", "c:3"}
+
+    def test_unimplemented_health_service_counts_as_healthy(self):
+        balancer = EndpointBalancer(["a:1"], get_channel=mock.Mock())
+        with mock.patch(
+            "weni_datalake_sdk.clients.balancer.health_pb2_grpc.HealthStub"
+        ) as stub_class:
+            stub_class.return_value.Check.side_effect = RpcError(
+                grpc.StatusCode.UNIMPLEMENTED
+            )
+            assert balancer.check("a:1")
+
+            stub_class.return_value.Check.side_effect = RpcError(
+                grpc.StatusCode.UNAVAILABLE
+            )
+            assert not balancer.check("a:1")
+
+
+class TestMultiEndpoint:
+    def test_inserts_are_spread_across_servers(self, servers):
+        first, second = servers
+
+        for i in range(10):
+            send_event_data(EventPath, {"event_name": f"event{i}"})
+
+        assert len(first.events.records) == 5
+        assert len(second.events.records) == 5
+
+    def test_unhealthy_server_is_skipped(self, servers):
+        first, second = servers
+        second.set_serving(False)
+
+        assert warm_up(client.SERVER_ADDRESS) == {
+            first.target: True,
+            second.target: False,
+        }
+        for i in range(4):
+            send_event_data(EventPath, {"event_name": f"event{i}"})
+
+        assert len(first.events.records) == 4
+        assert second.events.records == []
+
+    def test_warm_up_single_target(self):
+        with ReferenceServer() as server:
+            assert warm_up(server.target) == {server.target: True}
+        close_channel_pool()
+
+    def test_health_check_can_be_turned_off(self, servers):
+        pool = configure_channel_pool(health_check=False)
+
+        pool.resolve(client.SERVER_ADDRESS)
+
+        balancer = pool.get_balancer(client.SERVER_ADDRESS)
+        assert balancer._thread is None
+
+    def test_callers_wait_for_the_first_probe(self):
+        pool = ChannelPool()
+        probing, release = threading.Event(), threading.Event()
+
+        def check(balancer, address):
+            probing.set()
+            release.wait(5)
+            return address == "b:2"
+
+        results = []
+
+        def resolve():
+            results.append(pool.resolve("a:1,b:2"))
+
+        with mock.patch.object(EndpointBalancer, "check", check):
+            first = threading.Thread(target=resolve)
+            first.start()
+            assert probing.wait(5)
+            second = threading.Thread(target=resolve)
+            second.start()
+
+            second.join(0.2)
+            assert second.is_alive()
+            assert not pool.is_warm("a:1,b:2")
+
+            release.set()
+            first.join(5)
+            second.join(5)
+        pool.close()
+
+        assert results == ["b:2", "b:2"]
+
+
+class TestChannelOptions:
+    def test_round_robin_service_config(self):
+        options = dict(ChannelPool().get_options())
+
+        service_config = json.loads(options["grpc.service_config"])
+        assert service_config == {"loadBalancingConfig": [{"round_robin": {}}]}
+
+    def test_health_watch_service_config(self):
+        options = dict(ChannelPool(health_watch=True).get_options())
+
+        service_config = json.loads(options["grpc.service_config"])
+        assert service_config["healthCheckConfig"] == {"serviceName": ""}
+
+    def test_no_service_config_when_disabled(self):
+        options = dict(ChannelPool(lb_policy=None).get_options())
+
+        assert "grpc.service_config" not in options
@@ -0,0 +1,233 @@
+import threading
+import time
+from unittest import mock
+
+import pytest
+
+from weni_datalake_sdk.clients.redshift.batch import (
+    EventsStats,
+    QueryResult,
+    get_events_count_many,
+    get_events_stats,
+    query_many,
+    query_tables,
+)
+from weni_datalake_sdk.clients.redshift.events import (
+    get_events_silver_count,
+    valid_tables,
+)
+
+
+@pytest.fixture
+def dc_api(monkeypatch):
+    monkeypatch.setenv("EVENTS_COUNT_METRIC_NAME", "count")
+    monkeypatch.setenv("EVENTS_SILVER_COUNT_METRIC_NAME", "silver_count")
+
+    def query_dc_api(metric, query_params):
+        if query_params.get("project") == "broken":
+            raise Exception("boom")
+        response = mock.Mock()
+        response.json.return_value = {
+            "project": query_params["project"],
+            "table": query_params.get("table"),
+        }
+        return response
+
+    with mock.patch(
+        "weni_datalake_sdk.clients.redshift.events.query_dc_api",
+        side_effect=query_dc_api,
+    ) as patched:
+        yield patched
+
+
+def params(project):
+    return {"project": project, "date_start": "2025-01-01", "date_end": "2025-01-31"}
+
+
+class TestQueryMany:
+    def test_results_in_input_order(self):
+        def slow(delay, value):
+            time.sleep(delay)
+            return value
+
+        results = query_many(
+            slow, [{"delay": 0.05, "value": 1}, {"delay": 0, "value": 2}]
+        )
+
+        assert [r.result for r in results] == [1, 2]
+        assert [r.index for r in results] == [0, 1]
+
+    def test_as_completed(self):
+        release = threading.Event()
+
+        def wait(value):
+            if value == 1 and not release.wait(5):
+                raise Exception("not released")
+            return value
+
+        results = query_many(wait, [{"value": 1}, {"value": 2}], as_completed=True)
+        # The first query only ends once the second one was yielded.
+        first = next(results)
+        release.set()
+
+        assert [first.result] + [r.result for r in results] == [2, 1]
+
+    def test_worker_limit(self):
+        running, peak = [0], [0]
+        lock = threading.Lock()
+
+        def track():
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            time.sleep(0.01)
+            with lock:
+                running[0] -= 1
+
+        query_many(track, [{}] * 20, max_workers=3)
+
+        assert peak[0] <= 3
+
+    def test_empty(self):
+        assert query_many(mock.Mock(), []) == []
+
+
+class TestEventsFanOut:
+    def test_errors_are_isolated(self, dc_api):
+        results = get_events_count_many(
+            [params("a"), params("broken"), params("c")], max_workers=2
+        )
+
+        assert [r.ok for r in results] == [True, False, True]
+        assert results[0] == QueryResult(
+            0, params("a"), result={"project": "a", "table": None}
+        )
+        assert "boom" in str(results[1].error)
+        assert results[2].result["project"] == "c"
+
+    def test_validation_errors_are_isolated(self, dc_api):
+        results = get_events_count_many([params("a"), {"project": "b"}])
+
+        assert results[0].ok
+        assert str(results[1].error) == "Date start is required"
+
+    def test_every_silver_table(self, dc_api):
+        results = query_tables(get_events_silver_count, **params("a"))
+
+        assert list(results) == valid_tables
+        assert all(r.result["table"] == table for table, r in results.items())
+        assert dc_api.call_count == len(valid_tables)
+
+
+STATS_PARAMS = {"project": "p", "date_start": "2025-01-01", "date_end": "2025-01-31"}
+
+
+@pytest.fixture
+def stats_api(monkeypatch):
+    for name in ("count", "sum", "avg", "min", "max"):
+        monkeypatch.setenv(f"EVENTS_{name.upper()}_METRIC_NAME", name)
+    results = {
+        "count": {"count": 4},
+        "sum": {"sum": 10},
+        "avg": {"avg": 2.5},
+        "min": {"min": 1},
+        "max": {"max": 4},
+    }
+    threads = set()
+
+    def query_dc_api(metric, query_params):
+        threads.add(threading.current_thread().name)
+        response = mock.Mock()
+        response.json.return_value = results[metric]
+        return response
+
+    with mock.patch(
+        "weni_datalake_sdk.clients.redshift.events.query_dc_api",
+        side_effect=query_dc_api,
+    ) as patched:
+        patched.results = results
+        patched.threads = threads
+        yield patched
+
+
+class TestEventsStats:
+    def metrics(self, dc_api):
+        return sorted(call.kwargs["metric"] for call in dc_api.call_args_list)
+
+    def test_avg_is_derived_from_sum_and_count(self, stats_api):
+        stats = get_events_stats(**STATS_PARAMS)
+
+        assert stats == EventsStats(count=4, sum=10, avg=2.5, min=1, max=4)
+        assert self.metrics(stats_api) == ["count", "max", "min", "sum"]
+        assert all(name.startswith("datalake-query") for name in stats_api.threads)
+        for call in stats_api.call_args_list:
+            assert call.kwargs["query_params"] == STATS_PARAMS
+
+    def test_only_requested_aggregates(self, stats_api):
+        stats = get_events_stats(aggregates=["avg", "max"], **STATS_PARAMS)
+
+        assert stats == EventsStats(avg=2.5, max=4)
+        assert self.metrics(stats_api) == ["avg", "max"]
+
+    def test_single_aggregate_runs_inline(self, stats_api):
+        assert get_events_stats(aggregates=["min"], **STATS_PARAMS).min == 1
+        assert stats_api.threads == {threading.current_thread().name}
+
+    def test_no_events(self, stats_api):
+        stats_api.results.update(count={"count": 0}, sum={"sum": None})
+
+        stats = get_events_stats(aggregates=["count", "sum", "avg"], **STATS_PARAMS)
+
+        assert stats == EventsStats(count=0)
+        assert self.metrics(stats_api) == ["count", "sum"]
+
+    def test_grouped_results_query_avg(self, stats_api):
+        grouped = [{"value": "a", "count": 1}, {"value": "b", "count": 3}]
+        stats_api.results.update(count=grouped, sum=[{"value": "a", "sum": 2}])
+
+        stats = get_events_stats(aggregates=["count", "sum", "avg"], **STATS_PARAMS)
+
+        assert stats.count == grouped
+        assert stats.avg == 2.5
+        assert self.metrics(stats_api) == ["avg", "count", "sum"]
+
+    def test_grouped_avg_runs_alongside_other_queries(self, stats_api):
+        grouped = [{"value": "a", "count": 1}, {"value": "b", "count": 3}]
+        stats_api.results.update(count=grouped, sum=[{"value": "a", "sum": 2}])
+        avg_started = threading.Event()
+        query = stats_api.side_effect
+
+        def query_dc_api(metric, query_params):
+            if metric == "avg":
+                avg_started.set()
+            elif metric == "max" and not avg_started.wait(5):
+                raise Exception("avg was not queried while max was running")
+            return query(metric, query_params)
+
+        stats_api.side_effect = query_dc_api
+
+        stats = get_events_stats(**STATS_PARAMS)
+
+        assert stats.avg == 2.5
+        assert stats.max == 4
+        assert all(name.startswith("datalake-query") for name in stats_api.threads)
+
+    @pytest.mark.parametrize(
+        "kwargs, message",
+        [
+            (dict(STATS_PARAMS, aggregates=["median"]), "Aggregate is not valid"),
+            ({"date_start": "2025-01-01", "date_end": "2025-01-31"}, "Project"),
+        ],
+    )
+    def test_validation(self, stats_api, kwargs, message):
+        with pytest.raises(Exception, match=message):
+            get_events_stats(**kwargs)
+        stats_api.assert_not_called()
+
+    def test_errors_are_wrapped(self, stats_api):
+        stats_api.side_effect = Exception("boom")
+
+        with pytest.raises(
+            Exception, match="Error querying events stats: Error querying events"
+        ):
+            get_events_stats(**STATS_PARAMS)
@@ -0,0 +1,239 @@
+import threading
+from unittest import mock
+
+import pytest
+
+from weni_datalake_sdk.clients.batching import (
+    BatchingCommerceWebhookSender,
+    BatchingEventSender,
+    BatchingMessageTemplateSender,
+    BatchingTraceSender,
+)
+from weni_datalake_sdk.clients.channel_pool import close_channel_pool
+from weni_datalake_sdk.clients.policy import CallPolicy, configure_policy
+from weni_datalake_sdk.clients.reference_server import ReferenceServer
+from weni_datalake_sdk.paths.events_path import EventPath
+from weni_datalake_sdk.utils.exceptions import QueueFullError
+
+
+@pytest.fixture
+def server():
+    with ReferenceServer() as server:
+        yield server
+    close_channel_pool()
+
+
+def make_event(i=0):
+    return dict(
+        event_name="event1",
+        key="key1",
+        date="2024-01-01T00:00:00Z",
+        project="proj1",
+        contact_urn=f"urn{i}",
+        value="val1",
+        value_type="string",
+    )
+
+
+class TestBatchingEventSender:
+    def test_flush_on_max_records(self, server):
+        results = []
+        sender = BatchingEventSender(
+            max_records=10,
+            max_linger_ms=60000,
+            target=server.target,
+            on_batch=results.append,
+        )
+
+        futures = [sender.send(make_event(i)) for i in range(20)]
+
+        assert [future.result(timeout=5) for future in futures] == ["success"] * 20
+        sender.close()
+
+        assert server.events.calls["InsertEventBatch"] == 2
+        assert server.events.calls["InsertEventData"] == 0
+        assert [result.records for result in results] == [10, 10]
+        assert all(result.ok for result in results)
+        assert [record.contact_urn for record in server.events.records] == [
+            f"urn{i}" for i in range(20)
+        ]
+
+    def test_flush_on_linger(self, server):
+        sender = BatchingEventSender(
+            max_records=1000, max_linger_ms=10, target=server.target
+        )
+
+        future = sender.send(make_event())
+
+        assert future.result(timeout=5) == "success"
+        assert server.events.calls["InsertEventBatch"] == 1
+        sender.close()
+
+    def test_flush_on_max_bytes(self, server):
+        size = BatchingEventSender.build_request(None, make_event()).ByteSize()
+        results = []
+        sender = BatchingEventSender(
+            max_records=1000,
+            max_bytes=size * 3,
+            max_linger_ms=60000,
+            target=server.target,
+            on_batch=results.append,
+        )
+
+        futures = [sender.send(make_event()) for _ in range(6)]
+        for future in futures:
+            future.result(timeout=5)
+        sender.close()
+
+        assert [result.records for result in results] == [3, 3]
+        assert all(result.bytes <= size * 3 for result in results)
+
+    def test_close_flushes_pending_records(self, server):
+        sender = BatchingEventSender(
+            max_records=1000, max_linger_ms=60000, target=server.target
+        )
+        futures = [sender.send(make_event(i)) for i in range(5)]
+
+        sender.close()
+
+        assert all(future.done() for future in futures)
+        assert len(server.events.records) == 5
+        with pytest.raises(RuntimeError):
+            sender.send(make_event())
+
+    def test_cancelled_record_is_not_sent(self, server):
+        sender = BatchingEventSender(
+            max_records=1000, max_linger_ms=60000, target=server.target
+        )
+        cancelled = sender.send(make_event(0))
+        kept = sender.send(make_event(1))
+
+        assert cancelled.cancel()
+        sender.close()
+
+        assert kept.result() == "success"
+        assert [record.contact_urn for record in server.events.records] == ["urn1"]
+
+    def test_batch_error_is_set_on_every_future(self):
+        results = []
+        with mock.patch("weni_datalake_sdk.clients.batching.get_stub") as mock_get_stub:
+            mock_get_stub.return_value.InsertEventBatch.side_effect = Exception(
+                "unavailable"
+            )
+            sender = BatchingEventSender(
+                max_records=2,
+                max_linger_ms=60000,
+                target="localhost:1",
+                on_batch=results.append,
+            )
+            futures = [sender.send(make_event(i)) for i in range(2)]
+
+            for future in futures:
+                with pytest.raises(Exception, match="unavailable"):
+                    future.result(timeout=5)
+            sender.close()
+
+        assert len(results) == 1
+        assert not results[0].ok
+        assert str(results[0].error) == "unavailable"
+
+
+class TestBufferLimits:
+    @pytest.fixture
+    def stuck_stub(self):
+        """A stub whose batch RPC waits for `release` before answering."""
+        started = threading.Event()
+        release = threading.Event()
+
+        def insert(request, timeout=None):
+            started.set()
+            release.wait(5)
+            return mock.Mock(status="success")
+
+        with mock.patch("weni_datalake_sdk.clients.batching.get_stub") as get_stub:
+            get_stub.return_value.InsertEventBatch.side_effect = insert
+            yield get_stub.return_value, started, release
+            release.set()
+
+    def fill(self, started, **kwargs):
+        sender = BatchingEventSender(
+            max_records=1,
+            max_linger_ms=60000,
+            target="localhost:1",
+            max_buffered_records=2,
+            **kwargs,
+        )
+        futures = [sender.send(make_event(0))]
+        assert started.wait(5)
+        # The flusher is stuck sending the first record, these wait for it.
+        futures += [sender.send(make_event(i)) for i in (1, 2)]
+        return sender, futures
+
+    def test_full_buffer_rejects_after_block_timeout(self, stuck_stub):
+        _, started, release = stuck_stub
+        sender, futures = self.fill(started, block_timeout=0.05)
+
+        rejected = sender.send(make_event(3))
+
+        with pytest.raises(QueueFullError):
+            rejected.result(timeout=1)
+        assert sender.rejected == 1
+        release.set()
+        sender.close()
+        assert [future.result() for future in futures] == ["success"] * 3
+
+    def test_send_waits_for_room(self, stuck_stub):
+        _, started, release = stuck_stub
+        sender, futures = self.fill(started, block_timeout=5)
+
+        threading.Timer(0.05, release.set).start()
+        future = sender.send(make_event(3))
+        sender.close()
+
+        assert future.result() == "success"
+        assert sender.rejected == 0
+
+    def test_buffered_bytes_are_limited(self, stuck_stub):
+        _, started, _ = stuck_stub
+        size = BatchingEventSender.build_request(None, make_event()).ByteSize()
+        sender, _ = self.fill(started, max_buffered_bytes=size * 2, block_timeout=0.01)
+        sender.max_buffered_records = 100
+
+        with pytest.raises(QueueFullError):
+            sender.send(make_event(3)).result(timeout=1)
+
+    def test_batch_rpc_has_the_policy_deadline(self, stuck_stub):
+        stub, _, release = stuck_stub
+        release.set()
+        configure_policy(EventPath.get_table_name(), CallPolicy(timeout=1.5))
+        try:
+            with BatchingEventSender(target="localhost:1") as sender:
+                sender.send(make_event())
+        finally:
+            configure_policy(EventPath.get_table_name(), None)
+
+        assert stub.InsertEventBatch.call_args.kwargs["timeout"] == 1.5
+
+
+class TestOtherBatchingSenders:
+    def test_trace_sender(self, server):
+        with BatchingTraceSender(target=server.target) as sender:
+            sender.send({"project_uuid": "proj1", "receive": "Wow!"})
+
+        assert server.traces.calls["InsertTraceBatch"] == 1
+        assert server.traces.records[0].path == "traces"
+
+    def test_message_template_sender(self, server):
+        with BatchingMessageTemplateSender(target=server.target) as sender:
+            sender.send({"template_id": "template123", "content": "Olá!"})
+
+        assert server.message_templates.calls["InsertMessageTemplateBatch"] == 1
+        assert len(server.message_templates.records) == 1
+
+    def test_commerce_webhook_sender(self, server):
+        with BatchingCommerceWebhookSender(target=server.target) as sender:
+            future = sender.send({"data": {"foo": "bar"}, "project": "proj1"})
+
+        assert future.result() == "success"
+        assert server.commerce_webhooks.calls["InsertCommerceWebhookBatch"] == 1
+        assert server.commerce_webhooks.records[0].project == "proj1"
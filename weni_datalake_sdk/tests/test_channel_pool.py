@@ -0,0 +1,117 @@
+import threading
+from unittest import mock
+
+import pytest
+
+from weni_datalake_sdk.clients import channel_pool
+from weni_datalake_sdk.clients.channel_pool import (
+    ChannelPool,
+    close_channel_pool,
+    configure_channel_pool,
+    get_channel_pool,
+)
+
+
+@pytest.fixture
+def mock_grpc_channel():
+    with mock.patch(
+        "weni_datalake_sdk.clients.channel_pool.grpc.insecure_channel"
+    ) as mock_channel:
+        mock_channel.side_effect = lambda target, options=None: mock.Mock()
+        yield mock_channel
+    close_channel_pool()
+
+
+class TestChannelPool:
+    def test_channel_is_reused_per_target(self, mock_grpc_channel):
+        pool = ChannelPool(size=1)
+
+        first = pool.get_channel("localhost:50051")
+        second = pool.get_channel("localhost:50051")
+        other = pool.get_channel("localhost:50052")
+
+        assert first is second
+        assert first is not other
+        assert mock_grpc_channel.call_count == 2
+
+    def test_channels_are_handed_out_round_robin(self, mock_grpc_channel):
+        pool = ChannelPool(size=3)
+
+        channels = [pool.get_channel("localhost:50051") for _ in range(6)]
+
+        assert mock_grpc_channel.call_count == 3
+        assert channels[:3] == channels[3:]
+        assert len({id(channel) for channel in channels}) == 3
+
+    def test_stub_is_cached_per_channel_and_class(self, mock_grpc_channel):
+        pool = ChannelPool(size=1)
+        stub_class = mock.Mock(side_effect=lambda channel: mock.Mock())
+        other_stub_class = mock.Mock(side_effect=lambda channel: mock.Mock())
+
+        stub = pool.get_stub(stub_class, "localhost:50051")
+
+        assert pool.get_stub(stub_class, "localhost:50051") is stub
+        assert pool.get_stub(other_stub_class, "localhost:50051") is not stub
+        assert stub_class.call_count == 1
+
+    def test_options_are_passed_to_channel(self, mock_grpc_channel):
+        pool = ChannelPool(size=1, keepalive_time_ms=1000, max_message_length=1024)
+
+        pool.get_channel("localhost:50051")
+
+        options = dict(mock_grpc_channel.call_args.kwargs["options"])
+        assert options["grpc.keepalive_time_ms"] == 1000
+        assert options["grpc.max_send_message_length"] == 1024
+        assert options["grpc.max_receive_message_length"] == 1024
+
+    def test_close_closes_channels(self, mock_grpc_channel):
+        pool = ChannelPool(size=2)
+        channels = [pool.get_channel("localhost:50051") for _ in range(2)]
+
+        pool.close()
+
+        for channel in channels:
+            channel.close.assert_called_once()
+        assert pool.get_channel("localhost:50051") not in channels
+
+    def test_reopens_channels_after_fork(self, mock_grpc_channel):
+        pool = ChannelPool(size=1)
+        channel = pool.get_channel("localhost:50051")
+
+        with mock.patch.object(channel_pool.os, "getpid", return_value=-1):
+            assert pool.get_channel("localhost:50051") is not channel
+
+    def test_concurrent_access_opens_one_channel(self, mock_grpc_channel):
+        pool = ChannelPool(size=1)
+        results = []
+
+        def worker():
+            results.append(pool.get_channel("localhost:50051"))
+
+        threads = [threading.Thread(target=worker) for _ in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert mock_grpc_channel.call_count == 1
+        assert all(result is results[0] for result in results)
+
+    def test_invalid_size(self):
+        with pytest.raises(ValueError):
+            ChannelPool(size=0)
+
+
+class TestGlobalChannelPool:
+    def test_get_channel_pool_is_singleton(self, mock_grpc_channel):
+        assert get_channel_pool() is get_channel_pool()
+
+    def test_configure_replaces_and_closes_previous(self, mock_grpc_channel):
+        previous = get_channel_pool()
+        channel = previous.get_channel("localhost:50051")
+
+        pool = configure_channel_pool(size=2)
+
+        assert pool is get_channel_pool()
+        assert pool.size == 2
+        channel.close.assert_called_once()
@@ -2,6 +2,7 @@ from unittest import mock
 
 import pytest
 
+from weni_datalake_sdk.clients.channel_pool import close_channel_pool
 from weni_datalake_sdk.clients.client import (
     send_data,
     send_event_data,
@@ -62,6 +63,7 @@ def mock_grpc_stub_message_templates():
 def mock_grpc_channel():
     with mock.patch("grpc.insecure_channel") as mock_channel:
         yield mock_channel
+    close_channel_pool()
 
 
 class TestSendData:
@@ -141,3 +143,18 @@ class TestSendEventData:
         send_event_data(EventPath, event_instance)
 
         mock_stub_instance.InsertEventData.assert_called_once()
+
+
+class TestChannelReuse:
+    def test_send_event_data_reuses_channel(
+        self, mock_grpc_stub_events, mock_grpc_channel
+    ):
+        mock_stub_instance = mock_grpc_stub_events.return_value
+        mock_stub_instance.InsertEventData.return_value.status = "success"
+
+        for _ in range(3):
+            send_event_data(EventPath, dict(event_name="event1", project="proj1"))
+
+        assert mock_grpc_channel.call_count == 1
+        assert mock_grpc_stub_events.call_count == 1
+        assert mock_stub_instance.InsertEventData.call_count == 3
@@ -0,0 +1,162 @@
+import json
+import math
+import tracemalloc
+from unittest import mock
+
+import pytest
+
+from weni_datalake_sdk.clients.redshift import columns
+from weni_datalake_sdk.clients.redshift.columns import DictColumn, to_columns
+from weni_datalake_sdk.clients.redshift.events import (
+    get_events,
+    get_events_silver,
+)
+
+ROWS = [
+    {"project": "p1", "event_name": "e", "count": 1, "score": 0.5, "ok": True},
+    {"project": "p2", "event_name": "e", "count": 2, "score": 1, "ok": False},
+    {"project": "p1", "event_name": "f", "count": 3, "score": None, "ok": True},
+]
+
+
+@pytest.fixture(params=["numpy", "array"])
+def backend(request, monkeypatch):
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(columns, "numpy", None)
+    return request.param
+
+
+class TestToColumns:
+    def test_columns(self, backend):
+        result = to_columns(ROWS)
+
+        assert list(result["count"]) == [1, 2, 3]
+        assert list(result["score"])[:2] == [0.5, 1.0]
+        assert math.isnan(result["score"][2])
+        assert list(result["ok"]) == [True, False, True]
+        assert result["project"].categories == ["p1", "p2"]
+        assert list(result["project"].codes) == [0, 1, 0]
+        assert result["event_name"].to_list() == ["e", "e", "f"]
+        assert result["project"].value_counts() == {"p1": 2, "p2": 1}
+
+    def test_numpy_arrays(self):
+        numpy = pytest.importorskip("numpy")
+
+        result = to_columns(ROWS)
+
+        assert result["count"].dtype == numpy.int64
+        assert result["score"].dtype == numpy.float64
+        assert result["ok"].dtype == numpy.bool_
+        assert result["project"].codes.dtype == numpy.int32
+        assert result["count"].sum() == 6
+
+    def test_missing_fields_and_nulls(self, backend):
+        result = to_columns([{"a": 1}, {"a": None, "b": "x"}, {"c": None}])
+
+        assert math.isnan(result["a"][1]) and math.isnan(result["a"][2])
+        assert result["a"][0] == 1
+        assert result["b"].to_list() == [None, "x", None]
+        assert result["b"].value_counts() == {"x": 1}
+        assert list(result["c"]) == [None, None, None]
+
+    def test_mixed_values_fall_back_to_lists(self, backend):
+        result = to_columns(
+            [
+                {"a": "x", "b": 1, "c": {"k": 1}, "d": 1},
+                {"a": 2, "b": 2**70, "c": {"k": 2}, "d": True},
+            ]
+        )
+
+        assert result["a"] == ["x", 2]
+        assert result["b"] == [1, 2**70]
+        assert result["c"] == [{"k": 1}, {"k": 2}]
+        assert result["d"] == [1, True]
+
+    def test_empty(self):
+        assert to_columns([]) == {}
+
+    def test_dict_column(self):
+        column = DictColumn([1, -1, 0], ["a", "b"])
+
+        assert len(column) == 3
+        assert column[0] == "b"
+        assert column[1] is None
+
+    def test_uses_less_memory_than_rows(self, backend):
+        text = json.dumps(
+            [
+                {
+                    "project": "68c84e84-2d7d-4dc7-8193-50d0e2321b2e",
+                    "event_name": "weni_nexus_data",
+                    "key": "topics",
+                    "value": f"topic-{i % 10}",
+                    "count": i,
+                    "score": i / 3,
+                }
+                for i in range(10000)
+            ]
+        )
+
+        def size(build):
+            tracemalloc.start()
+            try:
+                result = build()  # noqa: F841
+                return tracemalloc.get_traced_memory()[0]
+            finally:
+                tracemalloc.stop()
+
+        rows = size(lambda: json.loads(text))
+        columnar = size(lambda: to_columns(iter(json.loads(text))))
+        assert columnar * 5 < rows
+
+
+PARAMS = {"project": "p", "date_start": "2025-01-01", "date_end": "2025-01-31"}
+
+
+class TestColumnarEvents:
+    def response(self):
+        response = mock.Mock()
+        response.iter_content.return_value = [
+            json.dumps([{"event_name": '"a"', "value": 1}, {"value": 2}]).encode()
+        ]
+        return response
+
+    def test_get_events(self, monkeypatch):
+        monkeypatch.setenv("EVENTS_METRIC_NAME", "events")
+        response = self.response()
+
+        with mock.patch(
+            "weni_datalake_sdk.clients.redshift.events.query_dc_api",
+            return_value=response,
+        ) as query_dc_api:
+            result = get_events(format="columnar", **PARAMS)
+
+        query_dc_api.assert_called_once_with(
+            metric="events", query_params=PARAMS, stream=True
+        )
+        assert result["event_name"].to_list() == ["a", None]
+        assert list(result["value"]) == [1, 2]
+        response.close.assert_called_once()
+
+    def test_get_events_silver(self):
+        with mock.patch(
+            "weni_datalake_sdk.clients.redshift.events.query_dc_api",
+            return_value=self.response(),
+        ):
+            result = get_events_silver(format="columnar", table="topics", **PARAMS)
+
+        assert list(result["value"]) == [1, 2]
+
+    def test_invalid_format(self):
+        with pytest.raises(Exception, match="Format is not valid"):
+            get_events(format="csv", **PARAMS)
+
+    def test_errors_are_wrapped(self):
+        with mock.patch(
+            "weni_datalake_sdk.clients.redshift.events.query_dc_api",
+            side_effect=Exception("boom"),
+        ):
+            with pytest.raises(Exception, match="Error querying events: boom"):
+                get_events(format="columnar", **PARAMS)
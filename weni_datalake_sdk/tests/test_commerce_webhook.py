@@ -2,6 +2,7 @@ from unittest import mock
 
 import pytest
 
+from weni_datalake_sdk.clients.channel_pool import close_channel_pool
 from weni_datalake_sdk.clients.client import send_commerce_webhook_data
 from weni_datalake_sdk.paths.commerce_webhook import CommerceWebhookPath
 
@@ -73,11 +74,12 @@ def test_send_commerce_webhook_data_variations(event_data_func):
     with mock.patch(
         "weni_datalake_sdk.clients.client.commerce_webhook_pb2_grpc.CommerceWebhookServiceStub"
     ) as mock_stub, mock.patch(
-        "weni_datalake_sdk.clients.client.grpc.insecure_channel"
+        "weni_datalake_sdk.clients.channel_pool.grpc.insecure_channel"
     ) as mock_channel:
         mock_instance = mock.Mock()
         mock_instance.InsertCommerceWebhookData.return_value.status = "ok"
         mock_stub.return_value = mock_instance
         mock_channel.return_value = mock.Mock()  # Prevents real channel creation
         result = send_commerce_webhook_data(CommerceWebhookPath, event_data)
+        close_channel_pool()
         assert result == "ok"
@@ -0,0 +1,179 @@
+import time
+from datetime import datetime, timezone
+
+from weni_datalake_sdk.clients import client, events_pb2
+from weni_datalake_sdk.clients.channel_pool import close_channel_pool
+from weni_datalake_sdk.clients.client import send_event_data
+from weni_datalake_sdk.clients.converters import (
+    build_event_request,
+    parse_timestamp,
+)
+from weni_datalake_sdk.clients.reference_server import ReferenceServer
+from weni_datalake_sdk.paths.events_path import EventPath
+
+
+class TestBuildEventRequest:
+    def test_fields(self):
+        request = build_event_request(
+            {
+                "event_name": "weni_nexus_data",
+                "key": "topics",
+                "value": "topic-1",
+                "value_type": "STRING",
+                "date": "2025-06-03T10:00:00Z",
+                "project": "proj1",
+                "contact_urn": "whatsapp:+5582999999999",
+                "metadata": {"topic_uuid": "uuid-1", "count": 2},
+            }
+        )
+
+        assert request.event_name == "weni_nexus_data"
+        assert request.key == "topics"
+        assert request.project == "proj1"
+        assert request.contact_urn == "whatsapp:+5582999999999"
+        assert request.value_type == events_pb2.VALUE_TYPE_STRING
+        assert request.value.string_value == "topic-1"
+        assert request.date.ToDatetime(timezone.utc) == datetime(
+            2025, 6, 3, 10, tzinfo=timezone.utc
+        )
+        assert dict(request.metadata) == {"topic_uuid": "uuid-1", "count": 2}
+
+    def test_missing_and_none_fields(self):
+        request = build_event_request({"event_name": "event1", "contact_urn": None})
+
+        assert request.contact_urn == ""
+        assert request.key == ""
+        assert request.value_type == events_pb2.VALUE_TYPE_STRING
+        assert not request.HasField("metadata")
+
+    def test_date_with_offset_is_converted_to_utc(self):
+        request = build_event_request({"date": "2025-06-03T07:00:00.5-03:00"})
+
+        assert request.date.ToDatetime(timezone.utc) == datetime(
+            2025, 6, 3, 10, 0, 0, 500000, tzinfo=timezone.utc
+        )
+
+    def test_invalid_or_missing_date_uses_current_time(self):
+        before = int(time.time())
+
+        for data in ({"date": "yesterday"}, {}, {"date": datetime.now()}):
+            assert build_event_request(data).date.seconds >= before
+
+    def test_unknown_value_type_defaults_to_string(self):
+        request = build_event_request({"value_type": "float"})
+
+        assert request.value_type == events_pb2.VALUE_TYPE_STRING
+
+
+class TestParseTimestamp:
+    def test_repeated_timestamps_are_memoized(self):
+        parse_timestamp.cache_clear()
+
+        for _ in range(3):
+            parse_timestamp("2025-06-03T10:00:00Z")
+
+        info = parse_timestamp.cache_info()
+        assert (info.hits, info.misses) == (2, 1)
+
+    def test_invalid_timestamp(self):
+        assert parse_timestamp("not a date") is None
+
+
+class TestTypedValue:
+    def test_int_value(self):
+        request = build_event_request({"value": "42", "value_type": "int"})
+
+        assert request.value.WhichOneof("value") == "int_value"
+        assert request.value.int_value == 42
+        assert request.value_type == events_pb2.VALUE_TYPE_INT
+
+    def test_bool_value(self):
+        for value, expected in (
+            (True, True),
+            ("false", False),
+            ("True", True),
+            (0, False),
+        ):
+            request = build_event_request({"value": value, "value_type": "bool"})
+
+            assert request.value.WhichOneof("value") == "bool_value"
+            assert request.value.bool_value is expected
+
+    def test_list_value(self):
+        request = build_event_request({"value": ["a", 1], "value_type": "list"})
+
+        assert request.value.WhichOneof("value") == "list_value"
+        assert list(request.value.list_value.values) == ["a", "1"]
+
+    def test_string_value(self):
+        request = build_event_request({"value": 10, "value_type": "string"})
+
+        assert request.value.string_value == "10"
+
+    def test_missing_value_is_an_empty_string(self):
+        for value_type in ("string", "int", "bool", "list"):
+            request = build_event_request({"value": None, "value_type": value_type})
+
+            assert request.value.WhichOneof("value") == "string_value"
+            assert request.value.string_value == ""
+
+    def test_unconvertible_value_falls_back_to_string(self, caplog):
+        request = build_event_request(
+            {"event_name": "e1", "value": "abc", "value_type": "int"}
+        )
+
+        assert request.value_type == events_pb2.VALUE_TYPE_STRING
+        assert request.value.string_value == "abc"
+        assert "Sending the value of event 'e1' as a string" in caplog.text
+
+    def test_inexact_values_fall_back_to_string(self):
+        for value, value_type, expected in (
+            (3.7, "int", "3.7"),
+            (True, "int", "True"),
+            ("3.7", "int", "3.7"),
+            ("abc", "bool", "abc"),
+            (2, "bool", "2"),
+            ({"a": 1}, "list", "{'a': 1}"),
+            ("a", "list", "a"),
+        ):
+            request = build_event_request({"value": value, "value_type": value_type})
+
+            assert request.value_type == events_pb2.VALUE_TYPE_STRING
+            assert request.value.string_value == expected
+
+    def test_integral_values_are_ints(self):
+        for value in (3, 3.0, "3", " 3 "):
+            request = build_event_request({"value": value, "value_type": "int"})
+
+            assert request.value.int_value == 3
+            assert request.value_type == events_pb2.VALUE_TYPE_INT
+
+    def test_tuple_is_a_list(self):
+        request = build_event_request({"value": ("a", 1), "value_type": "list"})
+
+        assert list(request.value.list_value.values) == ["a", "1"]
+
+    def test_int_is_smaller_than_its_string(self):
+        typed = build_event_request({"value": 123456789, "value_type": "int"}).value
+        as_string = events_pb2.ValueData(string_value="123456789")
+
+        assert typed.ByteSize() < as_string.ByteSize()
+
+    def test_round_trip(self, monkeypatch):
+        events = [
+            {"event_name": "e1", "value": 7, "value_type": "int"},
+            {"event_name": "e2", "value": "true", "value_type": "bool"},
+            {"event_name": "e3", "value": ["x", "y"], "value_type": "list"},
+            {"event_name": "e4", "value": "text", "value_type": "string"},
+        ]
+        with ReferenceServer() as server:
+            monkeypatch.setattr(client, "SERVER_ADDRESS", server.target)
+            for event in events:
+                send_event_data(EventPath, event)
+        close_channel_pool()
+
+        values = [record.value for record in server.events.records]
+        assert values[0].int_value == 7
+        assert values[1].bool_value is True
+        assert list(values[2].list_value.values) == ["x", "y"]
+        assert values[3].string_value == "text"
@@ -1,3 +1,4 @@
+import json
 from unittest import mock
 
 import pytest
@@ -18,6 +19,8 @@ from weni_datalake_sdk.clients.redshift.events import (
     get_events_silver_unique_contact_urns,
     get_events_sum,
     get_events_unique_contact_urns,
+    json_clean,
+    loads_clean,
 )
 
 
@@ -41,6 +44,48 @@ class TestCleanQuotes:
     def test_clean_quotes_int(self):
         assert clean_quotes(123) == 123
 
+    def test_clean_quotes_deep_input(self):
+        obj = '"x"'
+        for _ in range(5000):
+            obj = [{"a": obj}]
+
+        result = clean_quotes(obj)
+        for _ in range(5000):
+            result = result[0]["a"]
+        assert result == "x"
+
+    @pytest.mark.parametrize(
+        "data",
+        [
+            {"a": '"value"', "b": 2, "c": {"d": '"inner"'}, "e": [['"x"'], 1]},
+            ['"foo"', "bar", 1, {"a": '"baz"', "b": [{"c": '"d"'}]}, None],
+            '"quoted"',
+            '"',
+            123,
+        ],
+    )
+    def test_loads_clean_matches_clean_quotes(self, data):
+        assert loads_clean(json.dumps(data)) == clean_quotes(data)
+
+    def test_loads_clean_deep_input(self):
+        depth = 5000
+        text = '[{"a": ' * depth + '"\\"x\\""' + "}]" * depth
+
+        result = loads_clean(text)
+        for _ in range(depth):
+            result = result[0]["a"]
+        assert result == "x"
+
+    def test_json_clean_deep_input(self):
+        depth = 5000
+        response = mock.Mock(text='[{"a": ' * depth + '"\\"x\\""' + "}]" * depth)
+        response.json.side_effect = lambda **kwargs: json.loads(response.text, **kwargs)
+
+        result = json_clean(response)
+        for _ in range(depth):
+            result = result[0]["a"]
+        assert result == "x"
+
 
 class TestGetEvents:
     @pytest.fixture
@@ -0,0 +1,209 @@
+import importlib
+import threading
+from unittest import mock
+
+import pytest
+
+from weni_datalake_sdk.clients import client, executor as executor_module
+from weni_datalake_sdk.clients.client import (
+    SPOOLED_STATUS,
+    send_event_data,
+    send_event_data_async,
+    spill_to_spool,
+)
+from weni_datalake_sdk.clients.executor import BoundedExecutor
+from weni_datalake_sdk.clients.spool import Spool
+from weni_datalake_sdk.paths.events_path import EventPath
+from weni_datalake_sdk.utils.exceptions import QueueFullError
+
+
+@pytest.fixture
+def blocked_executor():
+    """Executor whose single worker is stuck until `release` is set."""
+    release = threading.Event()
+    started = threading.Event()
+
+    def block():
+        started.set()
+        release.wait()
+        return "blocked"
+
+    def make(**kwargs):
+        executor = BoundedExecutor(max_workers=1, queue_size=2, **kwargs)
+        executor.submit(block)
+        started.wait(5)
+        return executor
+
+    yield make, release
+    release.set()
+
+
+class TestBoundedExecutor:
+    def test_runs_tasks(self):
+        executor = BoundedExecutor(max_workers=2, queue_size=10)
+
+        futures = [executor.submit(pow, i, 2) for i in range(10)]
+
+        assert [future.result(timeout=5) for future in futures] == [
+            i**2 for i in range(10)
+        ]
+        executor.shutdown()
+        assert executor.stats()["submitted"] == 10
+
+    def test_burst_after_idle_period_uses_every_worker(self):
+        executor = BoundedExecutor(max_workers=5, queue_size=10)
+        executor.submit(int).result(timeout=5)
+        # The first worker is now idle; every task below must run at once.
+        barrier = threading.Barrier(5, timeout=2)
+
+        futures = [executor.submit(barrier.wait) for _ in range(5)]
+
+        assert sorted(future.result(timeout=5) for future in futures) == [
+            0,
+            1,
+            2,
+            3,
+            4,
+        ]
+        assert executor.stats()["workers"] == 5
+        executor.shutdown()
+
+    def test_task_exception_is_set_on_future(self):
+        executor = BoundedExecutor(max_workers=1, queue_size=1)
+
+        future = executor.submit(int, "not a number")
+
+        with pytest.raises(ValueError):
+            future.result(timeout=5)
+        executor.shutdown()
+
+    def test_block_policy_rejects_after_timeout(self, blocked_executor):
+        make, release = blocked_executor
+        executor = make(overflow_policy="block", block_timeout=0.05)
+        queued = [executor.submit(str, i) for i in range(2)]
+
+        rejected = executor.submit(str, 3)
+
+        with pytest.raises(QueueFullError):
+            rejected.result(timeout=5)
+        assert executor.stats()["rejected"] == 1
+        assert executor.queue_depth == 2
+
+        release.set()
+        assert [future.result(timeout=5) for future in queued] == ["0", "1"]
+
+    def test_block_policy_waits_for_room(self, blocked_executor):
+        make, release = blocked_executor
+        executor = make(overflow_policy="block", block_timeout=5)
+        for i in range(2):
+            executor.submit(str, i)
+
+        threading.Timer(0.05, release.set).start()
+        future = executor.submit(str, 3)
+
+        assert future.result(timeout=5) == "3"
+        assert executor.stats()["rejected"] == 0
+
+    def test_drop_oldest_policy(self, blocked_executor):
+        make, release = blocked_executor
+        executor = make(overflow_policy="drop_oldest")
+        oldest, kept = executor.submit(str, 1), executor.submit(str, 2)
+
+        newest = executor.submit(str, 3)
+
+        with pytest.raises(QueueFullError):
+            oldest.result(timeout=5)
+        release.set()
+        assert kept.result(timeout=5) == "2"
+        assert newest.result(timeout=5) == "3"
+        assert executor.stats()["rejected"] == 1
+
+    def test_drop_newest_policy(self, blocked_executor):
+        make, release = blocked_executor
+        executor = make(overflow_policy="drop_newest")
+        queued = [executor.submit(str, i) for i in range(2)]
+
+        newest = executor.submit(str, 3)
+
+        with pytest.raises(QueueFullError):
+            newest.result(timeout=5)
+        release.set()
+        assert [future.result(timeout=5) for future in queued] == ["0", "1"]
+
+    def test_spill_policy(self, blocked_executor):
+        make, release = blocked_executor
+        spill = mock.Mock(return_value="spilled")
+        executor = make(overflow_policy="spill", spill=spill)
+        for i in range(2):
+            executor.submit(str, i)
+
+        future = executor.submit(str, 3, extra=True)
+
+        assert future.result(timeout=5) == "spilled"
+        spill.assert_called_once_with(str, (3,), {"extra": True})
+        assert executor.stats()["spilled"] == 1
+
+    def test_invalid_policy(self):
+        with pytest.raises(ValueError):
+            BoundedExecutor(overflow_policy="unbounded")
+
+        with pytest.raises(ValueError):
+            BoundedExecutor(overflow_policy="spill")
+
+    @pytest.mark.parametrize("policy", ["block", "drop_oldest", "drop_newest"])
+    def test_queue_size_must_be_positive(self, policy):
+        with pytest.raises(ValueError, match="Queue size must be at least 1"):
+            BoundedExecutor(queue_size=0, overflow_policy=policy)
+
+    def test_submit_after_shutdown(self):
+        executor = BoundedExecutor()
+        executor.shutdown()
+
+        with pytest.raises(RuntimeError):
+            executor.submit(str, 1)
+
+    def test_max_workers_from_env_is_int(self, monkeypatch):
+        monkeypatch.setenv("DATALAKE_MAXIMUN_WORKERS", "3")
+
+        module = importlib.reload(executor_module)
+
+        assert module.DATALAKE_MAXIMUN_WORKERS == 3
+        monkeypatch.delenv("DATALAKE_MAXIMUN_WORKERS")
+        importlib.reload(executor_module)
+
+
+class TestClientExecutor:
+    def test_async_functions_share_executor(self):
+        assert client.EVENT_EXECUTOR is client.EXECUTOR
+        assert client.MESSAGE_TEMPLATE_EXECUTOR is client.EXECUTOR
+        assert client.MESSAGE_TEMPLATE_STATUS_EXECUTOR is client.EXECUTOR
+
+    def test_send_event_data_async(self):
+        with mock.patch(
+            "weni_datalake_sdk.clients.client.send_event_data", return_value="ok"
+        ) as mock_send:
+            future = send_event_data_async(EventPath, {"event_name": "event1"})
+
+            assert future.result(timeout=5) == "ok"
+            mock_send.assert_called_once_with(EventPath, {"event_name": "event1"})
+
+    def test_spill_to_spool(self, tmp_path):
+        spool = Spool(str(tmp_path))
+        with mock.patch(
+            "weni_datalake_sdk.clients.client.get_spool", return_value=spool
+        ):
+            status = spill_to_spool(
+                send_event_data, (EventPath, {"event_name": "event1"}), {}
+            )
+
+        assert status == SPOOLED_STATUS
+        (segment,) = spool.sealed_segments()
+        ((_, method, _),) = list(spool.read(segment))
+        assert method == client.METHOD_PATHS["InsertEventData"]
+
+    def test_spill_without_spool_raises(self):
+        with mock.patch(
+            "weni_datalake_sdk.clients.client.get_spool", return_value=None
+        ):
+            with pytest.raises(QueueFullError):
+                spill_to_spool(send_event_data, (EventPath, {}), {})
@@ -0,0 +1,166 @@
+import threading
+from concurrent.futures import Future, wait
+from unittest import mock
+
+import grpc
+import pytest
+
+from weni_datalake_sdk.clients import client
+from weni_datalake_sdk.clients.channel_pool import close_channel_pool
+from weni_datalake_sdk.clients.client import (
+    SPOOLED_STATUS,
+    send_commerce_webhook_data_future,
+    send_event_data_async,
+    send_event_data_future,
+    send_message_template_data_future,
+    send_message_template_status_data_future,
+    send_trace_data_future,
+)
+from weni_datalake_sdk.clients.policy import (
+    CallPolicy,
+    RetryBudget,
+    call_future_with_policy,
+)
+from weni_datalake_sdk.clients.reference_server import ReferenceServer
+from weni_datalake_sdk.clients.spool import Spool
+from weni_datalake_sdk.paths.commerce_webhook import CommerceWebhookPath
+from weni_datalake_sdk.paths.events_path import EventPath
+from weni_datalake_sdk.paths.message_template_path import MessageTemplatePath
+from weni_datalake_sdk.paths.message_template_status_path import (
+    MessageTemplateStatusPath,
+)
+from weni_datalake_sdk.paths.trace_path import TracePath
+from weni_datalake_sdk.tests.helpers import RpcError
+from weni_datalake_sdk.utils.exceptions import ValidationError
+
+
+@pytest.fixture
+def server(monkeypatch):
+    with ReferenceServer() as server:
+        monkeypatch.setattr(client, "SERVER_ADDRESS", server.target)
+        yield server
+        close_channel_pool()
+
+
+class TestSendFuture:
+    def test_send_event_data_future(self, server):
+        future = send_event_data_future(EventPath, {"event_name": "event1"})
+
+        assert future.result(timeout=5) == "success"
+        assert server.events.records[0].event_name == "event1"
+
+    def test_many_inserts_in_flight(self, server):
+        futures = [
+            send_event_data_future(EventPath, {"event_name": f"event{i}"})
+            for i in range(500)
+        ]
+
+        done, not_done = wait(futures, timeout=10)
+
+        assert not not_done
+        assert {future.result() for future in done} == {"success"}
+        assert len(server.events.records) == 500
+
+    def test_callback(self, server):
+        called = threading.Event()
+        results = []
+
+        def callback(future):
+            results.append(future.result())
+            called.set()
+
+        send_event_data_future(EventPath, {"event_name": "event1"}, callback=callback)
+
+        assert called.wait(5)
+        assert results == ["success"]
+
+    def test_other_paths(self, server):
+        futures = [
+            send_trace_data_future(TracePath, {"event_name": "trace1"}),
+            send_message_template_data_future(MessageTemplatePath, {"a": "b"}),
+            send_message_template_status_data_future(
+                MessageTemplateStatusPath, {"a": "b"}
+            ),
+            send_commerce_webhook_data_future(CommerceWebhookPath, {"status": 200}),
+        ]
+
+        assert [future.result(timeout=5) for future in futures] == ["success"] * 4
+        assert len(server.traces.records) == 1
+        assert len(server.message_templates.records) == 2
+        assert len(server.commerce_webhooks.records) == 1
+
+    def test_validation_error_is_set_on_future(self):
+        invalid_path = mock.Mock(get_table_name=mock.Mock(return_value="invalid"))
+
+        future = send_event_data_future(invalid_path, {})
+
+        with pytest.raises(ValidationError):
+            future.result(timeout=5)
+
+    def test_async_uses_future_mode(self, server, monkeypatch):
+        monkeypatch.setattr(client, "DATALAKE_ASYNC_MODE", client.FUTURE_MODE)
+
+        with mock.patch.object(client.EVENT_EXECUTOR, "submit") as submit:
+            future = send_event_data_async(EventPath, {"event_name": "event1"})
+
+            assert future.result(timeout=5) == "success"
+            submit.assert_not_called()
+
+    def test_unavailable_is_spooled(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(client, "SERVER_ADDRESS", "localhost:1")
+        spool = Spool(str(tmp_path))
+        with mock.patch(
+            "weni_datalake_sdk.clients.client.get_spool", return_value=spool
+        ), mock.patch(
+            "weni_datalake_sdk.clients.client.get_policy",
+            return_value=CallPolicy(max_attempts=1, timeout=1),
+        ):
+            future = send_event_data_future(EventPath, {"event_name": "event1"})
+
+            assert future.result(timeout=5) == SPOOLED_STATUS
+        assert spool.size > 0
+        close_channel_pool()
+
+
+class TestCallFutureWithPolicy:
+    def make_method(self, outcomes):
+        futures = []
+        for outcome in outcomes:
+            future = Future()
+            if isinstance(outcome, Exception):
+                future.set_exception(outcome)
+            else:
+                future.set_result(outcome)
+            futures.append(future)
+        method = mock.Mock()
+        method.future.side_effect = futures
+        return method
+
+    def test_retries_in_background(self):
+        method = self.make_method([RpcError(grpc.StatusCode.UNAVAILABLE), "ok"])
+
+        future = call_future_with_policy(
+            method, "req", CallPolicy(initial_backoff=0.01), RetryBudget()
+        )
+
+        assert future.result(timeout=5) == "ok"
+        assert method.future.call_count == 2
+
+    def test_non_retryable_error(self):
+        method = self.make_method([RpcError(grpc.StatusCode.INVALID_ARGUMENT)])
+
+        future = call_future_with_policy(method, "req", CallPolicy(), RetryBudget())
+
+        with pytest.raises(grpc.RpcError):
+            future.result(timeout=5)
+        method.future.assert_called_once_with("req", timeout=CallPolicy().timeout)
+
+    def test_cancel_cancels_call(self):
+        call = Future()
+        method = mock.Mock()
+        method.future.return_value = call
+
+        future = call_future_with_policy(method, "req", CallPolicy(), RetryBudget())
+
+        assert future.cancel()
+        assert call.cancelled()
@@ -0,0 +1,109 @@
+import os
+from unittest import mock
+
+import pytest
+import requests_mock
+
+from weni_datalake_sdk.clients import http
+from weni_datalake_sdk.clients.dl_manager_client import DLManagerClient
+from weni_datalake_sdk.clients.http import (
+    close_session,
+    configure_session,
+    create_session,
+    get_session,
+)
+from weni_datalake_sdk.paths.events_path import EventPath
+from weni_datalake_sdk.tests import helpers
+from weni_datalake_sdk.utils.exceptions import DLManagerError
+
+
+class Handler(helpers.Handler):
+    connections = set()
+
+    def do_GET(self):
+        self.connections.add(self.client_address)
+        self.send_json(
+            {"headers": dict(self.headers)}, headers={"Set-Cookie": "session=abc"}
+        )
+
+
+@pytest.fixture
+def server():
+    Handler.connections = set()
+    with helpers.http_server(Handler) as url:
+        yield url
+    close_session()
+
+
+class TestSession:
+    def test_connections_are_reused(self, server):
+        session = get_session()
+
+        for _ in range(5):
+            assert session.get(f"{server}/events").status_code == 200
+
+        assert len(Handler.connections) == 1
+
+    def test_headers(self, server):
+        headers = get_session().get(server).json()["headers"]
+
+        assert headers["Accept-Encoding"] == "gzip, deflate"
+        assert headers["Connection"] == "keep-alive"
+
+    def test_cookies_are_not_kept(self, server):
+        session = get_session()
+        session.get(server)
+
+        assert len(session.cookies) == 0
+
+    def test_pool_size(self):
+        session = create_session(pool_connections=2, pool_maxsize=7)
+
+        adapter = session.get_adapter("https://example.com")
+        assert adapter._pool_connections == 2
+        assert adapter._pool_maxsize == 7
+
+    def test_session_is_shared(self):
+        assert get_session() is get_session()
+        close_session()
+
+    def test_new_session_after_fork(self):
+        session = get_session()
+
+        with mock.patch.object(http.os, "getpid", return_value=os.getpid() + 1):
+            assert get_session() is not session
+        close_session()
+
+    def test_configure_replaces_and_closes_previous(self):
+        previous = get_session()
+
+        with mock.patch.object(previous, "close") as close:
+            session = configure_session(pool_maxsize=3)
+
+        close.assert_called_once()
+        assert get_session() is session
+        close_session()
+
+
+class TestDLManagerClient:
+    BASE_URL = "https://dl-manager.example.com/api"
+
+    def test_insert_uses_shared_session(self):
+        client = DLManagerClient(base_url=self.BASE_URL)
+
+        with requests_mock.Mocker(session=get_session()) as m:
+            m.post(f"{self.BASE_URL}/events/send", json={"status": "ok"})
+
+            assert client.insert(EventPath, {"event_name": "e"}) == {"status": "ok"}
+            assert m.last_request.json() == {"data": {"event_name": "e"}}
+        close_session()
+
+    def test_insert_error(self):
+        session = create_session()
+        client = DLManagerClient(base_url=self.BASE_URL, session=session)
+
+        with requests_mock.Mocker(session=session) as m:
+            m.post(f"{self.BASE_URL}/events/send", status_code=500)
+
+            with pytest.raises(DLManagerError):
+                client.insert(EventPath, {})
@@ -0,0 +1,201 @@
+import json
+import tracemalloc
+from unittest import mock
+
+import pytest
+
+from weni_datalake_sdk.clients.http import close_session
+from weni_datalake_sdk.clients.redshift.events import (
+    get_events,
+    get_events_silver,
+)
+from weni_datalake_sdk.clients.redshift.json_stream import (
+    iter_json_array,
+    iter_response_rows,
+    loads_nested,
+)
+from weni_datalake_sdk.tests import helpers
+
+
+def chunked(text, size):
+    data = text.encode()
+    return [data[i : i + size] for i in range(0, len(data), size)]
+
+
+class TestIterJsonArray:
+    @pytest.mark.parametrize("size", [1, 3, 7, 1024])
+    def test_any_chunk_size(self, size):
+        rows = [{"a": 1, "b": 'ção \\"x\\"'}, [1, 2], 12345, -1.5e3, "s", None, True]
+        text = json.dumps(rows, indent=1)
+
+        assert list(iter_json_array(chunked(text, size))) == rows
+
+    def test_str_chunks(self):
+        assert list(iter_json_array(["[1,", " 2]"])) == [1, 2]
+
+    def test_empty(self):
+        assert list(iter_json_array([b" [ ] "])) == []
+        assert list(iter_json_array([b"{}"])) == []
+
+    def test_array_inside_object(self):
+        text = '{"total": 2, "meta": {"x": [0]}, "data": [{"id": 1}, {"id": 2}]}'
+
+        assert list(iter_json_array(chunked(text, 4), key="data")) == [
+            {"id": 1},
+            {"id": 2},
+        ]
+        assert list(iter_json_array(chunked(text, 4))) == [{"id": 1}, {"id": 2}]
+
+    @pytest.mark.parametrize("text", ["[1, 2", "[1 2]", "nope", '[{"a": }]'])
+    def test_invalid(self, text):
+        with pytest.raises(ValueError):
+            list(iter_json_array(chunked(text, 2)))
+
+    def test_memory_does_not_grow_with_size(self):
+        row = json.dumps({"project": "p" * 50, "event_name": '"name"', "value": 1})
+
+        def body(count):
+            yield b"["
+            for i in range(count):
+                yield (("," if i else "") + row).encode()
+            yield b"]"
+
+        def peak(count):
+            tracemalloc.start()
+            try:
+                for _ in iter_json_array(body(count)):
+                    pass
+                return tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+
+        small, large = peak(1000), peak(20000)
+        assert large < small * 2
+
+    def test_response_is_closed(self):
+        response = mock.Mock()
+        response.iter_content.return_value = [b"[1]"]
+
+        assert list(iter_response_rows(response)) == [1]
+        response.close.assert_called_once()
+
+
+class TestLoadsNested:
+    @pytest.mark.parametrize(
+        "text",
+        [
+            json.dumps({"a": [1, -2.5e3, 'ção \\"x\\"', None, True, False], "b": {}}),
+            ' [ [] , {"a" : {"b" : []}} , 0 ] ',
+            '"s"',
+            "12",
+            '{"a": 1, "a": 2}',
+            "[NaN]",
+        ],
+    )
+    def test_matches_json_loads(self, text):
+        assert repr(loads_nested(text)) == repr(json.loads(text))
+
+    def test_object_hook(self):
+        hook = mock.Mock(side_effect=lambda obj: sorted(obj))
+
+        assert loads_nested('{"b": {"d": 1, "c": 2}, "a": {}}', hook) == [
+            "a",
+            "b",
+        ]
+        assert hook.call_count == 3
+
+    def test_deep_input(self):
+        depth = 100000
+        text = '[{"a": ' * depth + "1" + "}]" * depth
+
+        with pytest.raises(RecursionError):
+            json.loads(text)
+        result = loads_nested(text)
+        for _ in range(depth):
+            result = result[0]["a"]
+        assert result == 1
+
+    @pytest.mark.parametrize(
+        "text", ["", "[1, 2", "[1 2]", "nope", '[{"a": }]', '{"a" 1}', "{1: 2}", "1 2"]
+    )
+    def test_invalid(self, text):
+        with pytest.raises(json.JSONDecodeError):
+            loads_nested(text)
+
+
+class Handler(helpers.Handler):
+    rows = 2000
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        def write(data):
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+
+        write(b"[")
+        for i in range(self.rows):
+            write(
+                json.dumps({"id": i, "event_name": '"quoted"'}).encode()
+                + (b"," if i < self.rows - 1 else b"")
+            )
+        write(b"]")
+        self.wfile.write(b"0\r\n\r\n")
+
+
+@pytest.fixture
+def server(monkeypatch):
+    with helpers.http_server(Handler) as url:
+        helpers.use_dc_api(
+            monkeypatch,
+            url,
+            EVENTS_METRIC_NAME="events",
+            EVENTS_SILVER_METRIC_NAME="events_silver",
+        )
+        yield
+    close_session()
+
+
+PARAMS = {"project": "p", "date_start": "2025-01-01", "date_end": "2025-01-31"}
+
+
+class TestStreamingEvents:
+    def test_rows_are_cleaned_one_by_one(self, server):
+        rows = get_events(stream=True, **PARAMS)
+
+        first = next(rows)
+        assert first == {"id": 0, "event_name": "quoted"}
+        assert sum(1 for _ in rows) == Handler.rows - 1
+
+    def test_silver(self, server):
+        rows = list(get_events_silver(stream=True, table="topics", **PARAMS))
+
+        assert len(rows) == Handler.rows
+
+    def test_query_errors_are_raised_on_call(self):
+        with mock.patch(
+            "weni_datalake_sdk.clients.redshift.events.query_dc_api",
+            side_effect=Exception("boom"),
+        ):
+            with pytest.raises(Exception, match="Error querying events: boom"):
+                get_events(stream=True, **PARAMS)
+
+    def test_decoding_errors_are_wrapped(self):
+        response = mock.Mock()
+        response.iter_content.return_value = [b"[1,"]
+
+        with mock.patch(
+            "weni_datalake_sdk.clients.redshift.events.query_dc_api",
+            return_value=response,
+        ) as query_dc_api:
+            rows = get_events(stream=True, **PARAMS)
+
+            with pytest.raises(Exception, match="Error querying events: "):
+                list(rows)
+
+        query_dc_api.assert_called_once_with(
+            metric=None, query_params=PARAMS, stream=True
+        )
+        response.close.assert_called_once()
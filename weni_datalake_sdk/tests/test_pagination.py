@@ -0,0 +1,142 @@
+import threading
+from unittest import mock
+from urllib.parse import parse_qsl, urlparse
+
+import pytest
+
+from weni_datalake_sdk.clients.http import close_session
+from weni_datalake_sdk.clients.redshift.events import (
+    iter_events,
+    iter_events_silver,
+)
+from weni_datalake_sdk.clients.redshift.pagination import page_rows, paginate
+from weni_datalake_sdk.clients.redshift.traces import iter_traces
+from weni_datalake_sdk.tests import helpers
+
+# Several rows share a date, so keyset pages have to break ties.
+ROWS = [
+    {"date": f"2025-01-{day:02d}T00:00:00Z", "event_name": '"e"', "n": n}
+    for n, day in enumerate([1, 1, 1, 2, 2, 2, 2, 2, 3, 4, 4])
+]
+
+
+class DCAPI(helpers.Handler):
+    """Stand-in for the DC API: rows sorted by date, paged by limit/offset."""
+
+    requests = []
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = dict(parse_qsl(url.query))
+        self.requests.append((url.path, params))
+
+        rows = [row for row in ROWS if row["date"] >= params["date_start"]]
+        offset, limit = int(params["offset"]), int(params["limit"])
+        self.send_json(rows[offset : offset + limit])
+
+
+@pytest.fixture
+def dc_api(monkeypatch):
+    DCAPI.requests = []
+    with helpers.http_server(DCAPI) as url:
+        helpers.use_dc_api(
+            monkeypatch,
+            url,
+            EVENTS_METRIC_NAME="events",
+            EVENTS_SILVER_METRIC_NAME="events_silver",
+            TRACES_METRIC_NAME="traces",
+        )
+        yield DCAPI.requests
+    close_session()
+
+
+PARAMS = {
+    "project": "p",
+    "date_start": "2025-01-01T00:00:00Z",
+    "date_end": "2025-01-31T00:00:00Z",
+}
+
+
+class TestPaginate:
+    def test_page_rows(self):
+        assert page_rows([1]) == [1]
+        assert page_rows({"total": 1, "data": [1]}) == [1]
+        assert page_rows(None) == []
+
+    def test_next_page_is_prefetched(self):
+        consumed = threading.Event()
+        prefetched = threading.Event()
+
+        def fetch(params):
+            if params["offset"] == 2:
+                prefetched.set()
+                assert not consumed.is_set()
+                return [3]
+            return [1, 2]
+
+        rows = paginate(fetch, {}, page_size=2)
+
+        assert next(rows) == 1
+        assert prefetched.wait(1)
+        consumed.set()
+        assert list(rows) == [2, 3]
+
+    def test_without_prefetch(self):
+        fetch = mock.Mock(side_effect=[[1, 2], []])
+
+        rows = paginate(fetch, {"a": 1}, page_size=2, prefetch=False)
+
+        assert next(rows) == 1
+        fetch.assert_called_once_with({"a": 1, "limit": 2, "offset": 0})
+        assert list(rows) == [2]
+        assert fetch.call_count == 2
+
+
+class TestIterEvents:
+    @pytest.mark.parametrize("page_size", [1, 2, 3, 4, 11, 100])
+    def test_offset_pages(self, dc_api, page_size):
+        rows = list(iter_events(page_size=page_size, **PARAMS))
+
+        assert [row["n"] for row in rows] == list(range(len(ROWS)))
+        assert rows[0]["event_name"] == "e"
+        assert all(path == "/events" for path, _ in dc_api)
+        assert "page_size" not in dc_api[0][1]
+
+    @pytest.mark.parametrize("page_size", [1, 2, 3, 4, 11, 100])
+    def test_keyset_pages(self, dc_api, page_size):
+        rows = list(iter_events(page_size=page_size, cursor="date", **PARAMS))
+
+        assert [row["n"] for row in rows] == list(range(len(ROWS)))
+        if page_size == 4:
+            assert [(p["date_start"][8:10], p["offset"]) for _, p in dc_api] == [
+                ("01", "0"),
+                ("02", "1"),
+                ("02", "5"),
+            ]
+
+    def test_silver(self, dc_api):
+        rows = list(iter_events_silver(table="topics", page_size=5, **PARAMS))
+
+        assert len(rows) == len(ROWS)
+        assert dc_api[0][0] == "/events_silver"
+
+    def test_validation_is_eager(self):
+        with pytest.raises(Exception, match="Table is required"):
+            iter_events_silver(**PARAMS)
+
+    def test_errors_are_wrapped(self):
+        with mock.patch(
+            "weni_datalake_sdk.clients.redshift.events.query_dc_api",
+            side_effect=Exception("boom"),
+        ):
+            with pytest.raises(Exception, match="Error querying events: boom"):
+                list(iter_events(**PARAMS))
+
+
+class TestIterTraces:
+    def test_pages(self, dc_api):
+        rows = list(iter_traces({"date_start": "2025-01-03T00:00:00Z"}, page_size=2))
+
+        assert [row["n"] for row in rows] == [8, 9, 10]
+        assert rows[0]["event_name"] == '"e"'
+        assert [path for path, _ in dc_api] == ["/traces", "/traces"]
@@ -0,0 +1,244 @@
+from datetime import datetime, timezone
+from unittest import mock
+
+import pytest
+
+from weni_datalake_sdk.clients.redshift import cache as query_cache, partitions
+from weni_datalake_sdk.clients.redshift.cache import QueryCache
+from weni_datalake_sdk.clients.redshift.events import (
+    get_events_avg,
+    get_events_count,
+)
+from weni_datalake_sdk.clients.redshift.partitions import (
+    Bucket,
+    merge_results,
+    partitioned_query,
+    split_range,
+)
+
+NOW = datetime(2025, 1, 3, 12, 30, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def now():
+    with mock.patch.object(partitions, "datetime", wraps=datetime) as patched:
+        patched.now.return_value = NOW
+        yield
+
+
+@pytest.fixture
+def process_cache():
+    previous = query_cache._QUERY_CACHE, query_cache._QUERY_CACHE_ENABLED
+    query_cache._QUERY_CACHE = QueryCache()
+    query_cache._QUERY_CACHE_ENABLED = False
+    yield query_cache._QUERY_CACHE
+    query_cache._QUERY_CACHE, query_cache._QUERY_CACHE_ENABLED = previous
+
+
+class TestSplitRange:
+    def test_days(self):
+        buckets = split_range(
+            "2025-01-01T06:00:00Z", "2025-01-03T23:59:59Z", "day", now=NOW
+        )
+
+        assert buckets == [
+            Bucket("2025-01-01T06:00:00Z", "2025-01-01T23:59:59Z", True),
+            Bucket("2025-01-02T00:00:00Z", "2025-01-02T23:59:59Z", True),
+            Bucket("2025-01-03T00:00:00Z", "2025-01-03T23:59:59Z", False),
+        ]
+
+    def test_hours_and_partial_end(self):
+        buckets = split_range(
+            "2025-01-03T10:00:00Z", "2025-01-03T12:15:00Z", "hour", now=NOW
+        )
+
+        assert buckets == [
+            Bucket("2025-01-03T10:00:00Z", "2025-01-03T10:59:59Z", True),
+            Bucket("2025-01-03T11:00:00Z", "2025-01-03T11:59:59Z", True),
+            Bucket("2025-01-03T12:00:00Z", "2025-01-03T12:15:00Z", True),
+        ]
+
+    def test_recent_bucket_is_not_closed(self):
+        buckets = split_range(
+            "2025-01-03T11:00:00Z", "2025-01-03T11:59:59Z", "hour", now=NOW, settle=3600
+        )
+
+        assert not buckets[0].closed
+
+    def test_dates_and_offsets(self):
+        buckets = split_range("2025-01-01", "2025-01-01T02:00:00+02:00", "day", now=NOW)
+
+        assert buckets == [Bucket("2025-01-01", "2025-01-01T02:00:00+02:00", True)]
+
+    def test_outer_bounds_are_kept_as_given(self):
+        assert split_range("2021-01-01", "2021-01-02", "day", now=NOW) == [
+            Bucket("2021-01-01", "2021-01-01T23:59:59Z", True),
+            Bucket("2021-01-02T00:00:00Z", "2021-01-02", True),
+        ]
+        assert split_range("2021-01-01", "2021-01-01", "hour", now=NOW) == [
+            Bucket("2021-01-01", "2021-01-01", True)
+        ]
+
+    def test_date_only_end_is_closed_after_the_whole_day(self):
+        buckets = split_range("2025-01-02", "2025-01-02", "day", now=NOW)
+        assert buckets[-1].closed
+
+        buckets = split_range("2025-01-03", "2025-01-03", "day", now=NOW)
+        assert not buckets[-1].closed
+
+    def test_fractions_of_a_second_are_covered(self):
+        buckets = split_range(
+            "2025-01-03T09:30:00.250Z", "2025-01-03T10:15:00.500Z", "hour", now=NOW
+        )
+
+        assert buckets == [
+            Bucket("2025-01-03T09:30:00.250Z", "2025-01-03T09:59:59Z", True),
+            Bucket("2025-01-03T10:00:00Z", "2025-01-03T10:15:00.500Z", True),
+        ]
+
+    def test_reversed_range(self):
+        with pytest.raises(Exception, match="date_start must not be after"):
+            split_range("2025-01-02", "2025-01-01", "day", now=NOW)
+
+    def test_unknown_unit(self):
+        with pytest.raises(Exception, match="Partition must be"):
+            split_range("2025-01-01", "2025-01-02", "week")
+
+
+class TestMergeResults:
+    def test_scalars(self):
+        assert merge_results([{"count": 2}, {"count": 3}], "count") == {"count": 5}
+        assert merge_results([{"min": 2}, {"min": None}, {"min": 1}], "min") == {
+            "min": 1
+        }
+        assert merge_results([[{"max": 2.5}], [{"max": 4}]], "max") == [{"max": 4}]
+
+    def test_rows_are_matched_on_their_labels(self):
+        result = merge_results(
+            [
+                [{"key": "a", "sum": 1}, {"key": "b", "sum": 2}],
+                [{"key": "b", "sum": 3}, {"key": "c", "sum": 4}],
+            ],
+            "sum",
+        )
+
+        assert result == [
+            {"key": "a", "sum": 1},
+            {"key": "b", "sum": 5},
+            {"key": "c", "sum": 4},
+        ]
+
+    def test_weighted_average(self):
+        result = merge_results(
+            [{"avg": 2.0}, {"avg": None}, {"avg": 5.0}], "avg", weights=[2, 0, 1]
+        )
+
+        assert result == {"avg": 3.0}
+
+
+class TestPartitionedQuery:
+    def test_closed_buckets_are_fetched_once(self, now, process_cache):
+        fetch = mock.Mock(side_effect=lambda metric, params: {"count": 1})
+        params = {
+            "project": "p",
+            "date_start": "2025-01-01T00:00:00Z",
+            "date_end": "2025-01-03T23:59:59Z",
+        }
+
+        assert partitioned_query("m", params, fetch, "day", "count") == {"count": 3}
+        assert partitioned_query("m", params, fetch, "day", "count") == {"count": 3}
+
+        # Two closed days cached, the open one fetched each time.
+        assert fetch.call_count == 4
+        refetched = fetch.call_args_list[3][0][1]
+        assert refetched["date_start"] == "2025-01-03T00:00:00Z"
+        assert refetched["project"] == "p"
+
+    def test_cache_false(self, now, process_cache):
+        fetch = mock.Mock(return_value={"count": 1})
+        params = {"date_start": "2025-01-01", "date_end": "2025-01-01T23:59:59"}
+
+        partitioned_query("m", params, fetch, "day", "count", cache=False)
+        partitioned_query("m", params, fetch, "day", "count", cache=False)
+
+        assert fetch.call_count == 2
+
+    def test_avg_needs_count_metric(self, now):
+        params = {"date_start": "2025-01-01", "date_end": "2025-01-01"}
+
+        with pytest.raises(Exception, match="count metric"):
+            partitioned_query("m", params, mock.Mock(), "day", "avg")
+
+
+class TestEventsPartition:
+    PARAMS = {
+        "project": "p",
+        "date_start": "2025-01-01T00:00:00Z",
+        "date_end": "2025-01-02T23:59:59Z",
+    }
+
+    def test_count(self, monkeypatch, now, process_cache):
+        monkeypatch.setenv("EVENTS_COUNT_METRIC_NAME", "count")
+
+        with mock.patch(
+            "weni_datalake_sdk.clients.redshift.events.query_dc_api"
+        ) as query_dc_api:
+            query_dc_api.return_value.json.return_value = {"count": 4}
+            result = get_events_count(partition="day", **self.PARAMS)
+
+        assert result == {"count": 8}
+        sent = [c.kwargs["query_params"] for c in query_dc_api.call_args_list]
+        assert sorted(p["date_end"] for p in sent) == [
+            "2025-01-01T23:59:59Z",
+            "2025-01-02T23:59:59Z",
+        ]
+        assert all("partition" not in p for p in sent)
+
+    @pytest.mark.parametrize(
+        "date_start,date_end",
+        [
+            ("2025-01-01", "2025-01-02"),
+            ("2025-01-01T06:30:00.250Z", "2025-01-02T10:00:00-03:00"),
+        ],
+    )
+    def test_same_bounds_as_unpartitioned(
+        self, monkeypatch, now, process_cache, date_start, date_end
+    ):
+        monkeypatch.setenv("EVENTS_COUNT_METRIC_NAME", "count")
+        params = {"project": "p", "date_start": date_start, "date_end": date_end}
+
+        with mock.patch(
+            "weni_datalake_sdk.clients.redshift.events.query_dc_api"
+        ) as query_dc_api:
+            query_dc_api.return_value.json.return_value = {"count": 1}
+            get_events_count(**params)
+            whole = query_dc_api.call_args.kwargs["query_params"]
+            query_dc_api.reset_mock()
+            get_events_count(partition="day", **params)
+
+        sent = sorted(
+            (c.kwargs["query_params"] for c in query_dc_api.call_args_list),
+            key=lambda p: partitions.parse_date(p["date_start"]),
+        )
+        assert sent[0]["date_start"] == whole["date_start"]
+        assert sent[-1]["date_end"] == whole["date_end"]
+
+    def test_avg_is_weighted_by_count(self, monkeypatch, now, process_cache):
+        monkeypatch.setenv("EVENTS_AVG_METRIC_NAME", "avg")
+        monkeypatch.setenv("EVENTS_COUNT_METRIC_NAME", "count")
+        responses = {
+            ("avg", "2025-01-01T00:00:00Z"): {"avg": 1.0},
+            ("avg", "2025-01-02T00:00:00Z"): {"avg": 4.0},
+            ("count", "2025-01-01T00:00:00Z"): {"count": 2},
+            ("count", "2025-01-02T00:00:00Z"): {"count": 1},
+        }
+
+        def query_dc_api(metric, query_params):
+            response = mock.Mock()
+            response.json.return_value = responses[(metric, query_params["date_start"])]
+            return response
+
+        with mock.patch(
+            "weni_datalake_sdk.clients.redshift.events.query_dc_api", query_dc_api
+        ):
+            assert get_events_avg(partition="day", **self.PARAMS) == {"avg": 2.0}
@@ -0,0 +1,295 @@
+import json
+from concurrent.futures import Future
+from unittest import mock
+
+import grpc
+import pytest
+
+from weni_datalake_sdk.clients import policy as policy_module
+from weni_datalake_sdk.clients.channel_pool import (
+    ChannelPool,
+    close_channel_pool,
+)
+from weni_datalake_sdk.clients.client import send_event_data
+from weni_datalake_sdk.clients.policy import (
+    CallPolicy,
+    RetryBudget,
+    call_future_with_policy,
+    call_with_policy,
+    configure_policy,
+    get_policy,
+    to_service_config,
+)
+from weni_datalake_sdk.paths.events_path import EventPath
+from weni_datalake_sdk.tests.helpers import RpcError, unavailable
+
+
+@pytest.fixture(autouse=True)
+def no_sleep():
+    with mock.patch("weni_datalake_sdk.clients.policy.time.sleep") as sleep:
+        yield sleep
+
+
+class TestCallWithPolicy:
+    def test_passes_timeout(self):
+        method = mock.Mock(return_value="ok")
+
+        result = call_with_policy(method, "req", CallPolicy(timeout=2), RetryBudget())
+
+        assert result == "ok"
+        method.assert_called_once_with("req", timeout=2)
+
+    def test_retries_retryable_codes(self, no_sleep):
+        method = mock.Mock(side_effect=[unavailable(), unavailable(), "ok"])
+
+        result = call_with_policy(
+            method, "req", CallPolicy(max_attempts=3), RetryBudget()
+        )
+
+        assert result == "ok"
+        assert method.call_count == 3
+        assert no_sleep.call_count == 2
+
+    def test_gives_up_after_max_attempts(self):
+        method = mock.Mock(side_effect=[unavailable() for _ in range(10)])
+
+        with pytest.raises(grpc.RpcError):
+            call_with_policy(method, "req", CallPolicy(max_attempts=3), RetryBudget())
+
+        assert method.call_count == 3
+
+    def test_does_not_retry_other_codes(self):
+        method = mock.Mock(side_effect=RpcError(grpc.StatusCode.INVALID_ARGUMENT))
+
+        with pytest.raises(grpc.RpcError):
+            call_with_policy(method, "req", CallPolicy(max_attempts=3), RetryBudget())
+
+        method.assert_called_once()
+
+    def test_budget_stops_retries(self):
+        budget = RetryBudget(max_tokens=4)
+        method = mock.Mock(side_effect=[unavailable() for _ in range(10)])
+
+        with pytest.raises(grpc.RpcError):
+            call_with_policy(method, "req", CallPolicy(max_attempts=10), budget)
+
+        # Two failures bring the bucket down to half, which stops retrying.
+        assert method.call_count == 2
+        assert not budget.allow_retry()
+
+    def test_budget_refills_on_success(self):
+        budget = RetryBudget(max_tokens=4, token_ratio=1, tokens=2)
+        assert not budget.allow_retry()
+
+        budget.on_success()
+
+        assert budget.allow_retry()
+
+    def test_backoff_is_capped_and_jittered(self):
+        policy = CallPolicy(initial_backoff=0.1, max_backoff=1, jitter=0.2)
+
+        assert 0.08 <= policy.backoff(0) <= 0.12
+        assert 0.8 <= policy.backoff(10) <= 1.2
+
+
+class TestDeadline:
+    POLICY = CallPolicy(
+        timeout=4, deadline=5, max_attempts=10, initial_backoff=0.05, jitter=0
+    )
+
+    @pytest.fixture
+    def clock(self, no_sleep):
+        now = [100.0]
+
+        def sleep(seconds):
+            now[0] += seconds
+
+        no_sleep.side_effect = sleep
+        with mock.patch(
+            "weni_datalake_sdk.clients.policy.time.monotonic", lambda: now[0]
+        ):
+            yield now
+
+    def slow_failure(self, clock, timeouts):
+        def attempt(request, timeout):
+            timeouts.append(timeout)
+            clock[0] += 3
+            return unavailable()
+
+        return attempt
+
+    def test_attempts_stop_at_the_deadline(self, clock):
+        timeouts = []
+        attempt = self.slow_failure(clock, timeouts)
+
+        def method(request, timeout):
+            raise attempt(request, timeout)
+
+        with pytest.raises(grpc.RpcError):
+            call_with_policy(method, "req", self.POLICY, RetryBudget())
+
+        # The second attempt only gets what is left of the 5 seconds, after
+        # 3 seconds of first attempt and 0.05 of backoff.
+        assert timeouts == pytest.approx([4, 1.95])
+
+    def test_future_attempts_stop_at_the_deadline(self, clock):
+        timeouts = []
+        attempt = self.slow_failure(clock, timeouts)
+
+        def future(request, timeout):
+            failed = Future()
+            failed.set_exception(attempt(request, timeout))
+            return failed
+
+        method = mock.Mock()
+        method.future.side_effect = future
+
+        result = call_future_with_policy(method, "req", self.POLICY, RetryBudget())
+
+        with pytest.raises(grpc.RpcError):
+            result.result(timeout=5)
+        assert timeouts == [4, 2]
+
+    def test_no_deadline_bound(self, clock):
+        timeouts = []
+        attempt = self.slow_failure(clock, timeouts)
+
+        def method(request, timeout):
+            raise attempt(request, timeout)
+
+        policy = CallPolicy(timeout=4, deadline=None, max_attempts=3, jitter=0)
+        with pytest.raises(grpc.RpcError):
+            call_with_policy(method, "req", policy, RetryBudget())
+
+        # Without a deadline, only max_attempts bounds the call.
+        assert timeouts == [4, 4, 4]
+
+
+class TestHedging:
+    def make_method(self, futures):
+        method = mock.Mock()
+        method.future.side_effect = futures
+        return method
+
+    def test_second_attempt_wins(self):
+        slow, fast = Future(), Future()
+        fast.set_result("fast")
+        method = self.make_method([slow, fast])
+
+        result = call_with_policy(
+            method,
+            "req",
+            CallPolicy(max_attempts=2, hedging_delay=0.01),
+            RetryBudget(),
+        )
+
+        assert result == "fast"
+        assert slow.cancelled()
+
+    def test_failure_starts_next_attempt(self):
+        failed, ok = Future(), Future()
+        failed.set_exception(unavailable())
+        ok.set_result("ok")
+        method = self.make_method([failed, ok])
+
+        result = call_with_policy(
+            method,
+            "req",
+            CallPolicy(max_attempts=2, hedging_delay=10),
+            RetryBudget(),
+        )
+
+        assert result == "ok"
+        assert method.future.call_count == 2
+
+    def test_raises_when_every_attempt_fails(self):
+        futures = [Future(), Future()]
+        for future in futures:
+            future.set_exception(unavailable())
+        method = self.make_method(futures)
+
+        with pytest.raises(grpc.RpcError):
+            call_with_policy(
+                method,
+                "req",
+                CallPolicy(max_attempts=2, hedging_delay=0.01),
+                RetryBudget(),
+            )
+
+    def test_fatal_error_is_raised(self):
+        fatal = Future()
+        fatal.set_exception(RpcError(grpc.StatusCode.INVALID_ARGUMENT))
+        method = self.make_method([fatal])
+
+        with pytest.raises(grpc.RpcError):
+            call_with_policy(
+                method,
+                "req",
+                CallPolicy(max_attempts=3, hedging_delay=10),
+                RetryBudget(),
+            )
+
+        method.future.assert_called_once()
+
+
+class TestPolicyConfiguration:
+    def test_per_path_policy(self):
+        events_policy = CallPolicy(timeout=1)
+        configure_policy("events", events_policy)
+
+        assert get_policy("events") is events_policy
+        assert get_policy("traces") is policy_module.DEFAULT_POLICY
+
+        configure_policy("events", None)
+        assert get_policy("events") is policy_module.DEFAULT_POLICY
+
+    def test_send_uses_path_policy(self):
+        configure_policy("events", CallPolicy(timeout=1.5))
+        try:
+            with mock.patch(
+                "weni_datalake_sdk.clients.events_pb2_grpc.DatalakeManagerServiceStub"
+            ) as stub_class, mock.patch("grpc.insecure_channel"):
+                insert = stub_class.return_value.InsertEventData
+                insert.return_value.status = "success"
+
+                send_event_data(EventPath, {"event_name": "event1"})
+
+            assert insert.call_args.kwargs == {"timeout": 1.5}
+        finally:
+            configure_policy("events", None)
+            close_channel_pool()
+
+    def test_service_config(self):
+        method = "/events.DatalakeManagerService/InsertEventData"
+        config = json.loads(
+            to_service_config(
+                {method: CallPolicy(timeout=2, max_attempts=4)},
+                RetryBudget(max_tokens=20, token_ratio=0.5),
+            )
+        )
+
+        (method_config,) = config["methodConfig"]
+        assert method_config["name"] == [
+            {"service": "events.DatalakeManagerService", "method": "InsertEventData"}
+        ]
+        assert method_config["timeout"] == "2s"
+        assert method_config["retryPolicy"]["maxAttempts"] == 4
+        assert method_config["retryPolicy"]["retryableStatusCodes"] == ["UNAVAILABLE"]
+        assert config["retryThrottling"] == {"maxTokens": 20, "tokenRatio": 0.5}
+
+    def test_service_config_hedging(self):
+        config = json.loads(
+            to_service_config({"/svc/M": CallPolicy(hedging_delay=0.05)})
+        )
+
+        (method_config,) = config["methodConfig"]
+        assert method_config["hedgingPolicy"]["hedgingDelay"] == "0.05s"
+        assert "retryPolicy" not in method_config
+
+    def test_service_config_is_a_channel_option(self):
+        pool = ChannelPool(service_config='{"methodConfig": []}')
+
+        options = dict(pool.get_options())
+
+        assert json.loads(options["grpc.service_config"])["methodConfig"] == []
+        assert options["grpc.enable_retries"] == 1
@@ -0,0 +1,545 @@
+import json
+import multiprocessing
+import threading
+from unittest import mock
+
+import pytest
+
+from weni_datalake_sdk.clients.redshift import cache as query_cache
+from weni_datalake_sdk.clients.redshift.cache import (
+    CacheBackend,
+    LRUBackend,
+    QueryCache,
+    SQLiteBackend,
+    cached_query,
+    configure_query_cache,
+    get_query_cache,
+    make_key,
+    revalidated_query,
+)
+from weni_datalake_sdk.clients.redshift.events import (
+    get_events,
+    get_events_count,
+    get_events_silver_count_by_group,
+)
+from weni_datalake_sdk.clients.redshift.message_templates import (
+    get_message_templates,
+    get_message_templates_data,
+)
+from weni_datalake_sdk.clients.redshift.traces import (
+    get_traces,
+    get_traces_data,
+)
+
+
+class DictBackend(CacheBackend):
+    def __init__(self):
+        self.values = {}
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def set(self, key, value, ttl):
+        self.values[key] = value
+
+    def delete(self, key):
+        self.values.pop(key, None)
+
+    def clear(self):
+        self.values.clear()
+
+
+class TTLDictBackend(DictBackend):
+    def set(self, key, value, ttl):
+        self.values[key] = (value, ttl)
+
+    def get(self, key):
+        entry = self.get_entry(key)
+        return None if entry is None else entry[0]
+
+    def get_entry(self, key):
+        return self.values.get(key)
+
+
+@pytest.fixture
+def clock():
+    with mock.patch.object(query_cache.time, "monotonic", return_value=0.0) as now:
+        yield now
+
+
+@pytest.fixture
+def enabled_cache():
+    previous = get_query_cache(), query_cache._QUERY_CACHE_ENABLED
+    yield configure_query_cache(ttl=60)
+    query_cache._QUERY_CACHE, query_cache._QUERY_CACHE_ENABLED = previous
+
+
+@pytest.fixture
+def dc_api(monkeypatch):
+    monkeypatch.setenv("EVENTS_COUNT_METRIC_NAME", "count_metric")
+    with mock.patch(
+        "weni_datalake_sdk.clients.redshift.events.query_dc_api"
+    ) as query_dc_api:
+        query_dc_api.return_value.json.return_value = {"count": 3}
+        yield query_dc_api
+
+
+PARAMS = {"project": "p", "date_start": "2025-01-01", "date_end": "2025-01-31"}
+
+
+class TestMakeKey:
+    def test_parameter_order_is_ignored(self):
+        assert make_key("m", {"a": 1, "b": 2}) == make_key("m", {"b": 2, "a": 1})
+
+    def test_metric_and_values_matter(self):
+        assert make_key("m", {"a": 1}) != make_key("n", {"a": 1})
+        assert make_key("m", {"a": 1}) != make_key("m", {"a": 2})
+
+
+class TestLRUBackend:
+    def test_expired_entries_are_dropped(self, clock):
+        backend = LRUBackend()
+        backend.set("k", b"v", ttl=10)
+
+        clock.return_value = 9.9
+        assert backend.get("k") == b"v"
+        clock.return_value = 10.0
+        assert backend.get("k") is None
+        assert backend.size == 0
+
+    def test_least_recently_used_is_evicted(self):
+        backend = LRUBackend(max_bytes=10)
+        backend.set("a", b"aaaa", ttl=60)
+        backend.set("b", b"bbbb", ttl=60)
+        backend.get("a")
+        backend.set("c", b"cccc", ttl=60)
+
+        assert backend.get("a") == b"aaaa"
+        assert backend.get("b") is None
+        assert backend.get("c") == b"cccc"
+        assert backend.size == 8
+
+    def test_value_larger_than_limit_is_not_stored(self):
+        backend = LRUBackend(max_bytes=3)
+        backend.set("a", b"aaaa", ttl=60)
+
+        assert len(backend) == 0
+
+    def test_too_large_value_replaces_the_old_one(self):
+        backend = LRUBackend(max_bytes=3)
+        backend.set("a", b"aa", ttl=60)
+        backend.set("a", b"aaaa", ttl=60)
+
+        assert backend.get("a") is None
+        assert backend.size == 0
+
+
+class TestQueryCache:
+    def test_fetches_once_and_counts(self):
+        cache = QueryCache()
+        fetch = mock.Mock(return_value={"count": 1})
+
+        assert cache.get_or_fetch("k", fetch) == {"count": 1}
+        assert cache.get_or_fetch("k", fetch) == {"count": 1}
+
+        fetch.assert_called_once()
+        assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+        assert cache.stats.hit_ratio == 0.5
+
+    def test_results_are_copies(self):
+        cache = QueryCache()
+        cache.get_or_fetch("k", lambda: {"rows": [1]})["rows"].append(2)
+
+        assert cache.get("k") == {"rows": [1]}
+
+    def test_errors_are_not_cached(self):
+        cache = QueryCache()
+        fetch = mock.Mock(side_effect=[Exception("boom"), {"count": 1}])
+
+        with pytest.raises(Exception):
+            cache.get_or_fetch("k", fetch)
+        assert cache.get_or_fetch("k", fetch) == {"count": 1}
+
+    def test_shared_backend(self):
+        backend = TTLDictBackend()
+        QueryCache(backend=backend).set("k", {"count": 1})
+
+        other = QueryCache(backend=backend)
+        assert other.get("k") == {"count": 1}
+        assert other.local.get("k") is not None
+
+    def test_backend_hits_keep_their_remaining_ttl(self, clock):
+        backend = TTLDictBackend()
+        QueryCache(backend=backend).set("k", {"count": 1}, ttl=5)
+
+        other = QueryCache(ttl=60, backend=backend)
+        assert other.get("k") == {"count": 1}
+        clock.return_value = 5.0
+        assert other.local.get("k") is None
+
+    def test_hits_without_remaining_ttl_are_not_copied(self):
+        backend = DictBackend()
+        QueryCache(backend=backend).set("k", {"count": 1})
+
+        other = QueryCache(backend=backend)
+        assert other.get("k") == {"count": 1}
+        assert other.local.get("k") is None
+
+    def test_failing_backend_is_a_miss(self):
+        backend = mock.Mock(spec=CacheBackend)
+        backend.get_entry.side_effect = ConnectionError
+        backend.set.side_effect = ConnectionError
+        cache = QueryCache(backend=backend)
+
+        assert cache.get_or_fetch("k", lambda: 1) == 1
+        assert cache.stats.misses == 1
+
+
+class TestCachedQuery:
+    def test_disabled_by_default(self):
+        fetch = mock.Mock(return_value=1)
+
+        cached_query("m", {}, fetch)
+        cached_query("m", {}, fetch)
+
+        assert fetch.call_count == 2
+
+    def test_per_call_cache(self):
+        cache = QueryCache()
+        fetch = mock.Mock(return_value=1)
+
+        cached_query("m", {}, fetch, cache=cache)
+        cached_query("m", {}, fetch, cache=cache)
+
+        fetch.assert_called_once()
+
+
+class TestEventsCache:
+    def test_identical_queries_hit_the_cache(self, dc_api, enabled_cache):
+        assert get_events_count(**PARAMS) == {"count": 3}
+        assert get_events_count(**dict(reversed(PARAMS.items()))) == {"count": 3}
+
+        dc_api.assert_called_once_with(metric="count_metric", query_params=PARAMS)
+        assert enabled_cache.stats.hits == 1
+
+    def test_cache_false_bypasses(self, dc_api, enabled_cache):
+        get_events_count(**PARAMS)
+        get_events_count(cache=False, **PARAMS)
+
+        assert dc_api.call_count == 2
+
+    def test_cache_true_when_disabled(self, dc_api):
+        previous = get_query_cache(), query_cache._QUERY_CACHE_ENABLED
+        configure_query_cache(enabled=False)
+        try:
+            get_events_count(cache=True, **PARAMS)
+            get_events_count(cache=True, **PARAMS)
+            get_events_count(**PARAMS)
+        finally:
+            query_cache._QUERY_CACHE, query_cache._QUERY_CACHE_ENABLED = previous
+
+        assert dc_api.call_count == 2
+
+    def test_cache_is_not_sent_as_parameter(self, dc_api):
+        get_events_count(cache=QueryCache(), **PARAMS)
+
+        dc_api.assert_called_once_with(metric="count_metric", query_params=PARAMS)
+
+    def test_silver_quotes_are_cleaned_on_hits(self, monkeypatch, enabled_cache):
+        monkeypatch.setenv("EVENTS_SILVER_COUNT_BY_GROUP_METRIC_NAME", "group")
+        params = dict(PARAMS, table="topics", metadata_key="topic_uuid")
+
+        with mock.patch(
+            "weni_datalake_sdk.clients.redshift.events.query_dc_api"
+        ) as query_dc_api:
+            query_dc_api.return_value.json.side_effect = lambda **kwargs: json.loads(
+                '[{"key": "\\"a\\""}]', **kwargs
+            )
+            get_events_silver_count_by_group(**params)
+            result = get_events_silver_count_by_group(**params)
+
+        assert result == [{"key": "a"}]
+        query_dc_api.assert_called_once()
+
+    def test_raw_events_are_not_cached(self, monkeypatch, enabled_cache):
+        monkeypatch.setenv("EVENTS_METRIC_NAME", "events")
+
+        with mock.patch(
+            "weni_datalake_sdk.clients.redshift.events.query_dc_api"
+        ) as query_dc_api:
+            query_dc_api.return_value.json.return_value = []
+            get_events(**PARAMS)
+            get_events(**PARAMS)
+
+        assert query_dc_api.call_count == 2
+
+
+@pytest.fixture
+def wall_clock():
+    with mock.patch.object(query_cache.time, "time", return_value=1000.0) as now:
+        yield now
+
+
+def wait_for_refresh(cache):
+    for thread in threading.enumerate():
+        if thread.name == "datalake-query-revalidate":
+            thread.join(5)
+    assert not cache._revalidating
+
+
+class TestStaleWhileRevalidate:
+    def test_fresh_results_are_not_refetched(self, wall_clock):
+        cache = QueryCache()
+        fetch = mock.Mock(return_value={"count": 1})
+
+        cache.get_or_revalidate("k", fetch, fresh_ttl=10, stale_ttl=60)
+        wall_clock.return_value += 9
+        assert cache.get_or_revalidate("k", fetch, fresh_ttl=10, stale_ttl=60) == {
+            "count": 1
+        }
+
+        fetch.assert_called_once()
+        assert cache.stats.stale == 0
+
+    def test_stale_result_is_returned_and_refreshed(self, wall_clock):
+        cache = QueryCache()
+        fetch = mock.Mock(side_effect=[{"count": 1}, {"count": 2}])
+
+        cache.get_or_revalidate("k", fetch, fresh_ttl=10, stale_ttl=60)
+        wall_clock.return_value += 30
+        assert cache.get_or_revalidate("k", fetch, 10, 60) == {"count": 1}
+        wait_for_refresh(cache)
+
+        assert cache.get_or_revalidate("k", fetch, 10, 60) == {"count": 2}
+        assert fetch.call_count == 2
+        assert cache.stats.stale == 1
+
+    def test_one_refresh_per_key(self, wall_clock):
+        cache = QueryCache()
+        release = threading.Event()
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            if len(calls) > 1:
+                assert release.wait(5)
+            return len(calls)
+
+        cache.get_or_revalidate("k", fetch, 10, 60)
+        wall_clock.return_value += 30
+        results = [cache.get_or_revalidate("k", fetch, 10, 60) for _ in range(5)]
+        release.set()
+        wait_for_refresh(cache)
+
+        assert results == [1] * 5
+        assert len(calls) == 2
+
+    def test_failed_refresh_keeps_stale_result(self, wall_clock):
+        cache = QueryCache()
+        fetch = mock.Mock(side_effect=[{"count": 1}, Exception("down")])
+
+        cache.get_or_revalidate("k", fetch, 10, 60)
+        wall_clock.return_value += 30
+        cache.get_or_revalidate("k", fetch, 10, 60)
+        wait_for_refresh(cache)
+
+        assert cache.get_or_revalidate("k", fetch, 10, 60) == {"count": 1}
+
+    def test_too_old_results_are_fetched(self, clock):
+        cache = QueryCache()
+        fetch = mock.Mock(side_effect=[{"count": 1}, {"count": 2}])
+
+        cache.get_or_revalidate("k", fetch, 10, 60)
+        clock.return_value += 60
+
+        assert cache.get_or_revalidate("k", fetch, 10, 60) == {"count": 2}
+
+    def test_cache_false_skips_it(self, enabled_cache):
+        fetch = mock.Mock(return_value=1)
+
+        revalidated_query("m", {}, fetch, 10, 60, cache=False)
+        revalidated_query("m", {}, fetch, 10, 60, cache=False)
+
+        assert fetch.call_count == 2
+
+
+class TestRevalidatedQueries:
+    def test_events_aggregation(self, dc_api, enabled_cache, wall_clock):
+        query_cache._QUERY_CACHE_ENABLED = False
+
+        get_events_count(stale_ttl=60, **PARAMS)
+        get_events_count(stale_ttl=60, **PARAMS)
+
+        dc_api.assert_called_once_with(metric="count_metric", query_params=PARAMS)
+
+    def test_raw_events(self, monkeypatch, enabled_cache, wall_clock):
+        monkeypatch.setenv("EVENTS_METRIC_NAME", "events")
+
+        with mock.patch(
+            "weni_datalake_sdk.clients.redshift.events.query_dc_api"
+        ) as query_dc_api:
+            query_dc_api.return_value.json.return_value = [{"id": 1}]
+            get_events(fresh_ttl=10, stale_ttl=60, **PARAMS)
+            wall_clock.return_value += 30
+            assert get_events(fresh_ttl=10, stale_ttl=60, **PARAMS) == [{"id": 1}]
+            wait_for_refresh(enabled_cache)
+
+        assert query_dc_api.call_count == 2
+        query_dc_api.assert_called_with(metric="events", query_params=PARAMS)
+
+    def test_traces_and_templates(self, monkeypatch, enabled_cache):
+        monkeypatch.setenv("TRACES_METRIC_NAME", "traces")
+        monkeypatch.setenv("MESSAGE_TEMPLATES_METRIC_NAME", "templates")
+
+        for module, call in (
+            ("traces", lambda: get_traces_data({"a": 1}, stale_ttl=60)),
+            (
+                "message_templates",
+                lambda: get_message_templates_data("urn", stale_ttl=60),
+            ),
+        ):
+            with mock.patch(
+                f"weni_datalake_sdk.clients.redshift.{module}.query_dc_api"
+            ) as query_dc_api:
+                query_dc_api.return_value.json.return_value = {"data": [1]}
+                assert call() == {"data": [1]}
+                assert call() == {"data": [1]}
+
+            query_dc_api.assert_called_once()
+
+    def test_plain_traces_and_templates_return_the_response(self, enabled_cache):
+        for module, call in (
+            ("traces", lambda: get_traces({"a": 1})),
+            ("message_templates", lambda: get_message_templates("urn")),
+        ):
+            with mock.patch(
+                f"weni_datalake_sdk.clients.redshift.{module}.query_dc_api"
+            ) as query_dc_api:
+                assert call() is query_dc_api.return_value
+
+
+def write_entries(path, worker):
+    backend = SQLiteBackend(path)
+    for i in range(50):
+        backend.set(f"{worker}-{i}", json.dumps([worker, i]).encode(), 60)
+        assert backend.get(f"{worker}-{i}") is not None
+
+
+class TestSQLiteBackend:
+    def test_round_trip_survives_restarts(self, tmp_path):
+        path = str(tmp_path / "cache.db")
+        SQLiteBackend(path).set("k", b'{"count": 1}', 60)
+
+        backend = SQLiteBackend(path)
+        assert backend.get("k") == b'{"count": 1}'
+        assert backend.get("other") is None
+
+    def test_expired_entries_are_misses(self, tmp_path, wall_clock):
+        backend = SQLiteBackend(str(tmp_path / "cache.db"))
+        backend.set("k", b"1", 10)
+        backend.set("forever", b"1", float("inf"))
+
+        wall_clock.return_value += 10
+        assert backend.get("k") is None
+        assert backend.get("forever") == b"1"
+
+    def test_values_are_compressed(self, tmp_path):
+        backend = SQLiteBackend(str(tmp_path / "cache.db"))
+        value = json.dumps([{"event_name": "e", "value": 1}] * 1000).encode()
+
+        backend.set("k", value, 60)
+
+        assert backend.size < len(value) / 10
+        assert backend.get("k") == value
+
+    def test_replace_delete_and_clear_track_size(self, tmp_path):
+        backend = SQLiteBackend(str(tmp_path / "cache.db"), compress_level=0)
+        backend.set("a", b"x" * 100, 60)
+        size = backend.size
+        backend.set("a", b"x" * 100, 60)
+        backend.set("b", b"x" * 100, 60)
+        assert backend.size == 2 * size
+
+        backend.delete("a")
+        assert backend.size == size and len(backend) == 1
+        backend.clear()
+        assert backend.size == 0 and len(backend) == 0
+
+    def test_eviction(self, tmp_path, wall_clock):
+        backend = SQLiteBackend(str(tmp_path / "cache.db"), compress_level=0)
+        backend.set("probe", b"x" * 100, 60)
+        entry = backend.size
+        backend.clear()
+        backend.max_bytes = 3 * entry
+
+        backend.set("expired", b"x" * 100, 1)
+        backend.set("late", b"x" * 100, 300)
+        backend.set("soon", b"x" * 100, 100)
+        wall_clock.return_value += 5
+        backend.set("new", b"x" * 100, 200)
+
+        # The expired entry made room.
+        assert backend.get("soon") is not None
+
+        backend.set("newer", b"x" * 100, 200)
+        assert backend.get("soon") is None
+        assert backend.size <= backend.max_bytes
+        assert {key for key in ("late", "new", "newer") if backend.get(key)} == {
+            "late",
+            "new",
+            "newer",
+        }
+
+    def test_too_large_values_are_not_stored(self, tmp_path):
+        backend = SQLiteBackend(str(tmp_path / "cache.db"), max_bytes=100)
+
+        backend.set("k", b"\x00" * 10000, 60)
+
+        assert backend.get("k") is not None
+        backend.set("random", bytes(range(256)) * 4, 60)
+        assert backend.get("random") is None
+
+        backend.set("k", bytes(range(256)) * 4, 60)
+        assert backend.get("k") is None
+        assert backend.size == 0
+
+    def test_shared_by_processes(self, tmp_path):
+        path = str(tmp_path / "cache.db")
+        backend = SQLiteBackend(path)
+        backend.set("parent", b"1", 60)
+
+        context = multiprocessing.get_context("fork")
+        processes = [
+            context.Process(target=write_entries, args=(path, worker))
+            for worker in range(4)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join(30)
+            assert process.exitcode == 0
+
+        assert len(backend) == 201
+        assert backend.get("3-49") == b"[3, 49]"
+        sizes = backend._connection().execute("SELECT SUM(size) FROM entries")
+        assert backend.size == sizes.fetchone()[0]
+
+    def test_query_caches_share_results(self, tmp_path):
+        path = str(tmp_path / "cache.db")
+        first = QueryCache(backend=SQLiteBackend(path))
+        second = QueryCache(backend=SQLiteBackend(path))
+
+        first.get_or_fetch("k", lambda: {"count": 1})
+
+        assert second.get_or_fetch("k", mock.Mock()) == {"count": 1}
+
+    def test_local_copies_expire_with_the_shared_entry(self, tmp_path, wall_clock):
+        path = str(tmp_path / "cache.db")
+        first = QueryCache(backend=SQLiteBackend(path))
+        second = QueryCache(ttl=60, backend=SQLiteBackend(path))
+        first.set("k", {"count": 1}, ttl=10)
+
+        wall_clock.return_value += 4
+        with mock.patch.object(query_cache.time, "monotonic", return_value=0.0):
+            assert second.get("k") == {"count": 1}
+            assert second.local._entries["k"][0] == pytest.approx(6)
@@ -0,0 +1,261 @@
+import asyncio
+from unittest import mock
+
+import pytest
+
+from weni_datalake_sdk.clients.redshift import redshift_client
+from weni_datalake_sdk.clients.redshift.cache import QueryCache
+from weni_datalake_sdk.clients.redshift.credentials import TokenManager
+
+web = pytest.importorskip("aiohttp.web")
+aio = pytest.importorskip("weni_datalake_sdk.clients.redshift.aio")
+
+
+class DCAPI:
+    """Local stand-in for the DC API answering with the received query."""
+
+    def __init__(self):
+        self.requests = []
+        self.in_flight = 0
+        self.peak = 0
+        self.rejected_tokens = set()
+        self.delay = 0
+        self.hold = 0
+        self.full = None
+
+    async def handle(self, request):
+        self.requests.append(request)
+        if request.headers["secretsaccesstoken"] in self.rejected_tokens:
+            return web.Response(status=401)
+        if request.match_info["metric"] == "broken":
+            return web.Response(status=500)
+
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        if self.hold:
+            # Keep the first requests until `hold` of them are in flight, so
+            # the peak does not depend on timing.
+            if self.full is None:
+                self.full = asyncio.Event()
+            if self.in_flight >= self.hold:
+                self.full.set()
+            try:
+                await asyncio.wait_for(self.full.wait(), 5)
+            except asyncio.TimeoutError:
+                pass
+        await asyncio.sleep(self.delay)
+        self.in_flight -= 1
+
+        query = dict(request.query)
+        if query.get("project") == "quoted":
+            query["project"] = '"quoted"'
+        return web.json_response(
+            {"metric": request.match_info["metric"], "query": query}
+        )
+
+
+@pytest.fixture
+def dc_api():
+    return DCAPI()
+
+
+@pytest.fixture
+def tokens(monkeypatch):
+    manager = TokenManager(refresh_ahead=0)
+    manager._fetch_token = mock.Mock(side_effect=["token-1", "token-2"])
+    monkeypatch.setattr(aio, "TOKEN_MANAGER", manager)
+    return manager
+
+
+@pytest.fixture
+def run(dc_api, tokens, monkeypatch):
+    for name in ("EVENTS", "EVENTS_COUNT", "EVENTS_SILVER_COUNT_BY_GROUP", "TRACES"):
+        monkeypatch.setenv(f"{name}_METRIC_NAME", name.lower())
+
+    def run(coro_func):
+        async def main():
+            app = web.Application()
+            app.router.add_get("/api/{metric}", dc_api.handle)
+            runner = web.AppRunner(app)
+            await runner.setup()
+            site = web.TCPSite(runner, "localhost", 0)
+            await site.start()
+            port = runner.addresses[0][1]
+            monkeypatch.setattr(
+                redshift_client,
+                "REDSHIFT_QUERY_BASE_URL",
+                f"http://localhost:{port}/api",
+            )
+            try:
+                return await coro_func()
+            finally:
+                await aio.close_session()
+                await runner.cleanup()
+
+        return asyncio.run(main())
+
+    return run
+
+
+PARAMS = {"project": "p", "date_start": "2025-01-01", "date_end": "2025-01-31"}
+
+
+class TestQueryDcApi:
+    def test_query_string_and_headers(self, run, dc_api):
+        async def main():
+            response = await aio.query_dc_api("events", {"metadata": "a:b c"})
+            return await response.json()
+
+        result = run(main)
+
+        assert result["query"] == {"metadata": "a:b c"}
+        request = dc_api.requests[0]
+        assert request.raw_path == "/api/events?metadata=a:b+c"
+        assert request.headers["secretsaccesstoken"] == "token-1"
+        assert "gzip" in request.headers["Accept-Encoding"]
+
+    def test_token_is_refreshed_once_on_401(self, run, dc_api, tokens):
+        dc_api.rejected_tokens.add("token-1")
+
+        async def main():
+            return await (await aio.query_dc_api("events")).json()
+
+        assert run(main)["metric"] == "events"
+        assert len(dc_api.requests) == 2
+        assert dc_api.requests[1].headers["secretsaccesstoken"] == "token-2"
+
+    def test_error_status(self, run):
+        with pytest.raises(Exception, match=r"Error: <Response \[500\]> URL: "):
+            run(lambda: aio.query_dc_api("broken"))
+
+    def test_missing_base_url(self, monkeypatch):
+        monkeypatch.setattr(redshift_client, "REDSHIFT_QUERY_BASE_URL", None)
+
+        with pytest.raises(EnvironmentError):
+            asyncio.run(aio.query_dc_api("events"))
+
+
+class TestAsyncEvents:
+    def test_get_events_cleans_quotes(self, run):
+        result = run(lambda: aio.get_events(**dict(PARAMS, project="quoted")))
+
+        assert result["query"]["project"] == "quoted"
+
+    @pytest.mark.parametrize(
+        "function, kwargs, message",
+        [
+            ("get_events_count", {}, "Project is required"),
+            ("get_events_count", {"project": "p"}, "Date start is required"),
+            (
+                "get_events_count_by_group",
+                PARAMS,
+                "metadata_key is required",
+            ),
+            (
+                "get_events_silver_count_by_group",
+                dict(PARAMS, metadata_key="k"),
+                "Table is required",
+            ),
+            (
+                "get_events_silver",
+                dict(PARAMS, table="nope"),
+                "Table is not valid",
+            ),
+        ],
+    )
+    def test_validation_matches_sync(self, function, kwargs, message):
+        with pytest.raises(Exception) as exc:
+            asyncio.run(getattr(aio, function)(**kwargs))
+
+        assert str(exc.value) == message
+
+    def test_errors_are_wrapped(self, run, monkeypatch):
+        monkeypatch.setenv("EVENTS_COUNT_METRIC_NAME", "broken")
+
+        with pytest.raises(Exception, match="^Error querying events count: "):
+            run(lambda: aio.get_events_count(**PARAMS))
+
+    def test_cache(self, run, dc_api):
+        cache = QueryCache()
+
+        async def main():
+            await aio.get_events_count(cache=cache, **PARAMS)
+            return await aio.get_events_count(cache=cache, **PARAMS)
+
+        assert run(main)["query"] == PARAMS
+        assert len(dc_api.requests) == 1
+
+    def test_silver_count_by_group(self, run, dc_api):
+        params = dict(PARAMS, metadata_key="k", table="topics")
+
+        result = run(lambda: aio.get_events_silver_count_by_group(**params))
+
+        assert result == {"metric": "events_silver_count_by_group", "query": params}
+
+    def test_get_traces_returns_response(self, run):
+        async def main():
+            response = await aio.get_traces(query_params={"message_uuid": "m"})
+            return response.status, await response.json()
+
+        status, body = run(main)
+        assert status == 200
+        assert body["query"] == {"message_uuid": "m"}
+
+
+class TestGatherFanOut:
+    def test_concurrency_is_limited(self, run, dc_api, monkeypatch):
+        monkeypatch.setattr(aio, "DATALAKE_AIO_QUERY_CONCURRENCY", 3)
+        dc_api.hold = 3
+
+        async def main():
+            return await asyncio.gather(
+                *(
+                    aio.get_events_count(**dict(PARAMS, project=str(i)))
+                    for i in range(12)
+                )
+            )
+
+        results = run(main)
+
+        assert [r["query"]["project"] for r in results] == [str(i) for i in range(12)]
+        assert dc_api.peak == 3
+
+    def test_query_many_isolates_errors(self, run):
+        async def main():
+            return await aio.query_many(aio.get_events_count, [PARAMS, {}, PARAMS])
+
+        results = run(main)
+
+        assert [r.ok for r in results] == [True, False, True]
+        assert str(results[1].error) == "Project is required"
+
+    def test_token_is_fetched_once(self, run, tokens):
+        async def main():
+            await asyncio.gather(*(aio.get_events_count(**PARAMS) for _ in range(5)))
+
+        run(main)
+
+        tokens._fetch_token.assert_called_once()
+
+
+class TestSessionsPerLoop:
+    def test_closed_when_the_loop_shuts_down(self):
+        async def main():
+            session = aio.get_session()
+            assert aio.get_session() is session
+            return session
+
+        sessions = [asyncio.run(main()) for _ in range(3)]
+
+        assert len(aio._SESSIONS) == 0
+        assert all(session.closed for session in sessions)
+
+    def test_closed_session_is_replaced(self):
+        async def main():
+            session = aio.get_session()
+            await session.close()
+            return session, aio.get_session()
+
+        closed, session = asyncio.run(main())
+
+        assert session is not closed and session.closed
@@ -1,7 +1,14 @@
+import itertools
+import json
+import threading
+import time
+from datetime import datetime, timedelta, timezone
 from unittest import mock
 
 import pytest
 
+from weni_datalake_sdk.clients.redshift import redshift_client
+from weni_datalake_sdk.clients.redshift.credentials import TokenManager
 from weni_datalake_sdk.clients.redshift.redshift_client import query_dc_api
 
 
@@ -32,7 +39,7 @@ class TestQueryDcApi:
             "weni_datalake_sdk.clients.redshift.redshift_client.get_secrets",
             return_value="token123",
         ) as mock_secrets, mock.patch(
-            "weni_datalake_sdk.clients.redshift.redshift_client.requests.request"
+            "weni_datalake_sdk.clients.http.requests.Session.request"
         ) as mock_request:
             mock_request.return_value = make_response(200, {"data": 1})
 
@@ -76,7 +83,7 @@ class TestQueryDcApi:
             "weni_datalake_sdk.clients.redshift.redshift_client.get_secrets",
             return_value="token123",
         ), mock.patch(
-            "weni_datalake_sdk.clients.redshift.redshift_client.requests.request",
+            "weni_datalake_sdk.clients.http.requests.Session.request",
             return_value=make_response(500),
         ):
             with pytest.raises(Exception) as exc:
@@ -90,7 +97,7 @@ class TestQueryDcApi:
             "weni_datalake_sdk.clients.redshift.redshift_client.get_secrets",
             side_effect=["token123", "token123"],
         ) as mock_secrets, mock.patch(
-            "weni_datalake_sdk.clients.redshift.redshift_client.requests.request",
+            "weni_datalake_sdk.clients.http.requests.Session.request",
             return_value=make_response(401),
         ):
             with pytest.raises(Exception) as exc:
@@ -104,7 +111,7 @@ class TestQueryDcApi:
             "weni_datalake_sdk.clients.redshift.redshift_client.get_secrets",
             side_effect=["old", "new", "new"],
         ) as mock_secrets, mock.patch(
-            "weni_datalake_sdk.clients.redshift.redshift_client.requests.request",
+            "weni_datalake_sdk.clients.http.requests.Session.request",
         ) as mock_request:
             mock_request.side_effect = [
                 make_response(401),
@@ -114,4 +121,231 @@ class TestQueryDcApi:
             result = query_dc_api(metric="m", query_params={"x": "y"})
             assert result.status_code == 200
             assert mock_secrets.call_count == 3
+            assert mock_secrets.call_args_list[1] == mock.call(rejected="old")
             assert mock_request.call_count == 2
+
+
+@pytest.fixture
+def aws(monkeypatch):
+    """boto3 STS and Secrets Manager clients returning a new token per call."""
+    monkeypatch.setenv("REDSHIFT_SECRET", "secret-id")
+    monkeypatch.setenv("REDSHIFT_ROLE_ARN", "arn:role")
+    sts = mock.Mock()
+    sts.assume_role.return_value = {
+        "Credentials": {
+            "AccessKeyId": "id",
+            "SecretAccessKey": "key",
+            "SessionToken": "session",
+            "Expiration": datetime.now(timezone.utc) + timedelta(hours=1),
+        }
+    }
+    secrets = mock.Mock()
+    tokens = (f"token{i}" for i in itertools.count())
+    secrets.get_secret_value.side_effect = lambda **kwargs: {
+        "SecretString": json.dumps({"token": next(tokens)})
+    }
+
+    def client(service, **kwargs):
+        return sts if service == "sts" else secrets
+
+    with mock.patch(
+        "weni_datalake_sdk.clients.redshift.credentials.boto3.client",
+        side_effect=client,
+    ):
+        yield sts, secrets
+
+
+class TestTokenManager:
+    def test_token_is_cached(self, aws):
+        sts, secrets = aws
+        manager = TokenManager(ttl=60, refresh_ahead=0)
+
+        assert [manager.get_token() for _ in range(3)] == ["token0"] * 3
+        assert sts.assume_role.call_count == 1
+        assert secrets.get_secret_value.call_count == 1
+
+    def test_token_expires_after_ttl(self, aws):
+        sts, secrets = aws
+        manager = TokenManager(ttl=0)
+
+        assert manager.get_token() == "token0"
+        assert manager.get_token() == "token1"
+        # Credentials are still valid, so only the token was fetched again.
+        assert sts.assume_role.call_count == 1
+
+    def test_credentials_are_renewed_before_expiration(self, aws):
+        sts, _ = aws
+        manager = TokenManager(ttl=0, credentials_margin=3600)
+
+        manager.get_token()
+        manager.get_token()
+
+        assert sts.assume_role.call_count == 2
+
+    def test_force_refresh(self, aws):
+        manager = TokenManager(ttl=60, refresh_ahead=0)
+
+        assert manager.get_token() == "token0"
+        assert manager.get_token(force_refresh=True) == "token1"
+        assert manager.get_token() == "token1"
+
+    def test_rejected_token_is_replaced_once(self, aws):
+        _, secrets = aws
+        manager = TokenManager(ttl=60, refresh_ahead=0)
+        token = manager.get_token()
+
+        assert manager.get_token(rejected=token) == "token1"
+        # A request sent with token0 before the refresh gets its 401 late.
+        assert manager.get_token(rejected=token) == "token1"
+        assert manager.get_token(rejected="token1") == "token2"
+        assert secrets.get_secret_value.call_count == 3
+
+    def test_concurrent_rejections_refresh_once(self, aws):
+        _, secrets = aws
+        manager = TokenManager(ttl=60, refresh_ahead=0)
+        manager.get_token()
+        fetch = secrets.get_secret_value.side_effect
+
+        def slow_fetch(**kwargs):
+            time.sleep(0.2)
+            return fetch(**kwargs)
+
+        secrets.get_secret_value.side_effect = slow_fetch
+        barrier = threading.Barrier(8)
+        tokens = []
+
+        def refresh():
+            barrier.wait()
+            tokens.append(manager.get_token(rejected="token0"))
+
+        threads = [threading.Thread(target=refresh) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert tokens == ["token1"] * 8
+        assert secrets.get_secret_value.call_count == 2
+
+    def test_refreshes_in_background_before_expiry(self, aws):
+        _, secrets = aws
+        manager = TokenManager(ttl=60, refresh_ahead=60)
+
+        assert manager.get_token() == "token0"
+        # Inside the refresh-ahead window: the current token is returned.
+        assert manager.get_token() == "token0"
+
+        deadline = time.monotonic() + 5
+        while manager._generation < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert manager._token == "token1"
+        assert secrets.get_secret_value.call_count == 2
+
+    def test_missing_secret(self, monkeypatch):
+        monkeypatch.delenv("REDSHIFT_SECRET", raising=False)
+
+        with pytest.raises(EnvironmentError):
+            TokenManager().get_token()
+
+    def test_get_secrets_uses_token_manager(self):
+        with mock.patch.object(
+            redshift_client.TOKEN_MANAGER, "get_token", return_value="token"
+        ) as get_token:
+            assert redshift_client.get_secrets(rejected="old") == "token"
+
+        get_token.assert_called_once_with(force_refresh=False, rejected="old")
+
+
+class TestCoalescing:
+    def query_together(self, count, response, query_params=None):
+        """Run `count` identical queries while the first request is blocked."""
+        release = threading.Event()
+        flights = redshift_client.QUERY_FLIGHTS
+        coalesced = flights.coalesced
+
+        def request(*args, **kwargs):
+            assert release.wait(5)
+            if isinstance(response, Exception):
+                raise response
+            return response
+
+        results = []
+
+        def call():
+            try:
+                results.append(query_dc_api(metric="m", query_params=query_params))
+            except Exception as e:
+                results.append(e)
+
+        with mock.patch(
+            "weni_datalake_sdk.clients.redshift.redshift_client.get_secrets",
+            return_value="token",
+        ), mock.patch(
+            "weni_datalake_sdk.clients.http.requests.Session.request",
+            side_effect=request,
+        ) as mock_request:
+            threads = [threading.Thread(target=call) for _ in range(count)]
+            for thread in threads:
+                thread.start()
+            deadline = time.monotonic() + 5
+            while flights.coalesced - coalesced < count - 1:
+                assert time.monotonic() < deadline
+                time.sleep(0.001)
+            release.set()
+            for thread in threads:
+                thread.join()
+
+        assert flights.in_flight() == 0
+        return results, mock_request
+
+    def test_identical_queries_share_one_request(self, setup_env):
+        response = make_response(200, {"count": 1})
+
+        results, mock_request = self.query_together(10, response, {"a": 1, "b": 2})
+
+        assert mock_request.call_count == 1
+        assert results == [response] * 10
+
+    def test_errors_are_shared(self, setup_env):
+        results, mock_request = self.query_together(5, ConnectionError("down"))
+
+        assert mock_request.call_count == 1
+        assert all(isinstance(result, ConnectionError) for result in results)
+
+    def test_params_order_does_not_matter(self):
+        flights = redshift_client.QUERY_FLIGHTS
+        calls = []
+        with mock.patch.object(flights, "do", side_effect=lambda key, f: key):
+            calls.append(query_dc_api(metric="m", query_params={"a": 1, "b": 2}))
+            calls.append(query_dc_api(metric="m", query_params={"b": 2, "a": 1}))
+            calls.append(query_dc_api(metric="m", query_params={"a": 2, "b": 2}))
+
+        assert calls[0] == calls[1] != calls[2]
+
+    def test_calls_after_completion_are_not_shared(self, setup_env):
+        with mock.patch(
+            "weni_datalake_sdk.clients.redshift.redshift_client.get_secrets",
+            return_value="token",
+        ), mock.patch(
+            "weni_datalake_sdk.clients.http.requests.Session.request",
+            return_value=make_response(200),
+        ) as mock_request:
+            query_dc_api(metric="m")
+            query_dc_api(metric="m")
+
+        assert mock_request.call_count == 2
+
+    @pytest.mark.parametrize("stream, enabled", [(True, True), (False, False)])
+    def test_not_coalesced(self, setup_env, monkeypatch, stream, enabled):
+        monkeypatch.setattr(redshift_client, "DATALAKE_QUERY_COALESCE", enabled)
+
+        with mock.patch.object(redshift_client.QUERY_FLIGHTS, "do") as do, mock.patch(
+            "weni_datalake_sdk.clients.redshift.redshift_client.get_secrets",
+            return_value="token",
+        ), mock.patch(
+            "weni_datalake_sdk.clients.http.requests.Session.request",
+            return_value=make_response(200),
+        ):
+            query_dc_api(metric="m", stream=stream)
+
+        do.assert_not_called()
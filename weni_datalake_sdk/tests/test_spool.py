@@ -0,0 +1,380 @@
+import multiprocessing
+import os
+import socket
+import time
+from unittest import mock
+
+import grpc
+import pytest
+
+from weni_datalake_sdk.clients import client, spool as spool_module
+from weni_datalake_sdk.clients.channel_pool import close_channel_pool
+from weni_datalake_sdk.clients.client import SPOOLED_STATUS, send_event_data
+from weni_datalake_sdk.clients.converters import build_event_request
+from weni_datalake_sdk.clients.reference_server import ReferenceServer
+from weni_datalake_sdk.clients.spool import (
+    Spool,
+    SpoolDrainer,
+    disable_spool,
+    enable_spool,
+)
+from weni_datalake_sdk.paths.events_path import EventPath
+from weni_datalake_sdk.tests.helpers import RpcError
+from weni_datalake_sdk.utils.exceptions import SpoolFullError
+
+METHOD = client.METHOD_PATHS["InsertEventData"]
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("localhost", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def make_request(i=0):
+    return build_event_request(
+        dict(
+            event_name="event1",
+            date="2024-01-01T00:00:00Z",
+            project="proj1",
+            contact_urn=f"urn{i}",
+        )
+    ).SerializeToString()
+
+
+class TestSpool:
+    def test_append_and_read_in_order(self, tmp_path):
+        spool = Spool(str(tmp_path))
+        for i in range(3):
+            spool.append(METHOD, make_request(i))
+
+        (segment,) = spool.sealed_segments()
+        records = list(spool.read(segment))
+
+        assert [method for _, method, _ in records] == [METHOD] * 3
+        assert [request for _, _, request in records] == [
+            make_request(i) for i in range(3)
+        ]
+        assert records[-1][0] == spool.size
+
+    def test_rolls_segments(self, tmp_path):
+        record_size = len(spool_module.encode_record(METHOD, make_request()))
+        spool = Spool(str(tmp_path), segment_bytes=record_size * 2)
+
+        for _ in range(5):
+            spool.append(METHOD, make_request())
+
+        segments = spool.sealed_segments()
+        assert len(segments) == 3
+        assert [len(list(spool.read(name))) for name in segments] == [2, 2, 1]
+
+    def test_reads_existing_segments_after_restart(self, tmp_path):
+        spool = Spool(str(tmp_path))
+        spool.append(METHOD, make_request(1))
+        spool.close()
+
+        reopened = Spool(str(tmp_path))
+        reopened.append(METHOD, make_request(2))
+
+        segments = reopened.sealed_segments()
+        assert len(segments) == 2
+        requests = [
+            request for name in segments for _, _, request in reopened.read(name)
+        ]
+        assert requests == [make_request(1), make_request(2)]
+
+    def test_stops_at_corrupted_record(self, tmp_path):
+        spool = Spool(str(tmp_path))
+        spool.append(METHOD, make_request(1))
+        spool.append(METHOD, make_request(2))
+        (segment,) = spool.sealed_segments()
+
+        with open(os.path.join(spool.directory, segment), "r+b") as f:
+            f.seek(-1, os.SEEK_END)
+            last = f.read(1)[0]
+            f.seek(-1, os.SEEK_END)
+            f.write(bytes([last ^ 0xFF]))
+
+        assert [request for _, _, request in spool.read(segment)] == [make_request(1)]
+
+    def test_stops_at_truncated_record(self, tmp_path):
+        spool = Spool(str(tmp_path))
+        spool.append(METHOD, make_request(1))
+        spool.append(METHOD, make_request(2))
+        (segment,) = spool.sealed_segments()
+
+        with open(os.path.join(spool.directory, segment), "r+b") as f:
+            f.truncate(spool.size - 3)
+
+        assert len(list(spool.read(segment))) == 1
+
+    def test_read_resumes_after_ack(self, tmp_path):
+        spool = Spool(str(tmp_path))
+        spool.append(METHOD, make_request(1))
+        spool.append(METHOD, make_request(2))
+        (segment,) = spool.sealed_segments()
+
+        offset, _, _ = next(spool.read(segment))
+        spool.ack(segment, offset)
+
+        assert [request for _, _, request in spool.read(segment)] == [make_request(2)]
+
+    def test_full_spool_raises(self, tmp_path):
+        record_size = len(spool_module.encode_record(METHOD, make_request()))
+        spool = Spool(str(tmp_path), max_bytes=record_size * 2)
+        spool.append(METHOD, make_request())
+        spool.append(METHOD, make_request())
+
+        with pytest.raises(SpoolFullError):
+            spool.append(METHOD, make_request())
+
+    def test_compaction_frees_acknowledged_records(self, tmp_path):
+        record_size = len(spool_module.encode_record(METHOD, make_request()))
+        spool = Spool(str(tmp_path), max_bytes=record_size * 2)
+        spool.append(METHOD, make_request(1))
+        spool.append(METHOD, make_request(2))
+        (segment,) = spool.sealed_segments()
+        offset, _, _ = next(spool.read(segment))
+        spool.ack(segment, offset)
+
+        spool.append(METHOD, make_request(3))
+
+        assert spool.size == record_size * 2
+        assert os.path.getsize(os.path.join(spool.directory, segment)) == record_size
+        requests = [
+            request
+            for name in spool.sealed_segments()
+            for _, _, request in spool.read(name)
+        ]
+        assert requests == [make_request(2), make_request(3)]
+
+    def test_segment_compacted_before_the_drainer_removes_it(self, tmp_path):
+        spool = Spool(str(tmp_path))
+        spool.append(METHOD, make_request(1))
+        (segment,) = spool.sealed_segments()
+        for offset, _, _ in spool.read(segment):
+            spool.ack(segment, offset)
+
+        # A writer compacts between the last ack and the drainer's remove.
+        spool.compact()
+        spool.remove(segment)
+
+        assert spool.size == 0
+        assert spool.sealed_segments() == []
+
+
+def write_and_exit(root, ready=None, done=None):
+    spool = Spool(root)
+    spool.append(METHOD, make_request(os.getpid()))
+    if ready is not None:
+        ready.set()
+        done.wait(5)
+
+
+def check_spool_after_fork(root, parent_directory):
+    spool = spool_module.get_spool("localhost:1")
+    assert spool.directory != parent_directory
+    assert spool.directory == os.path.join(root, str(os.getpid()))
+    spool_module.disable_spool()
+
+
+class TestSharedSpoolDirectory:
+    def fork(self, target, *args):
+        process = multiprocessing.get_context("fork").Process(target=target, args=args)
+        process.start()
+        return process
+
+    def test_spools_do_not_share_segments(self, tmp_path):
+        first = Spool(str(tmp_path))
+        second = Spool(str(tmp_path))
+        first.append(METHOD, make_request(1))
+        second.append(METHOD, make_request(2))
+
+        assert first.directory != second.directory
+        for spool, expected in ((first, 1), (second, 2)):
+            requests = [
+                request
+                for name in spool.sealed_segments()
+                for _, _, request in spool.read(name)
+            ]
+            assert requests == [make_request(expected)]
+
+    def test_segments_of_exited_processes_are_adopted(self, tmp_path):
+        process = self.fork(write_and_exit, str(tmp_path))
+        process.join(10)
+        assert process.exitcode == 0
+
+        spool = Spool(str(tmp_path))
+
+        assert sorted(os.listdir(tmp_path)) == [str(os.getpid())]
+        requests = [
+            request
+            for name in spool.sealed_segments()
+            for _, _, request in spool.read(name)
+        ]
+        assert requests == [make_request(process.pid)]
+
+    def test_segments_of_live_processes_are_left_alone(self, tmp_path):
+        context = multiprocessing.get_context("fork")
+        ready, done = context.Event(), context.Event()
+        process = self.fork(write_and_exit, str(tmp_path), ready, done)
+        assert ready.wait(10)
+
+        spool = Spool(str(tmp_path))
+        assert spool.sealed_segments() == []
+
+        done.set()
+        process.join(10)
+        assert spool.adopt_orphans() == 1
+        assert len(spool.sealed_segments()) == 1
+
+    def test_unlocked_directories_of_running_processes_are_left_alone(self, tmp_path):
+        # A process that has just created its directory has not locked it yet.
+        directory = tmp_path / str(os.getppid())
+        directory.mkdir()
+        (directory / "segment-000000000001.log").write_bytes(
+            spool_module.encode_record(METHOD, make_request(1))
+        )
+
+        spool = Spool(str(tmp_path))
+
+        assert spool.sealed_segments() == []
+        assert directory.exists()
+
+    def test_segments_in_the_root_are_adopted(self, tmp_path):
+        (tmp_path / "segment-000000000007.log").write_bytes(
+            spool_module.encode_record(METHOD, make_request(7))
+        )
+
+        spool = Spool(str(tmp_path))
+
+        [name] = spool.sealed_segments()
+        assert [request for _, _, request in spool.read(name)] == [make_request(7)]
+        assert spool.size > 0
+
+    def test_spool_is_recreated_after_fork(self, tmp_path):
+        spool = enable_spool(str(tmp_path), "localhost:1")
+        try:
+            process = self.fork(check_spool_after_fork, str(tmp_path), spool.directory)
+            process.join(10)
+            assert process.exitcode == 0
+            assert spool_module.get_spool() is spool
+        finally:
+            disable_spool()
+
+
+class TestSpoolDrainer:
+    def test_drain_replays_in_order_and_removes_segments(self, tmp_path):
+        spool = Spool(str(tmp_path))
+        for i in range(5):
+            spool.append(METHOD, make_request(i))
+
+        with ReferenceServer() as server:
+            drainer = SpoolDrainer(spool, server.target)
+            assert drainer.drain()
+
+        close_channel_pool()
+        assert [record.contact_urn for record in server.events.records] == [
+            f"urn{i}" for i in range(5)
+        ]
+        assert drainer.replayed == 5
+        assert spool.sealed_segments() == []
+        assert spool.size == 0
+
+    def test_drain_stops_when_unavailable(self, tmp_path):
+        spool = Spool(str(tmp_path))
+        spool.append(METHOD, make_request(1))
+        spool.append(METHOD, make_request(2))
+        drainer = SpoolDrainer(spool, "localhost:1")
+
+        with mock.patch.object(
+            drainer,
+            "replay",
+            side_effect=[None, RpcError(grpc.StatusCode.UNAVAILABLE)],
+        ):
+            assert not drainer.drain()
+
+        (segment,) = spool.sealed_segments()
+        assert [request for _, _, request in spool.read(segment)] == [make_request(2)]
+
+    def test_drain_drops_non_retryable_records(self, tmp_path):
+        spool = Spool(str(tmp_path))
+        spool.append(METHOD, make_request(1))
+        drainer = SpoolDrainer(spool, "localhost:1")
+
+        with mock.patch.object(
+            drainer,
+            "replay",
+            side_effect=RpcError(grpc.StatusCode.INVALID_ARGUMENT),
+        ):
+            assert drainer.drain()
+
+        assert drainer.dropped == 1
+        assert spool.sealed_segments() == []
+
+    def test_active_segment_is_not_sealed_while_unavailable(self, tmp_path):
+        spool = Spool(str(tmp_path))
+        drainer = SpoolDrainer(spool, "localhost:1")
+
+        with mock.patch.object(
+            drainer, "replay", side_effect=RpcError(grpc.StatusCode.UNAVAILABLE)
+        ):
+            for i in range(5):
+                spool.append(METHOD, make_request(i))
+                assert not drainer.drain()
+
+        segments = [
+            name
+            for name in os.listdir(spool.directory)
+            if name.endswith(spool_module.SEGMENT_SUFFIX)
+        ]
+        assert len(segments) == 2
+        with mock.patch.object(drainer, "replay"):
+            assert drainer.drain()
+            assert drainer.drain()
+        assert drainer.replayed == 5
+        assert spool.size == 0
+
+
+class TestSendWithSpool:
+    @pytest.fixture
+    def target(self, monkeypatch):
+        target = f"localhost:{free_port()}"
+        monkeypatch.setattr(client, "SERVER_ADDRESS", target)
+        yield target
+        disable_spool()
+        close_channel_pool()
+
+    def test_error_is_raised_without_spool(self, target):
+        with pytest.raises(grpc.RpcError):
+            send_event_data(EventPath, dict(event_name="event1"))
+
+    def test_spools_while_down_and_replays_when_up(self, target, tmp_path):
+        spool = enable_spool(str(tmp_path), target)
+        spool_module._DRAINER.interval = 0.05
+        spool_module._DRAINER.max_backoff = 0.05
+
+        statuses = [
+            send_event_data(EventPath, dict(event_name="event1", contact_urn=f"urn{i}"))
+            for i in range(3)
+        ]
+        assert statuses == [SPOOLED_STATUS] * 3
+        assert spool.size > 0
+
+        with ReferenceServer(address=target) as server:
+            assert wait_for(lambda: len(server.events.records) == 3)
+
+        assert [record.contact_urn for record in server.events.records] == [
+            "urn0",
+            "urn1",
+            "urn2",
+        ]
@@ -0,0 +1,130 @@
+import time
+
+import grpc
+import pytest
+
+from weni_datalake_sdk.clients import client
+from weni_datalake_sdk.clients.channel_pool import close_channel_pool
+from weni_datalake_sdk.clients.client import (
+    send_commerce_webhook_data_stream,
+    send_data_stream,
+    send_event_data_stream,
+    send_message_template_data_stream,
+    send_message_template_status_data_stream,
+    send_trace_data_stream,
+)
+from weni_datalake_sdk.clients.policy import CallPolicy, configure_policy
+from weni_datalake_sdk.clients.reference_server import ReferenceServer
+from weni_datalake_sdk.paths.commerce_webhook import CommerceWebhookPath
+from weni_datalake_sdk.paths.events_path import EventPath
+from weni_datalake_sdk.paths.message_template_path import MessageTemplatePath
+from weni_datalake_sdk.paths.message_template_status_path import (
+    MessageTemplateStatusPath,
+)
+from weni_datalake_sdk.paths.msg_path import MsgPath
+from weni_datalake_sdk.paths.trace_path import TracePath
+from weni_datalake_sdk.utils.exceptions import ValidationError
+
+
+@pytest.fixture
+def server(monkeypatch):
+    with ReferenceServer() as server:
+        monkeypatch.setattr(client, "SERVER_ADDRESS", server.target)
+        yield server
+    close_channel_pool()
+
+
+class FakePath:
+    @staticmethod
+    def get_table_name():
+        return "invalid_table"
+
+
+class TestSendEventDataStream:
+    def test_streams_generator_in_one_call(self, server):
+        consumed = []
+
+        def events():
+            for i in range(100):
+                consumed.append(i)
+                yield dict(event_name="event1", project="proj1", contact_urn=f"urn{i}")
+
+        response = send_event_data_stream(EventPath, events())
+
+        assert response.status == "success"
+        assert response.inserted == 100
+        assert len(consumed) == 100
+        assert server.events.calls["InsertEventStream"] == 1
+        assert server.events.calls["InsertEventData"] == 0
+        assert server.events.records[-1].contact_urn == "urn99"
+
+    def test_empty_stream(self, server):
+        response = send_event_data_stream(EventPath, [])
+
+        assert response.inserted == 0
+
+    def test_invalid_path(self, server):
+        with pytest.raises(ValidationError):
+            send_event_data_stream(FakePath, [{}])
+
+
+def slow_events(delay):
+    yield dict(event_name="event1", project="proj1")
+    time.sleep(delay)
+    yield dict(event_name="event2", project="proj1")
+
+
+class TestStreamDeadline:
+    def test_timeout(self, server):
+        with pytest.raises(grpc.RpcError) as error:
+            send_event_data_stream(EventPath, slow_events(1), timeout=0.2)
+
+        assert error.value.code() == grpc.StatusCode.DEADLINE_EXCEEDED
+
+    def test_policy_timeout_by_default(self, server):
+        configure_policy(EventPath.get_table_name(), CallPolicy(timeout=0.2))
+        try:
+            with pytest.raises(grpc.RpcError) as error:
+                send_event_data_stream(EventPath, slow_events(1))
+        finally:
+            configure_policy(EventPath.get_table_name(), None)
+
+        assert error.value.code() == grpc.StatusCode.DEADLINE_EXCEEDED
+
+
+class TestOtherStreams:
+    def test_send_data_stream(self, server):
+        response = send_data_stream(MsgPath, [{"text": "Oi!"}, {"text": "Olá!"}])
+
+        assert response.inserted == 2
+        assert server.msgs.records[0].path == "messages"
+
+    def test_send_trace_data_stream(self, server):
+        response = send_trace_data_stream(TracePath, [{"receive": "Wow!"}])
+
+        assert response.inserted == 1
+        assert server.traces.calls["InsertTraceStream"] == 1
+
+    def test_send_message_template_data_stream(self, server):
+        response = send_message_template_data_stream(
+            MessageTemplatePath, [{"template_id": "t1"}, {"template_id": "t2"}]
+        )
+
+        assert response.inserted == 2
+        assert server.message_templates.calls["InsertMessageTemplateStream"] == 1
+
+    def test_send_message_template_status_data_stream(self, server):
+        response = send_message_template_status_data_stream(
+            MessageTemplateStatusPath, [{"status": "approved"}]
+        )
+
+        assert response.inserted == 1
+        assert server.message_templates.calls["InsertMessageTemplateStatusStream"] == 1
+
+    def test_send_commerce_webhook_data_stream(self, server):
+        response = send_commerce_webhook_data_stream(
+            CommerceWebhookPath, [{"project": "proj1", "data": {"foo": "bar"}}]
+        )
+
+        assert response.inserted == 1
+        assert server.commerce_webhooks.records[0].project == "proj1"
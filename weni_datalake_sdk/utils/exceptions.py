@@ -8,3 +8,15 @@ class DLManagerError(Exception):
     """Erro ao tentar enviar dados ao DL Manager."""
 
     pass
+
+
+class SpoolFullError(Exception):
+    """Erro quando o spool em disco atinge o limite configurado."""
+
+    pass
+
+
+class QueueFullError(Exception):
+    """Erro quando a fila do executor está cheia e a tarefa foi rejeitada."""
+
+    pass
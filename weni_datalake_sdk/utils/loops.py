@@ -0,0 +1,69 @@
+"""
+Objects kept per asyncio event loop, such as clients bound to the loop that
+created them.
+"""
+import asyncio
+import threading
+
+
+class PerLoop:
+    """
+    One value per event loop, built by `create()` on first use.
+
+    Entries are keyed by `id(loop)`: what they hold (channels, sessions)
+    usually references the loop, so weak keys would never be dropped. Each
+    value comes with a task waiting on the loop; when the loop shuts down and
+    cancels its pending tasks, as `asyncio.run` does before closing it, the
+    task passes the value to the async `close(value)` and drops it. Values of
+    loops closed without that are dropped on the next first use from another
+    loop.
+    """
+
+    def __init__(self, create, close=None):
+        self._create = create
+        self._close = close
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self):
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            entry = self._entries.get(id(loop))
+            if entry is not None:
+                return entry[1]
+
+            for key, (other, _, _) in list(self._entries.items()):
+                if other.is_closed():
+                    del self._entries[key]
+            value = self._create()
+            waiter = loop.create_task(self._close_on_shutdown(loop, value))
+            self._entries[id(loop)] = (loop, value, waiter)
+        return value
+
+    def pop(self):
+        """
+        Remove the running loop's value and return it, or None. Closing it is
+        then up to the caller.
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            entry = self._entries.pop(id(loop), None)
+        if entry is None:
+            return None
+        entry[2].cancel()
+        return entry[1]
+
+    async def _close_on_shutdown(self, loop, value):
+        try:
+            await loop.create_future()
+        finally:
+            with self._lock:
+                entry = self._entries.get(id(loop))
+                current = entry is not None and entry[1] is value
+                if current:
+                    del self._entries[id(loop)]
+            if current and self._close is not None:
+                await self._close(value)